@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 
 from licitaciones.application.buscar_por_query_use_case import BuscarPorQueryUseCase
+from licitaciones.infrastructure.persistence.repositories.producto_cache import ProductoCache
 from licitaciones.infrastructure.persistence.repositories.producto_repository_impl import (
     ProductoRepository,
 )
@@ -9,11 +10,18 @@ from licitaciones.infrastructure.persistence.repositories.producto_repository_im
 class DependencyContainer:
     """Contenedor de dependencias para inyección de dependencias"""
 
-    def __init__(self, session: Session):
+    def __init__(
+        self,
+        session: Session,
+        producto_cache: ProductoCache | None = None,
+        max_plan_cost: float | None = None,
+    ):
         self.session = session
 
-        # Repositorios
-        self.producto_repository = ProductoRepository(session)
+        # Repositorios (la caché de productos se comparte entre contenedores)
+        self.producto_repository = ProductoRepository(
+            session, cache=producto_cache, max_plan_cost=max_plan_cost
+        )
 
         # Casos de uso
         self.buscar_por_query = BuscarPorQueryUseCase(self.producto_repository)
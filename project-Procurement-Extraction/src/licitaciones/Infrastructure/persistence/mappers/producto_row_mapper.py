@@ -0,0 +1,261 @@
+"""Mapeo rápido de filas SQL (tuplas) a entidades Producto, sin pasar por el ORM.
+
+Para cargar muchos productos: una query ancha con los productos y sus relaciones
+1:1 (LEFT JOIN) y una query por relación 1:N, todas por `producto_id = ANY(:ids)`.
+Las columnas de cada SELECT están en el orden de los campos de la entidad, así
+que la mayoría se construye posicionalmente con una porción de la fila.
+"""
+
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from licitaciones.domain.entities.accesorios import Accesorios
+from licitaciones.domain.entities.alarma import Alarma
+from licitaciones.domain.entities.alimentacion import Alimentacion
+from licitaciones.domain.entities.aparato_medida import AparatosMedida
+from licitaciones.domain.entities.ensayo import Ensayo
+from licitaciones.domain.entities.especificaciones import Especificaciones
+from licitaciones.domain.entities.gabinete import Gabinete
+from licitaciones.domain.entities.garantia import Garantia
+from licitaciones.domain.entities.producto import Producto
+from licitaciones.domain.entities.salida import Salida
+from licitaciones.domain.entities.senalizacion import Senalizacion
+from licitaciones.domain.entities.tipo_alarma import TipoAlarma
+from licitaciones.domain.entities.tipo_ensayo import TipoEnsayo
+from licitaciones.domain.valueObjects.value_objects import Codigo, Dimensiones, RangoTension
+
+PRODUCTO_COLUMNS = (
+    "id",
+    "codigo",
+    "marca",
+    "modelo",
+    "tension_nominal",
+    "corriente_nominal",
+    "regulador_diodos",
+    "origen",
+    "tipo",
+    "created_at",
+    "updated_at",
+)
+
+ESPECIFICACIONES_DECIMALES = frozenset(
+    {
+        "temperatura_maxima",
+        "temperatura_minima",
+        "humedad_relativa_max",
+        "rendimiento_minimo",
+        "tension_flote_min",
+        "tension_flote_max",
+        "tension_fondo_min",
+        "tension_fondo_max",
+    }
+)
+
+
+def _float(value: Any) -> float | None:
+    """Numeric de PostgreSQL (Decimal) a float."""
+    return float(value) if value is not None else None
+
+
+def _rango_tension(value: str | None) -> RangoTension | None:
+    if not value:
+        return None
+    try:
+        return RangoTension.from_string(value)
+    except ValueError:
+        return None
+
+
+def _columnas(entidad: type) -> tuple[str, ...]:
+    """Campos de la entidad (= columnas de la tabla) en orden de declaración."""
+    return tuple(entidad.__dataclass_fields__)
+
+
+_ESPECIFICACIONES_DECIMALES_IDX = tuple(
+    i for i, c in enumerate(_columnas(Especificaciones)) if c in ESPECIFICACIONES_DECIMALES
+)
+
+
+def _construir_especificaciones(fila: Sequence) -> Especificaciones:
+    valores = list(fila)
+    for i in _ESPECIFICACIONES_DECIMALES_IDX:
+        valores[i] = _float(valores[i])
+    return Especificaciones(*valores)
+
+
+def _construir_alimentacion(fila: Sequence) -> Alimentacion:
+    return Alimentacion(*fila[:4], _rango_tension(fila[4]), *fila[5:])
+
+
+def _construir_gabinete(fila: Sequence) -> Gabinete:
+    (id_, producto_id, material, acceso, grado, espesor_chapa, pintura, color, espesor_pintura,
+     ancho, alto, profundidad, peso) = fila  # fmt: skip
+    return Gabinete(
+        id=id_,
+        producto_id=producto_id,
+        material=material,
+        acceso=acceso,
+        grado_proteccion=grado,
+        espesor_chapa=_float(espesor_chapa),
+        tipo_pintura=pintura,
+        color=color,
+        espesor_pintura=_float(espesor_pintura),
+        dimensiones=Dimensiones(ancho, alto, profundidad) if ancho or alto or profundidad else None,
+        peso=peso,
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class _RelacionUnoAUno:
+    """Relación 1:1 de productos: atributo, tabla, columnas y constructor."""
+
+    atributo: str
+    tabla: str
+    columnas: tuple[str, ...]
+    construir: Callable[[Sequence], Any]
+
+
+RELACIONES_UNO_A_UNO = (
+    _RelacionUnoAUno("accesorios", "accesorios", _columnas(Accesorios), lambda f: Accesorios(*f)),
+    _RelacionUnoAUno(
+        "alimentacion", "alimentacion", _columnas(Alimentacion), _construir_alimentacion
+    ),
+    _RelacionUnoAUno(
+        "aparatos_medida",
+        "aparatos_medida",
+        _columnas(AparatosMedida),
+        lambda f: AparatosMedida(*f),
+    ),
+    _RelacionUnoAUno(
+        "especificaciones",
+        "especificaciones",
+        _columnas(Especificaciones),
+        _construir_especificaciones,
+    ),
+    _RelacionUnoAUno(
+        "gabinete",
+        "gabinete",
+        (
+            "id",
+            "producto_id",
+            "material",
+            "acceso",
+            "grado_proteccion",
+            "espesor_chapa",
+            "tipo_pintura",
+            "color",
+            "espesor_pintura",
+            "ancho",
+            "alto",
+            "profundidad",
+            "peso",
+        ),
+        _construir_gabinete,
+    ),
+    _RelacionUnoAUno("garantia", "garantia", _columnas(Garantia), lambda f: Garantia(*f)),
+    _RelacionUnoAUno("salida", "salida", _columnas(Salida), lambda f: Salida(*f)),
+)
+
+# Alarma/Ensayo: columnas propias (sin la relación) + las del tipo (LEFT JOIN)
+ALARMA_COLUMNS = _columnas(Alarma)[:-1]
+TIPO_ALARMA_COLUMNS = _columnas(TipoAlarma)
+ENSAYO_COLUMNS = _columnas(Ensayo)[:-1]
+TIPO_ENSAYO_COLUMNS = _columnas(TipoEnsayo)
+SENALIZACION_COLUMNS = _columnas(Senalizacion)
+
+
+def _select(alias: str, columnas: Iterable[str]) -> str:
+    return ", ".join(f"{alias}.{c}" for c in columnas)
+
+
+PRODUCTOS_SQL = (
+    f"SELECT {_select('p', PRODUCTO_COLUMNS)}, "
+    + ", ".join(_select(r.tabla, r.columnas) for r in RELACIONES_UNO_A_UNO)
+    + " FROM productos p "
+    + " ".join(f"LEFT JOIN {r.tabla} ON {r.tabla}.producto_id = p.id" for r in RELACIONES_UNO_A_UNO)
+    + " WHERE p.id = ANY(:ids) AND p.eliminado_at IS NULL"
+)
+
+ALARMAS_SQL = (
+    f"SELECT {_select('a', ALARMA_COLUMNS)}, {_select('t', TIPO_ALARMA_COLUMNS)} "
+    "FROM alarmas a LEFT JOIN tipos_alarma t ON t.id = a.tipo_alarma_id "
+    "WHERE a.producto_id = ANY(:ids) ORDER BY a.id"
+)
+
+ENSAYOS_SQL = (
+    f"SELECT {_select('e', ENSAYO_COLUMNS)}, {_select('t', TIPO_ENSAYO_COLUMNS)} "
+    "FROM ensayos e LEFT JOIN tipos_ensayo t ON t.id = e.tipo_ensayo_id "
+    "WHERE e.producto_id = ANY(:ids) ORDER BY e.id"
+)
+
+SENALIZACIONES_SQL = (
+    f"SELECT {_select('s', SENALIZACION_COLUMNS)} FROM senalizaciones s "
+    "WHERE s.producto_id = ANY(:ids) ORDER BY s.id"
+)
+
+
+def _porciones() -> tuple[tuple[_RelacionUnoAUno, int, int], ...]:
+    """Inicio y fin de cada relación 1:1 dentro de la fila de PRODUCTOS_SQL."""
+    porciones = []
+    inicio = len(PRODUCTO_COLUMNS)
+    for relacion in RELACIONES_UNO_A_UNO:
+        fin = inicio + len(relacion.columnas)
+        porciones.append((relacion, inicio, fin))
+        inicio = fin
+    return tuple(porciones)
+
+
+_PORCIONES = _porciones()
+_N_PRODUCTO = len(PRODUCTO_COLUMNS)
+_N_ALARMA = len(ALARMA_COLUMNS)
+_N_ENSAYO = len(ENSAYO_COLUMNS)
+
+
+class ProductoRowMapper:
+    """Construye entidades Producto completas a partir de filas de las queries del módulo."""
+
+    def to_entities(
+        self,
+        producto_rows: Iterable[Sequence],
+        alarma_rows: Iterable[Sequence] = (),
+        ensayo_rows: Iterable[Sequence] = (),
+        senalizacion_rows: Iterable[Sequence] = (),
+    ) -> dict[int, Producto]:
+        """
+        Args:
+            producto_rows: Filas de PRODUCTOS_SQL
+            alarma_rows: Filas de ALARMAS_SQL
+            ensayo_rows: Filas de ENSAYOS_SQL
+            senalizacion_rows: Filas de SENALIZACIONES_SQL
+
+        Returns:
+            Productos por id
+        """
+        productos = {}
+        for fila in producto_rows:
+            producto = Producto(fila[0], Codigo(fila[1]), *fila[2:_N_PRODUCTO])
+            for relacion, inicio, fin in _PORCIONES:
+                porcion = fila[inicio:fin]
+                if porcion[0] is not None:
+                    setattr(producto, relacion.atributo, relacion.construir(porcion))
+            productos[producto.id] = producto
+
+        for fila in alarma_rows:
+            producto = productos.get(fila[1])
+            if producto is not None:
+                tipo = TipoAlarma(*fila[_N_ALARMA:]) if fila[_N_ALARMA] is not None else None
+                producto.alarmas.append(Alarma(*fila[:_N_ALARMA], tipo))
+
+        for fila in ensayo_rows:
+            producto = productos.get(fila[1])
+            if producto is not None:
+                tipo = TipoEnsayo(*fila[_N_ENSAYO:]) if fila[_N_ENSAYO] is not None else None
+                producto.ensayos.append(Ensayo(*fila[:_N_ENSAYO], tipo))
+
+        for fila in senalizacion_rows:
+            producto = productos.get(fila[1])
+            if producto is not None:
+                producto.senalizaciones.append(Senalizacion(*fila))
+
+        return productos
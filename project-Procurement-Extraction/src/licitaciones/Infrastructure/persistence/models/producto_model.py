@@ -20,6 +20,8 @@ class ProductoModel(Base):
     tipo = Column(String(100), default="Autorregulado")
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    hash_origen = Column(String(64))  # Hash de la columna del producto en el CSV
+    eliminado_at = Column(DateTime)  # Tombstone: NULL = vigente en el catálogo
 
     # Relaciones
     accesorios = relationship(
@@ -0,0 +1,109 @@
+"""Control del costo estimado de las consultas SQL generadas por LLM.
+
+Antes de ejecutar una consulta se pide su plan con EXPLAIN (sin ejecutarla) y
+se compara el costo total estimado por PostgreSQL con un máximo. Si lo supera
+se intenta una reescritura equivalente que habilita los índices de trigramas
+(ver migración 005); si aún lo supera, la consulta se rechaza.
+"""
+
+import json
+import re
+from collections.abc import Callable
+
+from sqlalchemy import TextClause, text
+from sqlalchemy.orm import Session
+
+from licitaciones.logger import get_logger
+
+logger = get_logger(__name__)
+
+# pg_trgm.similarity_threshold por defecto: `col % 'x'` equivale a similarity >= 0.3
+UMBRAL_OPERADOR_TRIGRAMA = 0.3
+
+_SIMILARITY = re.compile(
+    r"""
+    similarity\(\s*(?P<columna>[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)?)\s*,
+    \s*(?P<literal>'(?:[^']|'')*')\s*\)
+    \s*(?P<operador>>=?)\s*(?P<umbral>[0-9]*\.?[0-9]+)
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+
+def agregar_operador_trigrama(sql: str) -> str:
+    """Acompaña cada `similarity(col, 'x') > n` con `col % 'x'`.
+
+    similarity() como función no usa índices; el operador % sí (GIN
+    gin_trgm_ops). Solo se reescriben comparaciones con umbral mayor o igual
+    al del operador, para que el resultado no cambie.
+    """
+
+    def reemplazar(match: re.Match) -> str:
+        if float(match["umbral"]) < UMBRAL_OPERADOR_TRIGRAMA:
+            return match.group()
+        return f"({match['columna']} % {match['literal']} AND {match.group()})"
+
+    return _SIMILARITY.sub(reemplazar, sql)
+
+
+class PlanDemasiadoCostosoError(ValueError):
+    """El plan estimado de la consulta supera el costo máximo permitido."""
+
+
+class PlanCostGuard:
+    """Rechaza (o reescribe) consultas cuyo plan estimado es demasiado costoso."""
+
+    def __init__(self, max_cost: float):
+        """
+        Args:
+            max_cost: Costo total máximo del plan (unidades del planner de PostgreSQL)
+        """
+        self.max_cost = max_cost
+
+    def costo(self, session: Session, consulta: TextClause, params: dict) -> float:
+        """Costo total estimado de la consulta, sin ejecutarla"""
+        plan = session.execute(text(f"EXPLAIN (FORMAT JSON) {consulta.text}"), params).scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return float(plan[0]["Plan"]["Total Cost"])
+
+    def acotar(
+        self,
+        session: Session,
+        sql_query: str,
+        construir: Callable[[str], tuple[TextClause, dict]],
+    ) -> tuple[TextClause, dict]:
+        """
+        Devuelve la consulta a ejecutar si su plan está dentro del costo máximo
+
+        Args:
+            session: Sesión de SQLAlchemy
+            sql_query: SQL del LLM
+            construir: Arma la consulta final (y sus parámetros) a partir del SQL
+
+        Returns:
+            Consulta y parámetros, reescrita si hizo falta
+
+        Raises:
+            PlanDemasiadoCostosoError: Si ni la reescritura queda dentro del costo máximo
+        """
+        consulta, params = construir(sql_query)
+        costo = self.costo(session, consulta, params)
+        if costo <= self.max_cost:
+            return consulta, params
+
+        reescrita = agregar_operador_trigrama(sql_query)
+        if reescrita != sql_query:
+            consulta, params = construir(reescrita)
+            costo_original, costo = costo, self.costo(session, consulta, params)
+            if costo <= self.max_cost:
+                logger.info(
+                    "Consulta reescrita con operador de trigramas (costo %.0f -> %.0f)",
+                    costo_original,
+                    costo,
+                )
+                return consulta, params
+
+        raise PlanDemasiadoCostosoError(
+            f"Plan de ejecución demasiado costoso: {costo:.0f} (máximo {self.max_cost:.0f})"
+        )
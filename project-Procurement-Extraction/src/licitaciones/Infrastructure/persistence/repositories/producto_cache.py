@@ -0,0 +1,96 @@
+"""Caché en memoria de entidades Producto ya mapeadas."""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+
+from licitaciones.domain.entities.producto import Producto
+
+
+class ProductoCache:
+    """Caché LRU con TTL de productos mapeados, por id.
+
+    Se vacía cuando cambia la versión del catálogo (tabla catalogo_version,
+    incrementada por la sincronización). La versión se consulta como mucho una
+    vez cada `version_check_seconds`. Segura para compartir entre threads y
+    entre repositorios de distintas sesiones.
+
+    Las entidades se comparten entre búsquedas: no deben modificarse.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        ttl_seconds: float = 600.0,
+        version_check_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Inicializa la caché.
+
+        Args:
+            max_entries: Máximo de productos en memoria (se descartan los menos usados).
+            ttl_seconds: Vida máxima de cada entrada.
+            version_check_seconds: Segundos mínimos entre consultas de versión.
+            clock: Reloj monotónico (inyectable para tests).
+        """
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._version_check = version_check_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[int, tuple[float, Producto]] = OrderedDict()
+        self._version: int | None = None
+        self._version_checked_at = float("-inf")
+        self.hits = 0
+        self.misses = 0
+
+    def ensure_version(self, fetch_version: Callable[[], int]) -> None:
+        """Vacía la caché si la versión del catálogo cambió desde el último chequeo."""
+        with self._lock:
+            now = self._clock()
+            if now - self._version_checked_at < self._version_check:
+                return
+            self._version_checked_at = now
+
+        version = fetch_version()
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+
+    def get_many(self, producto_ids: Iterable[int]) -> dict[int, Producto]:
+        """Productos en caché (y vigentes) entre los pedidos."""
+        found = {}
+        with self._lock:
+            now = self._clock()
+            for producto_id in producto_ids:
+                entry = self._entries.get(producto_id)
+                if entry is None or now - entry[0] >= self._ttl:
+                    self._entries.pop(producto_id, None)
+                    self.misses += 1
+                    continue
+                self._entries.move_to_end(producto_id)
+                found[producto_id] = entry[1]
+                self.hits += 1
+        return found
+
+    def put_many(self, productos: dict[int, Producto]) -> None:
+        """Guarda productos recién cargados."""
+        with self._lock:
+            now = self._clock()
+            for producto_id, producto in productos.items():
+                self._entries[producto_id] = (now, producto)
+                self._entries.move_to_end(producto_id)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Vacía la caché."""
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+            self._version_checked_at = float("-inf")
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,20 +1,45 @@
-from sqlalchemy import text
-from sqlalchemy.orm import Session, joinedload
+import re
+from collections.abc import Iterable
+
+from sqlalchemy import TextClause, text
+from sqlalchemy.orm import Session
 
 from licitaciones.domain.entities.producto import Producto
 from licitaciones.domain.repositories.producto_repository import IProductoRepository
 from licitaciones.domain.services.sql_validator_service import SQLValidatorService
-from licitaciones.infrastructure.persistence.mappers.producto_mapper import ProductoMapper
-from licitaciones.infrastructure.persistence.models.producto_model import ProductoModel
+from licitaciones.infrastructure.persistence.mappers.producto_row_mapper import (
+    ALARMAS_SQL,
+    ENSAYOS_SQL,
+    PRODUCTOS_SQL,
+    SENALIZACIONES_SQL,
+    ProductoRowMapper,
+)
+from licitaciones.infrastructure.persistence.repositories.plan_guard import PlanCostGuard
+from licitaciones.infrastructure.persistence.repositories.producto_cache import ProductoCache
+
+_MATCH_SCORE = re.compile(r"\bmatch_score_total\b", re.IGNORECASE)
 
 
 class ProductoRepository(IProductoRepository):
     """Implementación del repositorio de productos"""
 
-    def __init__(self, session: Session):
+    def __init__(
+        self,
+        session: Session,
+        cache: ProductoCache | None = None,
+        max_plan_cost: float | None = None,
+    ):
+        """
+        Args:
+            session: Sesión de SQLAlchemy
+            cache: Caché de productos mapeados, compartida entre repositorios (opcional)
+            max_plan_cost: Costo máximo del plan (EXPLAIN) del SQL del LLM; None no lo controla
+        """
         self.session = session
-        self.mapper = ProductoMapper()
+        self.row_mapper = ProductoRowMapper()
         self.validator = SQLValidatorService()
+        self.cache = cache
+        self.plan_guard = PlanCostGuard(max_plan_cost) if max_plan_cost is not None else None
 
     def buscar_por_query(
         self,
@@ -34,56 +59,96 @@ class ProductoRepository(IProductoRepository):
 
         Returns:
             Lista de productos encontrados
+
+        Raises:
+            ValueError: Si el SQL es inválido, inseguro o su plan es demasiado costoso
         """
         # 1. Validar SQL si está habilitado
+        con_score = None
         if validar and seguridad:
             validacion = self.validator.validar(sql_query)
             if not validacion.es_valido:
                 errores = "\n".join(validacion.errores)
                 raise ValueError(f"SQL inválido o inseguro:\n{errores}")
+            con_score = "match_score_total" in validacion.identificadores
+
+        # 2. Ejecutar la query raw, trayendo solo los ids (el umbral se filtra en SQL),
+        #    si su plan estimado no es demasiado costoso
+        def construir(sql: str) -> tuple[TextClause, dict]:
+            return self._ids_query(sql, umbral_minimo, con_score)
 
-        # 2. Ejecutar la query raw
-        result = self.session.execute(text(sql_query))
-        columnas = result.keys()
+        if self.plan_guard is not None:
+            consulta = self.plan_guard.acotar(self.session, sql_query, construir)
+        else:
+            consulta = construir(sql_query)
+        ids = [row[0] for row in self.session.execute(*consulta)]
 
-        # 3. Procesar resultados
-        productos = []
-        for row in result:
-            row_dict = dict(zip(columnas, row))
+        # 3. Cargar todos los productos juntos y respetar el orden (y repeticiones) del SQL
+        productos = self.get_many(ids)
+        return [productos[producto_id] for producto_id in ids if producto_id in productos]
+
+    def get_many(self, producto_ids: Iterable[int]) -> dict[int, Producto]:
+        """
+        Obtiene productos vigentes por id, desde la caché o la base de datos
 
-            # Filtrar por umbral si hay score
-            if "match_score_total" in row_dict:
-                score = float(row_dict["match_score_total"])
-                if score < umbral_minimo:
-                    continue
+        Args:
+            producto_ids: Ids de productos
 
-            # Obtener ID y cargar producto completo
-            producto_id = row_dict.get("id")
-            if producto_id:
-                producto = self._cargar_producto_completo(producto_id)
-                if producto:
-                    productos.append(producto)
+        Returns:
+            Productos encontrados por id (los inexistentes o eliminados se omiten)
+        """
+        ids = set(producto_ids)
+        if self.cache is None:
+            return self._cargar_productos_completos(ids)
 
+        self.cache.ensure_version(self._version_catalogo)
+        productos = self.cache.get_many(ids)
+        faltantes = ids - productos.keys()
+        if faltantes:
+            cargados = self._cargar_productos_completos(faltantes)
+            self.cache.put_many(cargados)
+            productos.update(cargados)
         return productos
 
-    def _cargar_producto_completo(self, producto_id: int) -> Producto:
-        """Carga un producto con todas sus relaciones"""
-        model = (
-            self.session.query(ProductoModel)
-            .options(
-                joinedload(ProductoModel.accesorios),
-                joinedload(ProductoModel.alarmas).joinedload("tipo_alarma"),
-                joinedload(ProductoModel.alimentacion),
-                joinedload(ProductoModel.aparatos_medida),
-                joinedload(ProductoModel.ensayos).joinedload("tipo_ensayo"),
-                joinedload(ProductoModel.especificaciones),
-                joinedload(ProductoModel.gabinete),
-                joinedload(ProductoModel.garantia),
-                joinedload(ProductoModel.salida),
-                joinedload(ProductoModel.senalizaciones),
-            )
-            .filter(ProductoModel.id == producto_id)
-            .first()
+    def _version_catalogo(self) -> int:
+        """Versión actual del catálogo (ver migración 003)"""
+        return self.session.execute(text("SELECT version FROM catalogo_version")).scalar_one()
+
+    def _ids_query(
+        self, sql_query: str, umbral_minimo: float, con_score: bool | None = None
+    ) -> tuple[TextClause, dict]:
+        """Envuelve el SQL del LLM para obtener solo los ids, filtrando por score.
+
+        con_score indica si la query expone match_score_total (ya resuelto por el
+        validador); si es None se busca en el texto.
+        """
+        subquery = sql_query.strip().rstrip(";")
+        condiciones = ["q.id IS NOT NULL"]
+        params = {}
+        if con_score is None:
+            con_score = bool(_MATCH_SCORE.search(subquery))
+        if con_score:
+            condiciones.append("q.match_score_total >= :umbral_minimo")
+            params["umbral_minimo"] = umbral_minimo
+        return (
+            text(f"SELECT q.id FROM ({subquery}) AS q WHERE {' AND '.join(condiciones)}"),
+            params,
         )
 
-        return self.mapper.to_entity(model) if model else None
+    def _cargar_productos_completos(self, producto_ids: set[int]) -> dict[int, Producto]:
+        """Carga productos vigentes (no eliminados del catálogo) con todas sus relaciones.
+
+        Una query para los productos con sus relaciones 1:1 y una por cada relación
+        1:N, sin importar cuántos productos se pidan. Las filas se mapean directo a
+        entidades, sin instanciar modelos del ORM.
+        """
+        if not producto_ids:
+            return {}
+
+        params = {"ids": list(producto_ids)}
+        return self.row_mapper.to_entities(
+            self.session.execute(text(PRODUCTOS_SQL), params),
+            self.session.execute(text(ALARMAS_SQL), params),
+            self.session.execute(text(ENSAYOS_SQL), params),
+            self.session.execute(text(SENALIZACIONES_SQL), params),
+        )
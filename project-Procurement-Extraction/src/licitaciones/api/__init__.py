@@ -0,0 +1 @@
+"""API HTTP: subida de PDFs, cola de extracciones y consulta de resultados."""
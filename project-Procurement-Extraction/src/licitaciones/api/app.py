@@ -0,0 +1,225 @@
+"""API HTTP (ASGI) para subir licitaciones y consultar sus resultados.
+
+Endpoints (bajo /api):
+
+- POST /extracciones: sube un PDF (multipart, campo `file`; `page_ranges`
+  opcional) y devuelve 202 con el id de la extracción, sin esperar a que se
+  procese.
+- GET /extracciones: historial, más recientes primero (keyset con
+  `antes_de_fecha` y `antes_de_id` de la última fila recibida).
+- GET /extracciones/{id}: estado y, si terminó, los items extraídos.
+- GET /extracciones/{id}/eventos: progreso como Server-Sent Events.
+- GET /extracciones/{id}/matches: productos coincidentes de cada item.
+
+Los PDFs se procesan en un pool de workers (ver jobs.py) que comparte un
+único ApplicationContext; las subidas y consultas a Gemini de todos los jobs
+corren sobre un mismo event loop (AsyncGeminiProductExtractor). Los
+resultados se leen de las tablas de historial.
+Los jobs en curso viven en memoria: correr un solo proceso por instancia.
+
+Requiere el extra `api` (fastapi, uvicorn, python-multipart).
+"""
+
+import argparse
+import shutil
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+
+import uvicorn
+from fastapi import FastAPI, File, Form, HTTPException, Query, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+
+from licitaciones.api.jobs import EVENTOS_FINALES, ColaLlenaError, JobQueue
+from licitaciones.api.schemas import (
+    evento_final,
+    evento_sse,
+    registro_extraccion,
+    registro_job,
+    resultados_matching,
+)
+from licitaciones.app import build_streaming_pipeline, parse_page_ranges, prepare_database
+from licitaciones.app_context import ApplicationContext
+from licitaciones.config import get_settings
+from licitaciones.db.extracciones import ExtraccionRepository
+from licitaciones.logger import get_logger, setup_logging
+
+logger = get_logger(__name__)
+
+# Bytes leídos por vez al guardar un PDF subido
+_UPLOAD_CHUNK = 1024 * 1024
+
+
+def create_app(ctx: ApplicationContext | None = None) -> FastAPI:
+    """Crea la aplicación.
+
+    Args:
+        ctx: Contexto a usar. Si es None se crea uno al iniciar y se cierra al
+            apagar la aplicación.
+    """
+    settings = get_settings()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        contexto = ctx or ApplicationContext(async_gemini=True)
+        if not await run_in_threadpool(prepare_database, contexto):
+            raise RuntimeError("La base de datos no está disponible")
+
+        app.state.jobs = JobQueue(
+            lambda on_progress: build_streaming_pipeline(contexto, on_progress),
+            max_workers=settings.api_workers,
+            max_pending=settings.api_max_pending_jobs,
+        )
+        app.state.historial = ExtraccionRepository(contexto.db_connection)
+        try:
+            yield
+        finally:
+            await run_in_threadpool(app.state.jobs.close)
+            if ctx is None:
+                contexto.close()
+
+    app = FastAPI(title="LiciBot API", lifespan=lifespan)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=[o.strip() for o in settings.api_cors_origins.split(",") if o.strip()],
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    upload_dir = Path(settings.api_upload_dir)
+    max_bytes = settings.pdf_max_size_mb * 1024 * 1024
+
+    # Los endpoints sin `async` corren en el threadpool: psycopg2 y el disco bloquean
+
+    @app.post("/api/extracciones", status_code=202)
+    def subir_pdf(
+        request: Request,
+        file: UploadFile = File(...),
+        page_ranges: str | None = Form(None),
+    ) -> dict:
+        filename = Path(file.filename or "licitacion.pdf").name
+        if not filename.lower().endswith(".pdf"):
+            raise HTTPException(400, "El archivo debe ser un PDF")
+        try:
+            rangos = parse_page_ranges(page_ranges) if page_ranges else None
+        except ValueError as e:
+            raise HTTPException(400, f"Rangos de páginas inválidos: {e}") from e
+
+        # Un directorio por extracción conserva el nombre original en pdf_path
+        job_id = str(uuid.uuid4())
+        pdf_path = upload_dir / job_id / filename
+        pdf_path.parent.mkdir(parents=True)
+        try:
+            _guardar_upload(file, pdf_path, max_bytes)
+            job = request.app.state.jobs.enviar(
+                pdf_path, rangos, filename=filename, job_id=job_id, borrar=pdf_path.parent
+            )
+        except ColaLlenaError as e:
+            shutil.rmtree(pdf_path.parent, ignore_errors=True)
+            raise HTTPException(503, str(e), headers={"Retry-After": "30"}) from e
+        except Exception:
+            shutil.rmtree(pdf_path.parent, ignore_errors=True)
+            raise
+        logger.info("Extracción %s encolada: %s", job.id, filename)
+        return registro_job(job)
+
+    @app.get("/api/extracciones")
+    def listar_extracciones(
+        request: Request,
+        licitacion_id: str | None = None,
+        desde: datetime | None = None,
+        antes_de_fecha: datetime | None = None,
+        antes_de_id: uuid.UUID | None = None,
+        limite: int = Query(50, ge=1, le=200),
+    ) -> list[dict]:
+        antes_de = None
+        if antes_de_fecha is not None and antes_de_id is not None:
+            antes_de = (antes_de_fecha, str(antes_de_id))
+        resumenes = request.app.state.historial.listar(licitacion_id, desde, antes_de, limite)
+        return [registro_extraccion(resumen) for resumen in resumenes]
+
+    @app.get("/api/extracciones/{extraccion_id}")
+    def obtener_extraccion(request: Request, extraccion_id: uuid.UUID) -> dict:
+        detalle = request.app.state.historial.obtener(str(extraccion_id))
+        if detalle is not None:
+            return registro_extraccion(detalle.resumen, detalle)
+        # En cola o todavía sin escribir
+        job = request.app.state.jobs.obtener(str(extraccion_id))
+        if job is None:
+            raise HTTPException(404, "Extracción no encontrada")
+        return registro_job(job)
+
+    @app.get("/api/extracciones/{extraccion_id}/matches")
+    def obtener_matches(request: Request, extraccion_id: uuid.UUID) -> list[dict]:
+        detalle = request.app.state.historial.obtener(str(extraccion_id))
+        if detalle is None:
+            raise HTTPException(404, "Extracción no encontrada")
+        return resultados_matching(detalle)
+
+    @app.get("/api/extracciones/{extraccion_id}/eventos")
+    async def eventos_extraccion(request: Request, extraccion_id: uuid.UUID) -> StreamingResponse:
+        jobs: JobQueue = request.app.state.jobs
+        job_id = str(extraccion_id)
+        if jobs.obtener(job_id) is None:
+            # Job olvidado o de otra ejecución: alcanza con su estado final
+            detalle = await run_in_threadpool(request.app.state.historial.obtener, job_id)
+            if detalle is None:
+                raise HTTPException(404, "Extracción no encontrada")
+            return StreamingResponse(
+                iter([evento_sse(evento_final(detalle))]), media_type="text/event-stream"
+            )
+
+        async def stream() -> AsyncIterator[str]:
+            leidos = 0
+            # Espera en el event loop: un stream abierto no ocupa un thread del pool
+            while not await request.is_disconnected():
+                nuevos = await jobs.eventos_async(
+                    job_id, leidos, settings.api_event_timeout_seconds
+                )
+                if nuevos is None:
+                    return
+                if not nuevos:
+                    yield ": ping\n\n"
+                    continue
+                leidos += len(nuevos)
+                for evento in nuevos:
+                    yield evento_sse(evento)
+                if nuevos[-1]["tipo"] in EVENTOS_FINALES:
+                    return
+
+        return StreamingResponse(
+            stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    return app
+
+
+def _guardar_upload(file: UploadFile, destino: Path, max_bytes: int) -> None:
+    """Copia el PDF subido a disco por partes, cortando si supera `max_bytes`."""
+    escritos = 0
+    with open(destino, "wb") as f:
+        while chunk := file.file.read(_UPLOAD_CHUNK):
+            escritos += len(chunk)
+            if escritos > max_bytes:
+                raise HTTPException(413, f"El PDF supera {max_bytes // (1024 * 1024)} MB")
+            f.write(chunk)
+
+
+def main() -> None:
+    """Punto de entrada: `licitaciones-api`."""
+    setup_logging()
+    parser = argparse.ArgumentParser(description="API HTTP de LiciBot")
+    parser.add_argument("--host", default="0.0.0.0", help="Interfaz (default: 0.0.0.0)")
+    parser.add_argument("--port", type=int, default=8000, help="Puerto (default: 8000)")
+    args = parser.parse_args()
+    # Un solo proceso: los jobs en curso y sus eventos viven en memoria
+    uvicorn.run(create_app(), host=args.host, port=args.port, log_config=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""Cola de jobs de extracción para la API.
+
+Cada PDF subido es un job que corre en un pool de workers acotado, con un
+StreamingPipeline propio sobre las dependencias compartidas del
+ApplicationContext (pool de BD, clientes LLM con sus límites de concurrencia,
+caché de extracción e índice del catálogo). `enviar` devuelve el job al
+instante; el progreso queda como una lista de eventos que los clientes leen
+con `eventos` (long polling bloqueante) o `eventos_async` (desde un event
+loop, sin ocupar un thread mientras espera; lo usa el endpoint SSE).
+
+El id del job es el id de la extracción: cuando el job termina, sus
+resultados ya están escritos y se leen de las tablas de historial
+(db/extracciones.py). Los jobs terminados se olvidan pasado cierto número.
+"""
+
+import asyncio
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from licitaciones.logger import get_logger
+from licitaciones.streaming import StreamingPipeline, StreamJob, StreamResult
+
+logger = get_logger(__name__)
+
+# Eventos que cierran el stream de un job
+EVENTOS_FINALES = frozenset({"completado", "error"})
+
+
+class ColaLlenaError(RuntimeError):
+    """Hay demasiados jobs esperando un worker."""
+
+
+@dataclass
+class Job:
+    """Un PDF subido y el estado de su extracción."""
+
+    id: str
+    pdf_path: Path
+    filename: str
+    page_ranges: list[tuple[int, int]] | None = None
+    estado: str = "en_cola"  # "en_cola", "en_curso", "ok" o "error"
+    created_at: datetime = field(default_factory=datetime.now)
+    items: int = 0
+    matched_items: int = 0
+    error: str | None = None
+    eventos: list[dict] = field(default_factory=list)
+    borrar: Path | None = None  # Archivo o directorio a borrar cuando el job termina
+
+    @property
+    def terminado(self) -> bool:
+        return self.estado in ("ok", "error")
+
+
+class JobQueue:
+    """Pool de workers que procesa PDFs en segundo plano."""
+
+    def __init__(
+        self,
+        crear_pipeline: Callable[[Callable[[StreamResult], None]], StreamingPipeline],
+        max_workers: int = 2,
+        max_pending: int = 100,
+        max_terminados: int = 1000,
+    ) -> None:
+        """Inicializa la cola.
+
+        Args:
+            crear_pipeline: Arma un StreamingPipeline con el callback de progreso dado.
+            max_workers: Jobs procesados a la vez.
+            max_pending: Jobs esperando un worker antes de rechazar nuevos.
+            max_terminados: Jobs terminados que se conservan en memoria.
+        """
+        self._crear_pipeline = crear_pipeline
+        self._max_pending = max_pending
+        self._max_terminados = max_terminados
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="extraccion"
+        )
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._cambios = threading.Condition()
+        # Esperas de eventos_async por job: (loop, evento que se marca al registrar)
+        self._avisos: dict[str, set[tuple[asyncio.AbstractEventLoop, asyncio.Event]]] = {}
+
+    def enviar(
+        self,
+        pdf_path: Path,
+        page_ranges: list[tuple[int, int]] | None = None,
+        filename: str | None = None,
+        job_id: str | None = None,
+        borrar: Path | None = None,
+    ) -> Job:
+        """Encola un PDF y devuelve su job sin esperar a que se procese.
+
+        Args:
+            pdf_path: PDF a procesar.
+            page_ranges: Rangos de páginas opcionales.
+            filename: Nombre para mostrar (default: el del archivo).
+            job_id: Id del job y de la extracción (default: uno nuevo).
+            borrar: Archivo o directorio a borrar al terminar (el PDF subido).
+
+        Raises:
+            ColaLlenaError: Si hay `max_pending` jobs esperando.
+        """
+        job = Job(job_id or str(uuid.uuid4()), pdf_path, filename or pdf_path.name, page_ranges)
+        job.borrar = borrar
+        with self._cambios:
+            if sum(1 for j in self._jobs.values() if j.estado == "en_cola") >= self._max_pending:
+                raise ColaLlenaError(f"Hay {self._max_pending} extracciones en cola")
+            self._jobs[job.id] = job
+            self._registrar(job, "en_cola")
+        self._executor.submit(self._procesar, job)
+        return job
+
+    def obtener(self, job_id: str) -> Job | None:
+        """Job por id, o None si no existe o ya se olvidó."""
+        with self._cambios:
+            return self._jobs.get(job_id)
+
+    def eventos(
+        self, job_id: str, desde: int = 0, timeout: float | None = None
+    ) -> list[dict] | None:
+        """Eventos del job a partir del índice `desde`.
+
+        Si no hay eventos nuevos espera hasta `timeout` segundos y devuelve una
+        lista vacía si no llega ninguno.
+
+        Returns:
+            Los eventos nuevos, o None si el job no existe.
+        """
+        with self._cambios:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            self._cambios.wait_for(lambda: len(job.eventos) > desde, timeout)
+            return job.eventos[desde:]
+
+    async def eventos_async(
+        self, job_id: str, desde: int = 0, timeout: float | None = None
+    ) -> list[dict] | None:
+        """Como `eventos`, pero espera en el event loop en lugar de bloquear un thread."""
+        aviso = (asyncio.get_running_loop(), asyncio.Event())
+        with self._cambios:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if len(job.eventos) > desde:
+                return job.eventos[desde:]
+            self._avisos.setdefault(job_id, set()).add(aviso)
+        try:
+            await asyncio.wait_for(aviso[1].wait(), timeout)
+        except TimeoutError:
+            pass
+        finally:
+            with self._cambios:
+                avisos = self._avisos.get(job_id, set())
+                avisos.discard(aviso)
+                if not avisos:
+                    self._avisos.pop(job_id, None)
+        with self._cambios:
+            return job.eventos[desde:]
+
+    def close(self) -> None:
+        """Descarta los jobs en cola y espera a los que están en curso.
+
+        Los jobs descartados terminan con error y sus archivos se borran.
+        """
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        with self._cambios:
+            for job in self._jobs.values():
+                if job.estado == "en_cola":
+                    job.estado, job.error = "error", "Cancelada: el servicio se detuvo"
+                    self._registrar(job, "error")
+                    _borrar(job.borrar)
+
+    def _procesar(self, job: Job) -> None:
+        with self._cambios:
+            job.estado = "en_curso"
+            self._registrar(job, "procesando")
+        try:
+            pipeline = self._crear_pipeline(lambda resultado: self._progreso(job, resultado))
+            (resultado,) = pipeline.run([StreamJob(job.pdf_path, job.page_ranges, job.id)])
+            error = resultado.error
+        except Exception as e:
+            logger.exception("Error procesando %s", job.pdf_path)
+            resultado, error = None, str(e)
+        finally:
+            _borrar(job.borrar)
+
+        with self._cambios:
+            if resultado is not None:
+                job.items, job.matched_items = resultado.items, resultado.matched_items
+            job.estado, job.error = ("error", error) if error else ("ok", None)
+            self._registrar(job, "error" if error else "completado")
+            self._olvidar_terminados()
+
+    def _progreso(self, job: Job, resultado: StreamResult) -> None:
+        with self._cambios:
+            job.items, job.matched_items = resultado.items, resultado.matched_items
+            self._registrar(job, "progreso")
+
+    def _registrar(self, job: Job, tipo: str) -> None:
+        """Agrega un evento al job y despierta a quienes lo esperan (con el lock tomado)."""
+        evento = {"tipo": tipo, "items": job.items, "matched_items": job.matched_items}
+        if job.error:
+            evento["error"] = job.error
+        job.eventos.append(evento)
+        self._cambios.notify_all()
+        for loop, aviso in self._avisos.get(job.id, ()):
+            try:
+                loop.call_soon_threadsafe(aviso.set)
+            except RuntimeError:
+                pass  # Loop cerrado: ya nadie espera
+
+    def _olvidar_terminados(self) -> None:
+        terminados = [job_id for job_id, job in self._jobs.items() if job.terminado]
+        for job_id in terminados[: max(0, len(terminados) - self._max_terminados)]:
+            del self._jobs[job_id]
+
+
+def _borrar(ruta: Path | None) -> None:
+    """Borra un archivo o directorio, si existe."""
+    if ruta is None:
+        return
+    if ruta.is_dir():
+        shutil.rmtree(ruta, ignore_errors=True)
+    else:
+        ruta.unlink(missing_ok=True)
@@ -0,0 +1,106 @@
+"""Respuestas de la API con las formas que usa el frontend.
+
+Ver frontend/src/types: ExtractionRecord y MatchResult. Los scores se
+guardan entre 0 y 1 y el frontend los muestra entre 0 y 100.
+"""
+
+import json
+from pathlib import Path
+
+from licitaciones.api.jobs import Job
+from licitaciones.db.extracciones import (
+    ExtraccionDetalle,
+    ExtraccionResumen,
+    formatear_paginas,
+)
+
+# Estado de la extracción (BD y jobs) -> ExtractionStatus del frontend
+ESTADOS = {
+    "en_cola": "processing",
+    "en_curso": "processing",
+    "ok": "completed",
+    "error": "error",
+}
+
+
+def _porcentaje(score: float | None) -> float:
+    return round((score or 0.0) * 100, 1)
+
+
+def registro_extraccion(
+    resumen: ExtraccionResumen, detalle: ExtraccionDetalle | None = None
+) -> dict:
+    """ExtractionRecord de una extracción del historial (con su resultado si hay detalle)."""
+    registro = {
+        "id": resumen.id,
+        "filename": Path(resumen.pdf_path).name,
+        "uploadedAt": resumen.created_at.isoformat(),
+        "status": ESTADOS.get(resumen.estado, "processing"),
+        "pageRanges": resumen.paginas,
+        "licitacionId": resumen.licitacion_id,
+        "totalItems": resumen.total_items,
+        "errorMessage": resumen.error,
+    }
+    if detalle is not None:
+        registro["result"] = {
+            "especificaciones_comunes": detalle.especificaciones_comunes,
+            "items": [item.item for item in detalle.items],
+        }
+        registro["etapas"] = detalle.etapas
+    return registro
+
+
+def registro_job(job: Job) -> dict:
+    """ExtractionRecord de un job que todavía no está (completo) en el historial."""
+    return {
+        "id": job.id,
+        "filename": job.filename,
+        "uploadedAt": job.created_at.isoformat(),
+        "status": ESTADOS[job.estado],
+        "pageRanges": formatear_paginas(job.page_ranges),
+        "totalItems": job.items,
+        "errorMessage": job.error,
+    }
+
+
+def resultados_matching(detalle: ExtraccionDetalle) -> list[dict]:
+    """MatchResult de cada item de la extracción, en orden de documento."""
+    return [
+        {
+            "item": item.item,
+            "productos": [
+                {
+                    "id": producto.id,
+                    "codigo": producto.codigo,
+                    "marca": producto.marca,
+                    "modelo": producto.modelo,
+                    "tension_nominal": producto.tension_nominal,
+                    "corriente_nominal": producto.corriente_nominal,
+                    "regulador_diodos": producto.regulador_diodos,
+                    "score": _porcentaje(producto.score),
+                }
+                for producto in item.productos
+            ],
+            "bestScore": _porcentaje(item.match_score),
+            "notas": item.match_notas,
+        }
+        for item in detalle.items
+    ]
+
+
+def evento_sse(evento: dict) -> str:
+    """Un evento del job en formato Server-Sent Events."""
+    return f"event: {evento['tipo']}\ndata: {json.dumps(evento, ensure_ascii=False)}\n\n"
+
+
+def evento_final(detalle: ExtraccionDetalle) -> dict:
+    """Evento de cierre de una extracción leída del historial (su job ya no está en memoria)."""
+    resumen = detalle.resumen
+    evento = {
+        "tipo": {"ok": "completado", "error": "error"}.get(resumen.estado, "procesando"),
+        "items": resumen.total_items or len(detalle.items),
+        "matched_items": sum(1 for item in detalle.items if item.productos),
+    }
+    if resumen.error:
+        evento["error"] = resumen.error
+    return evento
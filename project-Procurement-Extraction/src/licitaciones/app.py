@@ -7,12 +7,18 @@ Usa ApplicationContext para obtener todas las dependencias.
 import argparse
 import sys
 import time
+from collections.abc import Callable
+from functools import cache
 from pathlib import Path
 
 from licitaciones.app_context import ApplicationContext
+from licitaciones.batch import SUMMARY_FILENAME, BatchRunner, build_jobs, collect_pdfs
+from licitaciones.config import get_settings
 from licitaciones.db.init import ensure_database_ready
 from licitaciones.infrastructure.dependency_injection import DependencyContainer
+from licitaciones.infrastructure.persistence.repositories.producto_cache import ProductoCache
 from licitaciones.logger import get_logger, setup_logging
+from licitaciones.streaming import StreamingPipeline, StreamJob, StreamResult
 
 logger = get_logger(__name__)
 
@@ -74,9 +80,93 @@ def wait_for_database(ctx: ApplicationContext, max_retries: int = 30) -> bool:
     return False
 
 
+def parse_manifest(manifest_path: Path) -> list[tuple[Path, list[tuple[int, int]] | None]]:
+    """Parse a batch manifest file.
+
+    One PDF per line, optionally followed by `|` and page ranges. Blank lines
+    and lines starting with `#` are ignored. Relative paths are resolved
+    against the manifest's directory.
+
+    Example:
+        licitacion_001.pdf
+        /data/licitacion_002.pdf | 1-10, 15-25
+
+    Args:
+        manifest_path: Path to the manifest file.
+
+    Returns:
+        List of (pdf_path, page_ranges) tuples.
+
+    Raises:
+        ValueError: If a line has an invalid page range.
+    """
+    entries = []
+    with open(manifest_path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            path_str, _, pages_str = line.partition("|")
+            pdf_path = Path(path_str.strip())
+            if not pdf_path.is_absolute():
+                pdf_path = manifest_path.parent / pdf_path
+            try:
+                page_ranges = parse_page_ranges(pages_str) if pages_str.strip() else None
+            except ValueError as e:
+                raise ValueError(f"Line {line_number}: {e}") from e
+            entries.append((pdf_path, page_ranges))
+    return entries
+
+
+def prepare_database(ctx: ApplicationContext) -> bool:
+    """Espera la BD y verifica/crea tablas y catálogo.
+
+    Args:
+        ctx: Contexto de la aplicación.
+
+    Returns:
+        True si la base de datos está lista, False si no.
+    """
+    if not wait_for_database(ctx):
+        return False
+    return ensure_database_ready(
+        ctx.db_connection, catalog_workers=ctx.settings.catalog_sync_workers
+    )
+
+
+@cache
+def _producto_cache() -> ProductoCache:
+    """Caché de productos del proceso, compartida por todos los contenedores."""
+    settings = get_settings()
+    return ProductoCache(
+        max_entries=settings.producto_cache_max_entries,
+        ttl_seconds=settings.producto_cache_ttl_seconds,
+    )
+
+
 def get_dependency_container(session):
     """Factory para obtener el contenedor de dependencias"""
-    return DependencyContainer(session)
+    return DependencyContainer(
+        session,
+        producto_cache=_producto_cache(),
+        max_plan_cost=get_settings().sql_max_plan_cost or None,
+    )
+
+
+def build_streaming_pipeline(
+    ctx: ApplicationContext,
+    on_progress: Callable[[StreamResult], None] | None = None,
+) -> StreamingPipeline:
+    """StreamingPipeline sobre las dependencias compartidas del contexto."""
+    return StreamingPipeline(
+        extraction_pipeline=ctx.extraction_pipeline,
+        matcher=ctx.product_matcher,
+        db=ctx.db_connection,
+        queue_size=ctx.settings.stream_queue_size,
+        persist_batch_size=ctx.settings.stream_persist_batch_size,
+        persist_flush_seconds=ctx.settings.stream_persist_flush_seconds,
+        on_progress=on_progress,
+    )
 
 
 def run(
@@ -94,23 +184,28 @@ def run(
     """
     ctx = ApplicationContext()
     try:
-        # 1. Esperar conexión a BD
-        if not wait_for_database(ctx):
-            return 1
-
-        # 2. Verificar/crear tablas
-        if not ensure_database_ready(ctx.db_connection):
+        # 1-2. Esperar conexión a BD y verificar/crear tablas
+        if not prepare_database(ctx):
             return 1
 
-        # 3. Procesar PDF
+        # 3. Procesar PDF: extracción, matching y persistencia en streaming
         if page_ranges:
             logger.info("Procesando PDF: %s (páginas: %s)", pdf_path, page_ranges)
         else:
             logger.info("Procesando PDF: %s", pdf_path)
-        result = ctx.extraction_pipeline.process_pdf(pdf_path, page_ranges)
-        logger.info("Extracción completada: %d items encontrados", len(result.items))
-        # TODO: Guardar en BD y hacer matching con catálogo
-        json_output = result.model_dump_json(indent=2, ensure_ascii=False)
+        pipeline = build_streaming_pipeline(ctx)
+        (result,) = pipeline.run([StreamJob(pdf_path, page_ranges)])
+        if result.status == "error":
+            logger.error("Error procesando %s: %s", pdf_path, result.error)
+            return 1
+        logger.info(
+            "Extracción completada: %d items encontrados, %d con productos coincidentes "
+            "(extracción %s)",
+            result.items,
+            result.matched_items,
+            result.extraccion_id,
+        )
+        json_output = result.licitacion.model_dump_json(indent=2, ensure_ascii=False)
         output_path = pdf_path.with_suffix(".json")
         with open(output_path, "w", encoding="utf-8") as f:
             f.write(json_output)
@@ -120,20 +215,84 @@ def run(
         ctx.close()
 
 
+def run_batch(
+    pdfs: list[tuple[Path, list[tuple[int, int]] | None]],
+    output_dir: Path,
+    max_workers: int | None = None,
+    resume: bool = True,
+) -> int:
+    """Procesa varios PDFs reutilizando un único ApplicationContext.
+
+    Cada PDF se extrae, matchea y persiste igual que con `run`.
+
+    Args:
+        pdfs: Lista de (ruta al PDF, rangos de páginas opcionales).
+        output_dir: Directorio donde escribir un JSON por PDF y el resumen.
+        max_workers: PDFs en paralelo (default: settings.batch_max_workers).
+        resume: Si True, saltea los PDFs que ya tienen resultado.
+
+    Returns:
+        Código de salida (0 = todos OK, 1 = algún error).
+    """
+    ctx = ApplicationContext()
+    try:
+        if not prepare_database(ctx):
+            return 1
+
+        runner = BatchRunner(
+            crear_pipeline=lambda: build_streaming_pipeline(ctx),
+            max_workers=max_workers or ctx.settings.batch_max_workers,
+            resume=resume,
+        )
+        results = runner.run(build_jobs(pdfs, output_dir), output_dir / SUMMARY_FILENAME)
+        errors = sum(1 for r in results if r.status == "error")
+        logger.info("Batch completado: %d PDFs, %d errores", len(results), errors)
+        return 1 if errors else 0
+    finally:
+        ctx.close()
+
+
 def main() -> None:
     """Punto de entrada CLI."""
     setup_logging()
 
     parser = argparse.ArgumentParser(description="Procesa PDFs de licitaciones y extrae productos")
-    parser.add_argument("--pdf", type=Path, required=True, help="Ruta al PDF a procesar")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--pdf", type=Path, help="Ruta al PDF a procesar")
+    source.add_argument("--dir", type=Path, help="Directorio con PDFs a procesar en batch")
+    source.add_argument(
+        "--manifest",
+        type=Path,
+        help="Archivo con un PDF por línea (opcional: 'ruta | 1-10, 15-25')",
+    )
     parser.add_argument(
         "--pages",
         type=str,
         default=None,
         help="Rangos de páginas a procesar (ej: '1-10, 15-25, 45-50'). 1-indexed, inclusive.",
     )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=None,
+        help="Directorio de resultados del batch (default: directorio de entrada)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="PDFs en paralelo en modo batch (default: BATCH_MAX_WORKERS)",
+    )
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Reprocesa PDFs aunque ya tengan resultado",
+    )
     args = parser.parse_args()
 
+    if args.dir or args.manifest:
+        sys.exit(_main_batch(args))
+
     if not args.pdf.exists():
         logger.error("Archivo no encontrado: %s", args.pdf)
         sys.exit(1)
@@ -150,5 +309,42 @@ def main() -> None:
     sys.exit(run(args.pdf, page_ranges))
 
 
+def _main_batch(args: argparse.Namespace) -> int:
+    """Arma la lista de PDFs del modo batch y lo ejecuta."""
+    if args.dir:
+        if not args.dir.is_dir():
+            logger.error("Directorio no encontrado: %s", args.dir)
+            return 1
+        page_ranges = None
+        if args.pages:
+            try:
+                page_ranges = parse_page_ranges(args.pages)
+            except ValueError as e:
+                logger.error("Error en formato de páginas: %s", e)
+                return 1
+        pdfs = [(pdf, page_ranges) for pdf in collect_pdfs(args.dir)]
+        output_dir = args.output_dir or args.dir
+    else:
+        if not args.manifest.exists():
+            logger.error("Manifest no encontrado: %s", args.manifest)
+            return 1
+        try:
+            pdfs = parse_manifest(args.manifest)
+        except ValueError as e:
+            logger.error("Error en manifest: %s", e)
+            return 1
+        output_dir = args.output_dir or args.manifest.parent
+
+    missing = [pdf for pdf, _ in pdfs if not pdf.exists()]
+    if missing:
+        logger.error("Archivos no encontrados: %s", ", ".join(str(p) for p in missing))
+        return 1
+    if not pdfs:
+        logger.warning("No hay PDFs para procesar")
+        return 0
+
+    return run_batch(pdfs, output_dir, max_workers=args.workers, resume=not args.no_resume)
+
+
 if __name__ == "__main__":
     main()
@@ -3,16 +3,30 @@
 Responsable de crear e inyectar todas las dependencias de la aplicación.
 """
 
+import threading
+from pathlib import Path
+
 from licitaciones.config import LLMProvider, Settings, get_settings
 from licitaciones.db.connection import DatabaseConnection
+from licitaciones.extraction.cache import ExtractionCache
+from licitaciones.extraction.chunked_structuring import ChunkedPropertiesExtractor
 from licitaciones.extraction.extraction_pipeline import ExtractionPipeline
 from licitaciones.extraction.pdf_processor import PDFProcessor
-from licitaciones.extraction.product_extractor import GeminiProductExtractor
+from licitaciones.extraction.product_extractor import (
+    AsyncGeminiProductExtractor,
+    GeminiProductExtractor,
+)
 from licitaciones.extraction.properties_extractor import (
     GeminiPropertiesExtractor,
     OpenAIPropertiesExtractor,
 )
 from licitaciones.extraction.protocols import PropertiesExtractorProtocol
+from licitaciones.extraction.throttling import (
+    ConcurrencyLimitedProductExtractor,
+    ConcurrencyLimitedPropertiesExtractor,
+)
+from licitaciones.matching.catalog_index import CatalogSnapshot
+from licitaciones.matching.matcher import ProductMatcher
 
 
 class ApplicationContext:
@@ -24,28 +38,69 @@ class ApplicationContext:
     3. Conectar todo con inyección de dependencias
     """
 
-    def __init__(self) -> None:
-        """Inicializa el contexto de la aplicación."""
+    def __init__(self, async_gemini: bool = False) -> None:
+        """Inicializa el contexto de la aplicación.
+
+        Args:
+            async_gemini: Si True, las llamadas a Gemini de todos los PDFs en
+                vuelo corren sobre un único event loop (AsyncGeminiProductExtractor).
+        """
         # 1. Cargar configuración
         self._settings = get_settings()
 
         # 2. Crear conexión a BD
         self._db_connection = DatabaseConnection(settings=self._settings)
 
-        # 3. Crear extractores
+        # 3. Límites de concurrencia por proveedor (compartidos entre PDFs en paralelo)
+        self._provider_semaphores = {
+            LLMProvider.GEMINI.value: threading.BoundedSemaphore(
+                self._settings.gemini_max_concurrency
+            ),
+            LLMProvider.OPENAI.value: threading.BoundedSemaphore(
+                self._settings.openai_max_concurrency
+            ),
+        }
+
+        # 4. Crear extractores
         self._pdf_processor = PDFProcessor(settings=self._settings)
-        self._product_extractor = GeminiProductExtractor(settings=self._settings)
+        extractor_class = AsyncGeminiProductExtractor if async_gemini else GeminiProductExtractor
+        self._gemini_product_extractor = extractor_class(settings=self._settings)
+        self._product_extractor = ConcurrencyLimitedProductExtractor(
+            self._gemini_product_extractor,
+            self._provider_semaphores[LLMProvider.GEMINI.value],
+        )
 
-        # 4. Crear extractor de propiedades según configuración
-        self._properties_extractor = self._create_properties_extractor()
+        # 5. Crear extractor de propiedades según configuración
+        self._properties_extractor = ConcurrencyLimitedPropertiesExtractor(
+            self._create_properties_extractor(),
+            self._provider_semaphores[self._settings.structured_output_provider],
+        )
+        if self._settings.structuring_chunk_max_chars > 0:
+            # Cada chunk pasa por el límite de concurrencia del proveedor
+            self._properties_extractor = ChunkedPropertiesExtractor(
+                self._properties_extractor,
+                max_chunk_chars=self._settings.structuring_chunk_max_chars,
+                max_workers=self._settings.structuring_chunk_workers,
+            )
+
+        # 6. Crear caché de extracción (opcional)
+        self._extraction_cache = (
+            ExtractionCache(Path(self._settings.extraction_cache_dir))
+            if self._settings.extraction_cache_enabled
+            else None
+        )
 
-        # 5. Crear pipeline con dependencias inyectadas
+        # 7. Crear pipeline con dependencias inyectadas
         self._extraction_pipeline = ExtractionPipeline(
             pdf_preprocessor=self._pdf_processor,
             product_extractor=self._product_extractor,
             properties_extractor=self._properties_extractor,
+            cache=self._extraction_cache,
         )
 
+        # 8. Crear matcher sobre el catálogo vigente (el índice se carga en el primer uso)
+        self._product_matcher = ProductMatcher(CatalogSnapshot(self._db_connection))
+
     @property
     def settings(self) -> Settings:
         """Configuración de la aplicación."""
@@ -61,9 +116,16 @@ class ApplicationContext:
         """Pipeline de extracción de PDFs."""
         return self._extraction_pipeline
 
+    @property
+    def product_matcher(self) -> ProductMatcher:
+        """Matcher de items contra el catálogo."""
+        return self._product_matcher
+
     def close(self) -> None:
-        """Cierra la conexión a la base de datos."""
+        """Cierra la BD, los workers de análisis de PDF y los archivos subidos a Gemini."""
         self._db_connection.close()
+        self._pdf_processor.close()
+        self._gemini_product_extractor.close()
 
     def _create_properties_extractor(self) -> PropertiesExtractorProtocol:
         """Crea el extractor de propiedades según configuración."""
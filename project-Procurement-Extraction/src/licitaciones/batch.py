@@ -0,0 +1,232 @@
+"""Procesamiento batch de PDFs de licitaciones.
+
+Procesa varios PDFs con un único ApplicationContext (pool de BD, clientes LLM
+y caché compartidos) usando un pool de threads acotado. Cada PDF pasa por un
+StreamingPipeline propio (extracción, matching y persistencia, como `--pdf`),
+así las etapas de un PDF se solapan y varios PDFs avanzan a la vez. Escribe un
+JSON por PDF y un resumen, y puede retomarse: los PDFs con resultado ya escrito
+se saltean.
+"""
+
+import json
+import os
+import tempfile
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from licitaciones.logger import get_logger
+from licitaciones.streaming import StreamingPipeline, StreamJob
+
+logger = get_logger(__name__)
+
+SUMMARY_FILENAME = "summary.json"
+
+
+@dataclass
+class BatchJob:
+    """Un PDF a procesar dentro del batch."""
+
+    pdf_path: Path
+    output_path: Path
+    page_ranges: list[tuple[int, int]] | None = None
+
+
+@dataclass
+class BatchResult:
+    """Resultado del procesamiento de un PDF."""
+
+    pdf_path: str
+    output_path: str
+    status: str  # "ok", "error" o "skipped"
+    items: int | None = None
+    matched_items: int | None = None  # Items con al menos un producto coincidente
+    extraccion_id: str | None = None  # Id de la extracción en el historial
+    seconds: float = 0.0
+    error: str | None = None
+
+
+def collect_pdfs(directory: Path) -> list[Path]:
+    """Lista los PDFs de un directorio (no recursivo), ordenados por nombre."""
+    return sorted(p for p in directory.iterdir() if p.is_file() and p.suffix.lower() == ".pdf")
+
+
+def build_jobs(
+    pdfs: list[tuple[Path, list[tuple[int, int]] | None]],
+    output_dir: Path,
+) -> list[BatchJob]:
+    """Arma los jobs asignando un JSON de salida único por PDF.
+
+    Args:
+        pdfs: Lista de (ruta al PDF, rangos de páginas opcionales).
+        output_dir: Directorio donde escribir los resultados.
+
+    Returns:
+        Lista de BatchJob. Si dos PDFs comparten nombre, se agrega un sufijo.
+    """
+    jobs = []
+    used_names: set[str] = set()
+    for pdf_path, page_ranges in pdfs:
+        name = pdf_path.stem
+        suffix = 1
+        while name in used_names:
+            suffix += 1
+            name = f"{pdf_path.stem}_{suffix}"
+        used_names.add(name)
+        jobs.append(BatchJob(pdf_path, output_dir / f"{name}.json", page_ranges))
+    return jobs
+
+
+def _write_atomic(path: Path, content: str) -> None:
+    """Escribe un archivo de forma atómica (temporal + rename)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+
+class BatchRunner:
+    """Ejecuta el pipeline de streaming sobre muchos PDFs en paralelo."""
+
+    def __init__(
+        self,
+        crear_pipeline: Callable[[], StreamingPipeline],
+        max_workers: int = 4,
+        resume: bool = True,
+    ) -> None:
+        """Inicializa el runner.
+
+        Args:
+            crear_pipeline: Arma un StreamingPipeline por PDF, sobre las
+                dependencias compartidas.
+            max_workers: Cantidad máxima de PDFs en vuelo.
+            resume: Si True, saltea PDFs cuyo JSON de salida ya existe.
+        """
+        self._crear_pipeline = crear_pipeline
+        self._max_workers = max(1, max_workers)
+        self._resume = resume
+
+    def run(self, jobs: list[BatchJob], summary_path: Path) -> list[BatchResult]:
+        """Procesa todos los jobs y escribe el resumen.
+
+        El resumen se escribe aunque el batch se interrumpa: los PDFs en cola
+        se cancelan, los que están en curso se esperan y se incluyen.
+
+        Args:
+            jobs: PDFs a procesar.
+            summary_path: Ruta del JSON de resumen.
+
+        Returns:
+            Resultados en el mismo orden que `jobs` (los no terminados se omiten).
+        """
+        results: dict[int, BatchResult] = {}
+        pending: list[tuple[int, BatchJob]] = []
+
+        for index, job in enumerate(jobs):
+            if self._resume and job.output_path.exists():
+                logger.info("Ya procesado, se saltea: %s", job.pdf_path)
+                results[index] = BatchResult(
+                    pdf_path=str(job.pdf_path),
+                    output_path=str(job.output_path),
+                    status="skipped",
+                )
+            else:
+                pending.append((index, job))
+
+        logger.info(
+            "Batch: %d PDFs (%d pendientes, %d workers)",
+            len(jobs),
+            len(pending),
+            self._max_workers,
+        )
+        start = time.perf_counter()
+        pool = ThreadPoolExecutor(max_workers=self._max_workers)
+        futures: dict[Future, int] = {}
+        try:
+            futures = {pool.submit(self._process, job): index for index, job in pending}
+            for future in as_completed(futures):
+                result = future.result()
+                results[futures[future]] = result
+                logger.info(
+                    "[%d/%d] %s: %s (%.1fs)",
+                    len(results),
+                    len(jobs),
+                    result.status,
+                    result.pdf_path,
+                    result.seconds,
+                )
+        finally:
+            # Ante una interrupción, no arrancar los PDFs que quedaban en cola y
+            # esperar a los que están en curso: usan el contexto que el llamador
+            # cierra al volver
+            pool.shutdown(wait=True, cancel_futures=True)
+            for future, index in futures.items():
+                if index not in results and future.done() and not future.cancelled():
+                    if future.exception() is None:
+                        results[index] = future.result()
+            ordered = [results[i] for i in sorted(results)]
+            self._write_summary(summary_path, ordered, len(jobs), time.perf_counter() - start)
+
+        return ordered
+
+    def _process(self, job: BatchJob) -> BatchResult:
+        """Procesa un PDF (extracción, matching y persistencia) y escribe su JSON.
+
+        Nunca lanza excepciones.
+        """
+        start = time.perf_counter()
+        try:
+            pipeline = self._crear_pipeline()
+            (result,) = pipeline.run([StreamJob(job.pdf_path, job.page_ranges)])
+            if result.status == "error":
+                raise RuntimeError(result.error)
+            _write_atomic(
+                job.output_path,
+                result.licitacion.model_dump_json(indent=2, ensure_ascii=False),
+            )
+            return BatchResult(
+                pdf_path=str(job.pdf_path),
+                output_path=str(job.output_path),
+                status="ok",
+                items=result.items,
+                matched_items=result.matched_items,
+                extraccion_id=result.extraccion_id,
+                seconds=time.perf_counter() - start,
+            )
+        except Exception as e:
+            logger.error("Error procesando %s: %s", job.pdf_path, e)
+            return BatchResult(
+                pdf_path=str(job.pdf_path),
+                output_path=str(job.output_path),
+                status="error",
+                seconds=time.perf_counter() - start,
+                error=str(e),
+            )
+
+    def _write_summary(
+        self,
+        summary_path: Path,
+        results: list[BatchResult],
+        total_jobs: int,
+        seconds: float,
+    ) -> None:
+        """Escribe el resumen del batch."""
+        counts = {"ok": 0, "error": 0, "skipped": 0}
+        for result in results:
+            counts[result.status] += 1
+        summary = {
+            "total": total_jobs,
+            "completed": len(results),
+            **counts,
+            "seconds": round(seconds, 3),
+            "results": [asdict(r) for r in results],
+        }
+        _write_atomic(summary_path, json.dumps(summary, indent=2, ensure_ascii=False))
+        logger.info("Resumen guardado en: %s", summary_path)
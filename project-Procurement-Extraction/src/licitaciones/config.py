@@ -31,6 +31,10 @@ class Settings(BaseSettings):
     structured_output_model_openai: str = "gpt-4o-mini"
     structured_output_model_gemini: str = "gemini-2.5-flash"
     structured_output_temperature: float = 0
+    structuring_chunk_max_chars: int = (
+        40_000  # Longer raw text is split at item boundaries; 0 disables
+    )
+    structuring_chunk_workers: int = 4
 
     # Database
     postgres_host: str = "localhost"
@@ -53,6 +57,51 @@ class Settings(BaseSettings):
     pdf_low_res_dpi_threshold: int = 150
     pdf_text_to_size_ratio_threshold: float = 0.01
     pdf_min_acceptable_quality_score: int = 10
+    pdf_quality_early_exit: bool = True
+    pdf_quality_workers: int = 1  # > 1 scans page shards in a process pool
+    pdf_quality_min_pages_per_shard: int = 8
+
+    # Page triage: without explicit page ranges, only pages dense in technical
+    # specs (keywords, units, tables) are sent to the LLM
+    page_triage_enabled: bool = True
+    page_triage_min_score: float = 6.0  # Pages scoring at least this are kept
+    page_triage_context_pages: int = 1  # Neighbours kept around each kept page
+    page_triage_max_ratio: float = 0.8  # Keeping more than this share sends the whole PDF
+
+    # Catalog sync
+    catalog_sync_workers: int = 3  # CSV files transformed/written in parallel; 1 = sequential
+
+    # Mapped Producto entities cached in memory (invalidated by catalog version)
+    producto_cache_max_entries: int = 2048
+    producto_cache_ttl_seconds: float = 600.0
+
+    # LLM-generated SQL is rejected if its EXPLAIN total cost exceeds this (0 disables)
+    sql_max_plan_cost: float = 50000.0
+
+    # Streaming pipeline (extract -> match -> persist)
+    stream_queue_size: int = 16  # Messages buffered between stages
+    stream_persist_batch_size: int = 50  # Pending rows that force a write
+    stream_persist_flush_seconds: float = 0.5  # Max wait before pending rows are written
+
+    # HTTP API (licitaciones-api)
+    api_workers: int = 2  # Extraction jobs processed at once, each one a streaming pipeline
+    api_max_pending_jobs: int = 100  # Uploads waiting beyond this are rejected (503)
+    api_upload_dir: str = ".cache/uploads"  # Uploaded PDFs, deleted once processed
+    api_event_timeout_seconds: float = 15.0  # SSE keep-alive interval
+    api_cors_origins: str = "http://localhost:5173"  # Comma-separated; the Vite dev server
+
+    # Batch processing
+    batch_max_workers: int = 4  # PDFs in flight at once
+    gemini_max_concurrency: int = 4  # Simultaneous calls per LLM provider
+    openai_max_concurrency: int = 4
+
+    # Gemini uploaded files (reused across prompts/runs by content hash)
+    gemini_file_ttl_seconds: int = 900  # 0 deletes right after each call
+    gemini_file_sweep_interval_seconds: int = 60
+
+    # Extraction cache (content-addressed, on disk)
+    extraction_cache_enabled: bool = True
+    extraction_cache_dir: str = ".cache/extractions"
 
 
 def get_settings() -> Settings:
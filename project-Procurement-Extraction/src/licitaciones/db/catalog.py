@@ -1,10 +1,34 @@
-"""Carga el catálogo de productos desde archivos CSV."""
-
+"""Sincroniza el catálogo de productos desde archivos CSV.
+
+Cada CSV tiene una fila por ítem de la planilla y una columna por producto. El
+CSV se transpone una sola vez (una fila por producto) y las columnas de cada
+tabla se arman vectorizadas con pandas.
+
+La sincronización es incremental: cada producto lleva un hash de su columna en
+el CSV (`productos.hash_origen`) y solo se escriben los productos nuevos o
+modificados, con un upsert por tabla (`execute_values` + `ON CONFLICT`) en una
+transacción por archivo. Los productos que ya no están en ningún CSV se marcan
+como eliminados (`productos.eliminado_at`) en lugar de borrarse, salvo que
+sean demasiados: un CSV vacío, truncado o con otro delimitador no vacía el
+catálogo.
+
+Con varios workers, los CSVs (uno por familia de productos) se transforman en
+paralelo en un pool de procesos y cada archivo se escribe con su propia
+conexión del pool, así el tiempo total queda acotado por el archivo más grande.
+"""
+
+import hashlib
 import json
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
+from psycopg2.extensions import cursor
+from psycopg2.extras import execute_values
 
 from licitaciones.db.connection import DatabaseConnection
 from licitaciones.logger import get_logger
@@ -14,6 +38,24 @@ logger = get_logger(__name__)
 # Directorio default para CSVs del catálogo
 DEFAULT_CATALOG_DIR = Path(__file__).parent.parent.parent.parent / "data" / "catalog"
 
+# Archivos del catálogo, uno por familia de productos (RDT, RCTI, RCMI, ...)
+CATALOG_GLOB = "*_productos.csv"
+
+# Filas por sentencia en execute_values
+INSERT_PAGE_SIZE = 500
+
+# Versión de la transformación CSV -> tablas. Incrementarla fuerza a reescribir
+# todos los productos en la próxima sincronización.
+TRANSFORM_VERSION = 1
+
+# Si una sincronización eliminaría más que esta fracción de los productos
+# vigentes, los CSVs probablemente están incompletos: no se elimina nada
+MAX_DELETE_RATIO = 0.5
+
+_NUMERO = r"(\d+\.?\d*)"
+_RANGO = r"(\d+\.?\d*)\s*-\s*(\d+\.?\d*)"
+_DIMENSIONES = r"(\d+)\s*x\s*(\d+)\s*x\s*(\d+)"
+
 
 def limpiar_valor(valor: object) -> object:
     """Limpia y convierte valores del CSV."""
@@ -57,293 +99,562 @@ def extraer_dimensiones(texto: object) -> tuple[int | None, int | None, int | No
     return None, None, None
 
 
-def procesar_csv(archivo_csv: Path, db: DatabaseConnection) -> int:
-    """Procesa un archivo CSV de productos.
+def transponer_csv(archivo_csv: Path) -> pd.DataFrame:
+    """Lee un CSV del catálogo como una fila por producto y una columna por ítem.
+
+    Los valores pasan por `limpiar_valor`. Si un ítem se repite, prevalece la
+    última fila.
+    """
+    df = pd.read_csv(archivo_csv, encoding="utf-8", dtype=str)
+    df = df.dropna(subset=["ítem"]).drop_duplicates("ítem", keep="last")
+    tabla = df.set_index("ítem").iloc[:, 2:].T.astype(object)
+    return tabla.map(limpiar_valor)
+
+
+def _columna(tabla: pd.DataFrame, item: str) -> pd.Series:
+    """Valores de un ítem para todos los productos (None si el ítem no existe)."""
+    if item in tabla.columns:
+        return tabla[item]
+    return pd.Series(None, index=tabla.index, dtype=object)
+
+
+def _texto(tabla: pd.DataFrame, item: str) -> pd.Series:
+    return _columna(tabla, item).astype("string")
+
+
+def _numero(tabla: pd.DataFrame, item: str) -> pd.Series:
+    """Versión vectorizada de `extraer_numero` sobre un ítem."""
+    return _texto(tabla, item).str.extract(_NUMERO)[0].astype(float)
+
+
+def _hash_producto(items: pd.Index, valores: tuple) -> str:
+    """Hash de la columna de un producto en el CSV (ítems y valores)."""
+    contenido = json.dumps(
+        [TRANSFORM_VERSION, list(zip(items, valores, strict=True))],
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(contenido.encode("utf-8")).hexdigest()
+
+
+def _con_default(serie: pd.Series, default: object) -> pd.Series:
+    """Reemplaza valores vacíos o falsos por `default` (como `valor or default`)."""
+    return serie.where(serie.map(bool), default)
+
+
+def transformar_csv(tabla: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    """Arma las filas de cada tabla del catálogo a partir del CSV transpuesto.
 
     Args:
-        archivo_csv: Ruta al archivo CSV.
-        db: Conexión a la base de datos.
+        tabla: CSV transpuesto (ver `transponer_csv`).
 
     Returns:
-        Número de productos cargados.
+        DataFrame por tabla, en orden de inserción. `productos` trae una fila
+        por código, con el hash de su columna en `hash_origen`; las tablas
+        hijas se vinculan por la columna `codigo`.
     """
-    logger.info("Procesando %s...", archivo_csv.name)
+    codigo = _columna(tabla, "1.1")
+    tension_corriente = codigo.astype("string").str.extract(r"(\d+)-(\d+)")
+    validos = codigo.map(bool) & tension_corriente[0].notna()
+    sin_tension = codigo.map(bool) & tension_corriente[0].isna()
+    for invalido in codigo[sin_tension]:
+        logger.warning("No se pudo extraer tensión/corriente: %s", invalido)
+
+    tabla = tabla[validos.to_numpy()]
+    tension_corriente = tension_corriente[validos.to_numpy()]
+    codigo = codigo[validos].astype(str)
+
+    productos = pd.DataFrame(
+        {
+            "codigo": codigo,
+            "marca": _con_default(_columna(tabla, "1.2"), "SERVELEC"),
+            "modelo": _con_default(_columna(tabla, "1.3"), codigo),
+            "tension_nominal": tension_corriente[0].astype(int),
+            "corriente_nominal": tension_corriente[1].astype(int),
+            "regulador_diodos": pd.Series(
+                np.select(
+                    [codigo.str.contains("CS"), codigo.str.contains("CD")],
+                    ["CS", "CD"],
+                    default=None,
+                ),
+                index=codigo.index,
+                dtype=object,
+            ),
+            "origen": _con_default(_columna(tabla, "1.5"), "Argentina"),
+            "tipo": _con_default(_columna(tabla, "1.6"), "Autorregulado"),
+            "hash_origen": [
+                _hash_producto(tabla.columns, fila)
+                for fila in tabla.itertuples(index=False, name=None)
+            ],
+        }
+    )
+
+    flote = _texto(tabla, "5").str.extract(_RANGO).astype(float)
+    fondo = _texto(tabla, "5.2").str.extract(_RANGO).astype(float)
+    especificaciones = pd.DataFrame(
+        {
+            "codigo": codigo,
+            "normas_fabricacion": _columna(tabla, "1.4"),
+            "apto_pb_ac": _columna(tabla, "1.7"),
+            "apto_ni_cd": _columna(tabla, "1.7"),
+            "temperatura_maxima": _numero(tabla, "2.1"),
+            "temperatura_minima": _numero(tabla, "2.2"),
+            "altura_snm": _numero(tabla, "2.3"),
+            "humedad_relativa_max": _numero(tabla, "2.4"),
+            "tipo_instalacion": _columna(tabla, "2.5"),
+            "tipo_servicio": _columna(tabla, "2.6"),
+            "ventilacion": _columna(tabla, "7.1"),
+            "tipo_rectificador": _columna(tabla, "7.2"),
+            "nivel_ruido": _columna(tabla, "12.5"),
+            "proteccion_sobretension": _columna(tabla, "8.1"),
+            "proteccion_cortocircuito": _columna(tabla, "8.2"),
+            "proteccion_sobrecarga": _columna(tabla, "8.3"),
+            "ripple_con_baterias": _columna(tabla, "5.7.2001"),
+            "ripple_sin_baterias": _columna(tabla, "5.7.2002"),
+            "tension_flote_min": flote[0],
+            "tension_flote_max": flote[1],
+            "tension_fondo_min": fondo[0],
+            "tension_fondo_max": fondo[1],
+            "modo_manual_automatico": _columna(tabla, "5.3.2001"),
+            "modo_carga_excepcional": _columna(tabla, "5.3.2002"),
+            "regulador_diodos_carga": _columna(tabla, "5.4"),
+            "deteccion_polo_tierra": _columna(tabla, "5.3"),
+        }
+    )
+
+    alimentacion = pd.DataFrame(
+        {
+            "codigo": codigo,
+            "tipo": _columna(tabla, "3.1"),
+            "tension": _columna(tabla, "3.2"),
+            "rango_tension": _columna(tabla, "3.3"),
+            "frecuencia": _numero(tabla, "3.4"),
+            "rango_frecuencia": _columna(tabla, "3.5"),
+            "conexion_neutro": _columna(tabla, "3.5.2001"),
+            "conductor_pe_independiente": _columna(tabla, "3.5.2002"),
+            "corriente_cortocircuito": _columna(tabla, "3.5.2003"),
+            "tipo_interruptor_acometida": _columna(tabla, "3.5.2004"),
+            "potencia_transformador": _columna(tabla, "3.5.2005"),
+            "corriente_conexion_transformador": _columna(tabla, "3.5.5.1"),
+        }
+    )
+
+    salida = pd.DataFrame(
+        {
+            "codigo": codigo,
+            "tension_nominal": _numero(tabla, "4.1"),
+            "corriente_nominal": _numero(tabla, "4.2"),
+            "maxima_corriente_consumos": _numero(tabla, "4.3"),
+            "tipo_interruptor_consumo": _columna(tabla, "5.4"),
+            "tipo_interruptor_baterias": _columna(tabla, "5.5"),
+            "sistema_rectificacion": _columna(tabla, "5.6"),
+        }
+    )
+
+    dimensiones = _texto(tabla, "6.8").str.extract(_DIMENSIONES).astype("Int64")
+    gabinete = pd.DataFrame(
+        {
+            "codigo": codigo,
+            "material": _columna(tabla, "6.1"),
+            "acceso": _columna(tabla, "6.2"),
+            "grado_proteccion": _columna(tabla, "6.3"),
+            "espesor_chapa": _numero(tabla, "6.4"),
+            "tipo_pintura": _columna(tabla, "6.5"),
+            "color": _columna(tabla, "6.6"),
+            "espesor_pintura": _numero(tabla, "6.7"),
+            "ancho": dimensiones[0],
+            "alto": dimensiones[1],
+            "profundidad": dimensiones[2],
+        }
+    )
+
+    mediciones = pd.DataFrame(
+        {
+            "corriente_entrada": _columna(tabla, "11.4"),
+            "tension_entrada": _columna(tabla, "11.5"),
+            "corriente_rectificador": _columna(tabla, "11.6"),
+            "corriente_baterias": _columna(tabla, "11.7"),
+            "tension_rectificador": _columna(tabla, "11.8"),
+            "tension_baterias": _columna(tabla, "11.9"),
+            "tension_consumos": _columna(tabla, "11.10"),
+            "corriente_descarga": _columna(tabla, "11.11"),
+        }
+    )
+    aparatos_medida = pd.DataFrame(
+        {
+            "codigo": codigo,
+            "unidad_digital_centralizada": _columna(tabla, "11.1"),
+            "protocolo_comunicacion": _columna(tabla, "11.2"),
+            "puerto_comunicacion": _columna(tabla, "11.3"),
+            "medicion": [
+                json.dumps(medidas) if medidas else None
+                for medidas in (
+                    {k: v for k, v in fila.items() if v is not None}
+                    for fila in mediciones.to_dict("records")
+                )
+            ],
+        }
+    )
+
+    accesorios = pd.DataFrame(
+        {
+            "codigo": codigo,
+            "panel_control": _columna(tabla, "12.1"),
+            "resistencias_calefactoras": _columna(tabla, "12.2"),
+            "tension_resistencias": _numero(tabla, "12.2.2001"),
+            "potencia_resistencias": _columna(tabla, "12.2.2002"),
+            "cables_incluidos": _columna(tabla, "12.3"),
+            "tension_aislacion_cables": _columna(tabla, "12.3.2001"),
+            "material_cables": _columna(tabla, "12.3.2002"),
+            "baja_emision_halogenos": _columna(tabla, "12.3.2003"),
+            "bornes_reserva": _columna(tabla, "12.4"),
+            "placas_identificacion": _columna(tabla, "12.6"),
+            "chapa_caracteristicas": _columna(tabla, "12.7"),
+        }
+    )
+
+    garantia = pd.DataFrame(
+        {
+            "codigo": codigo,
+            "meses": _con_default(_numero(tabla, "14").fillna(0), 24),
+        }
+    )
+
+    tablas = {
+        "productos": productos,
+        "especificaciones": especificaciones,
+        "alimentacion": alimentacion,
+        "salida": salida,
+        "gabinete": gabinete,
+        "aparatos_medida": aparatos_medida,
+        "accesorios": accesorios,
+        "garantia": garantia,
+    }
+    # Un código repetido en el mismo archivo se carga una sola vez (el primero)
+    duplicados = productos["codigo"].duplicated().to_numpy()
+    return {nombre: df[~duplicados].reset_index(drop=True) for nombre, df in tablas.items()}
+
+
+def _filas(df: pd.DataFrame) -> list[tuple]:
+    """Filas como tuplas de tipos nativos de Python, con None para valores nulos."""
+    return [
+        tuple(
+            None if v is None or v is pd.NA or (isinstance(v, float) and np.isnan(v)) else v
+            for v in (x.item() if isinstance(x, np.generic) else x for x in fila)
+        )
+        for fila in df.astype(object).itertuples(index=False, name=None)
+    ]
+
+
+def _upsert_sql(tabla: str, columnas: list[str], clave: str) -> str:
+    actualizar = ", ".join(f"{c} = EXCLUDED.{c}" for c in columnas if c != clave)
+    return (
+        f"INSERT INTO {tabla} ({', '.join(columnas)}) VALUES %s "
+        f"ON CONFLICT ({clave}) DO UPDATE SET {actualizar}"
+    )
+
+
+def upsert_tablas(cur: cursor, tablas: dict[str, pd.DataFrame]) -> int:
+    """Inserta o actualiza productos y sus tablas hijas con un upsert por tabla.
+
+    Un producto marcado como eliminado que vuelve a aparecer se restaura.
 
-    df = pd.read_csv(archivo_csv, encoding="utf-8")
-    columnas_productos = df.columns[3:]
-    productos_cargados = 0
+    Args:
+        cur: Cursor de PostgreSQL (dentro de la transacción del archivo).
+        tablas: Resultado de `transformar_csv` (o un subconjunto de sus filas).
 
-    for col in columnas_productos:
-        producto_data = {}
-        for _, row in df.iterrows():
-            item = row["ítem"]
-            valor = limpiar_valor(row[col])
-            producto_data[item] = valor
+    Returns:
+        Número de productos escritos.
+    """
+    productos = tablas["productos"]
+    if productos.empty:
+        return 0
 
-        try:
-            codigo = producto_data.get("1.1")
-            if not codigo:
-                continue
+    escritos = execute_values(
+        cur,
+        _upsert_sql("productos", list(productos.columns), "codigo")
+        + ", eliminado_at = NULL RETURNING id, codigo",
+        _filas(productos),
+        page_size=INSERT_PAGE_SIZE,
+        fetch=True,
+    )
+    ids = {codigo: producto_id for producto_id, codigo in escritos}
+
+    for nombre, df in tablas.items():
+        if nombre == "productos":
+            continue
+        df = df[df["codigo"].isin(ids)]
+        if df.empty:
+            continue
+        hijas = df.drop(columns="codigo")
+        hijas.insert(0, "producto_id", df["codigo"].map(ids))
+        execute_values(
+            cur,
+            _upsert_sql(nombre, list(hijas.columns), "producto_id"),
+            _filas(hijas),
+            page_size=INSERT_PAGE_SIZE,
+        )
+    return len(ids)
+
+
+@dataclass
+class CatalogSyncResult:
+    """Resumen de una sincronización del catálogo (o de uno de sus archivos)."""
+
+    nuevos: int = 0
+    actualizados: int = 0
+    sin_cambios: int = 0
+    eliminados: int = 0
+    codigos: set[str] | None = None  # Códigos presentes en los CSVs procesados
+    segundos_transformacion: float = 0.0
+    segundos_escritura: float = 0.0
+
+    @property
+    def escritos(self) -> int:
+        """Productos insertados o actualizados."""
+        return self.nuevos + self.actualizados
+
+
+def transformar_archivo(archivo_csv: Path) -> tuple[dict[str, pd.DataFrame], float]:
+    """Lee y transforma un CSV (CPU, sin BD); apto para un pool de procesos.
 
-            match = re.search(r"(\d+)-(\d+)", str(codigo))
-            if not match:
-                logger.warning("No se pudo extraer tensión/corriente: %s", codigo)
-                continue
+    Returns:
+        Tablas del archivo (ver `transformar_csv`) y segundos empleados.
+    """
+    inicio = time.perf_counter()
+    tablas = transformar_csv(transponer_csv(archivo_csv))
+    return tablas, time.perf_counter() - inicio
 
-            tension_nominal = int(match.group(1))
-            corriente_nominal = int(match.group(2))
-
-            regulador_diodos = None
-            if "CS" in str(codigo):
-                regulador_diodos = "CS"
-            elif "CD" in str(codigo):
-                regulador_diodos = "CD"
-
-            with db.get_cursor() as cur:
-                # 1. Producto
-                cur.execute(
-                    """
-                    INSERT INTO productos (codigo, marca, modelo, tension_nominal,
-                                          corriente_nominal, regulador_diodos, origen, tipo)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                    RETURNING id
-                    """,
-                    (
-                        codigo,
-                        producto_data.get("1.2") or "SERVELEC",
-                        producto_data.get("1.3") or codigo,
-                        tension_nominal,
-                        corriente_nominal,
-                        regulador_diodos,
-                        producto_data.get("1.5") or "Argentina",
-                        producto_data.get("1.6") or "Autorregulado",
-                    ),
-                )
-                producto_id = cur.fetchone()[0]
-
-                # 2. Especificaciones
-                flote_min, flote_max = extraer_rango(producto_data.get("5"))
-                fondo_min, fondo_max = extraer_rango(producto_data.get("5.2"))
-
-                cur.execute(
-                    """
-                    INSERT INTO especificaciones (
-                        producto_id, normas_fabricacion, apto_pb_ac, apto_ni_cd,
-                        temperatura_maxima, temperatura_minima, altura_snm, humedad_relativa_max,
-                        tipo_instalacion, tipo_servicio, ventilacion, tipo_rectificador,
-                        nivel_ruido, proteccion_sobretension, proteccion_cortocircuito,
-                        proteccion_sobrecarga, ripple_con_baterias, ripple_sin_baterias,
-                        tension_flote_min, tension_flote_max, tension_fondo_min, tension_fondo_max,
-                        modo_manual_automatico, modo_carga_excepcional,
-                        regulador_diodos_carga, deteccion_polo_tierra
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                              %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """,
-                    (
-                        producto_id,
-                        producto_data.get("1.4"),
-                        limpiar_valor(producto_data.get("1.7")),
-                        limpiar_valor(producto_data.get("1.7")),
-                        extraer_numero(producto_data.get("2.1")),
-                        extraer_numero(producto_data.get("2.2")),
-                        extraer_numero(producto_data.get("2.3")),
-                        extraer_numero(producto_data.get("2.4")),
-                        producto_data.get("2.5"),
-                        producto_data.get("2.6"),
-                        producto_data.get("7.1"),
-                        producto_data.get("7.2"),
-                        producto_data.get("12.5"),
-                        producto_data.get("8.1"),
-                        producto_data.get("8.2"),
-                        producto_data.get("8.3"),
-                        producto_data.get("5.7.2001"),
-                        producto_data.get("5.7.2002"),
-                        flote_min,
-                        flote_max,
-                        fondo_min,
-                        fondo_max,
-                        limpiar_valor(producto_data.get("5.3.2001")),
-                        limpiar_valor(producto_data.get("5.3.2002")),
-                        producto_data.get("5.4"),
-                        limpiar_valor(producto_data.get("5.3")),
-                    ),
-                )
 
-                # 3. Alimentación
-                cur.execute(
-                    """
-                    INSERT INTO alimentacion (
-                        producto_id, tipo, tension, rango_tension, frecuencia, rango_frecuencia,
-                        conexion_neutro, conductor_pe_independiente, corriente_cortocircuito,
-                        tipo_interruptor_acometida, potencia_transformador, corriente_conexion_transformador
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """,
-                    (
-                        producto_id,
-                        producto_data.get("3.1"),
-                        producto_data.get("3.2"),
-                        producto_data.get("3.3"),
-                        extraer_numero(producto_data.get("3.4")),
-                        producto_data.get("3.5"),
-                        producto_data.get("3.5.2001"),
-                        limpiar_valor(producto_data.get("3.5.2002")),
-                        producto_data.get("3.5.2003"),
-                        producto_data.get("3.5.2004"),
-                        producto_data.get("3.5.2005"),
-                        producto_data.get("3.5.5.1"),
-                    ),
-                )
+def sincronizar_tablas(
+    tablas: dict[str, pd.DataFrame], db: DatabaseConnection
+) -> CatalogSyncResult:
+    """Escribe los productos nuevos o cuyo hash cambió, en una sola transacción.
 
-                # 4. Salida
-                cur.execute(
-                    """
-                    INSERT INTO salida (
-                        producto_id, tension_nominal, corriente_nominal, maxima_corriente_consumos,
-                        tipo_interruptor_consumo, tipo_interruptor_baterias, sistema_rectificacion
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    """,
-                    (
-                        producto_id,
-                        extraer_numero(producto_data.get("4.1")),
-                        extraer_numero(producto_data.get("4.2")),
-                        extraer_numero(producto_data.get("4.3")),
-                        producto_data.get("5.4"),
-                        producto_data.get("5.5"),
-                        producto_data.get("5.6"),
-                    ),
-                )
+    Args:
+        tablas: Tablas de un archivo (ver `transformar_csv`).
+        db: Conexión a la base de datos. Cada llamada usa su propia conexión
+            del pool, así que puede ejecutarse en paralelo desde varios threads.
 
-                # 5. Gabinete
-                ancho, alto, profundidad = extraer_dimensiones(producto_data.get("6.8"))
-                cur.execute(
-                    """
-                    INSERT INTO gabinete (
-                        producto_id, material, acceso, grado_proteccion, espesor_chapa,
-                        tipo_pintura, color, espesor_pintura, ancho, alto, profundidad
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """,
-                    (
-                        producto_id,
-                        producto_data.get("6.1"),
-                        producto_data.get("6.2"),
-                        producto_data.get("6.3"),
-                        extraer_numero(producto_data.get("6.4")),
-                        producto_data.get("6.5"),
-                        producto_data.get("6.6"),
-                        extraer_numero(producto_data.get("6.7")),
-                        ancho,
-                        alto,
-                        profundidad,
-                    ),
-                )
+    Returns:
+        Resumen de la sincronización del archivo (sin eliminados).
+    """
+    inicio = time.perf_counter()
+    productos = tablas["productos"]
+    codigos = productos["codigo"].tolist()
+
+    with db.get_cursor() as cur:
+        cur.execute(
+            "SELECT codigo, hash_origen FROM productos "
+            "WHERE codigo = ANY(%s) AND eliminado_at IS NULL",
+            (codigos,),
+        )
+        vigentes = dict(cur.fetchall())
+
+        existentes = productos["codigo"].isin(vigentes).to_numpy()
+        cambiados = (productos["hash_origen"] != productos["codigo"].map(vigentes)).to_numpy()
+        upsert_tablas(cur, {nombre: df[cambiados] for nombre, df in tablas.items()})
+
+    return CatalogSyncResult(
+        nuevos=int((cambiados & ~existentes).sum()),
+        actualizados=int((cambiados & existentes).sum()),
+        sin_cambios=int((~cambiados).sum()),
+        codigos=set(codigos),
+        segundos_escritura=time.perf_counter() - inicio,
+    )
+
+
+def procesar_csv(archivo_csv: Path, db: DatabaseConnection) -> CatalogSyncResult:
+    """Sincroniza los productos de un archivo CSV.
 
-                # 6. Aparatos de medida
-                mediciones = {
-                    k: v
-                    for k, v in {
-                        "corriente_entrada": producto_data.get("11.4"),
-                        "tension_entrada": producto_data.get("11.5"),
-                        "corriente_rectificador": producto_data.get("11.6"),
-                        "corriente_baterias": producto_data.get("11.7"),
-                        "tension_rectificador": producto_data.get("11.8"),
-                        "tension_baterias": producto_data.get("11.9"),
-                        "tension_consumos": producto_data.get("11.10"),
-                        "corriente_descarga": producto_data.get("11.11"),
-                    }.items()
-                    if v is not None
-                }
-
-                cur.execute(
-                    """
-                    INSERT INTO aparatos_medida (
-                        producto_id, unidad_digital_centralizada, protocolo_comunicacion,
-                        puerto_comunicacion, medicion
-                    ) VALUES (%s, %s, %s, %s, %s)
-                    """,
-                    (
-                        producto_id,
-                        limpiar_valor(producto_data.get("11.1")),
-                        producto_data.get("11.2"),
-                        producto_data.get("11.3"),
-                        json.dumps(mediciones) if mediciones else None,
-                    ),
-                )
+    Args:
+        archivo_csv: Ruta al archivo CSV.
+        db: Conexión a la base de datos.
 
-                # 7. Accesorios
-                cur.execute(
-                    """
-                    INSERT INTO accesorios (
-                        producto_id, panel_control, resistencias_calefactoras, tension_resistencias,
-                        potencia_resistencias, cables_incluidos, tension_aislacion_cables,
-                        material_cables, baja_emision_halogenos, bornes_reserva,
-                        placas_identificacion, chapa_caracteristicas
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """,
-                    (
-                        producto_id,
-                        producto_data.get("12.1"),
-                        producto_data.get("12.2"),  # VARCHAR, no convertir a boolean
-                        extraer_numero(producto_data.get("12.2.2001")),
-                        producto_data.get("12.2.2002"),
-                        producto_data.get("12.3"),  # VARCHAR, no convertir a boolean
-                        producto_data.get("12.3.2001"),
-                        producto_data.get("12.3.2002"),
-                        limpiar_valor(producto_data.get("12.3.2003")),
-                        limpiar_valor(producto_data.get("12.4")),
-                        limpiar_valor(producto_data.get("12.6")),
-                        limpiar_valor(producto_data.get("12.7")),
-                    ),
-                )
+    Returns:
+        Resumen de la sincronización del archivo (sin eliminados).
+    """
+    logger.info("Procesando %s...", archivo_csv.name)
+    tablas, segundos = transformar_archivo(archivo_csv)
+    resultado = sincronizar_tablas(tablas, db)
+    resultado.segundos_transformacion = segundos
+    return resultado
 
-                # 8. Garantía
-                cur.execute(
-                    """
-                    INSERT INTO garantia (producto_id, meses)
-                    VALUES (%s, %s)
-                    """,
-                    (producto_id, extraer_numero(producto_data.get("14")) or 24),
-                )
 
-            productos_cargados += 1
-            logger.debug("Producto %s cargado", codigo)
+def marcar_eliminados(
+    db: DatabaseConnection,
+    codigos_vigentes: set[str],
+    max_ratio: float = MAX_DELETE_RATIO,
+) -> int:
+    """Marca como eliminados los productos que no están en `codigos_vigentes`.
 
-        except Exception as e:
-            logger.error("Error procesando %s: %s", col, e)
-            continue
+    No marca nada si `codigos_vigentes` está vacío o si habría que marcar más
+    de `max_ratio` de los productos vigentes.
+
+    Returns:
+        Número de productos marcados.
+    """
+    if not codigos_vigentes:
+        logger.warning("Los CSVs no tienen productos: no se marcan productos eliminados")
+        return 0
+
+    with db.get_cursor() as cur:
+        cur.execute(
+            "SELECT count(*), count(*) FILTER (WHERE NOT (codigo = ANY(%s))) "
+            "FROM productos WHERE eliminado_at IS NULL",
+            (sorted(codigos_vigentes),),
+        )
+        vigentes, faltantes = cur.fetchone()
+        if faltantes > max_ratio * vigentes:
+            logger.error(
+                "Los CSVs no tienen %d de %d productos vigentes (máximo %.0f%%): "
+                "no se marcan productos eliminados (verificar archivos CSV)",
+                faltantes,
+                vigentes,
+                max_ratio * 100,
+            )
+            return 0
+        cur.execute(
+            "UPDATE productos SET eliminado_at = CURRENT_TIMESTAMP "
+            "WHERE eliminado_at IS NULL AND NOT (codigo = ANY(%s)) RETURNING codigo",
+            (sorted(codigos_vigentes),),
+        )
+        eliminados = [row[0] for row in cur.fetchall()]
+    if eliminados:
+        logger.info("Productos marcados como eliminados: %s", ", ".join(eliminados))
+    return len(eliminados)
+
+
+def incrementar_version_catalogo(db: DatabaseConnection) -> int:
+    """Incrementa el contador de versión del catálogo (invalida cachés de productos).
+
+    Returns:
+        La nueva versión.
+    """
+    with db.get_cursor() as cur:
+        cur.execute("UPDATE catalogo_version SET version = version + 1 RETURNING version")
+        return cur.fetchone()[0]
+
+
+def _sincronizar_en_paralelo(
+    archivos: list[Path], db: DatabaseConnection, max_workers: int
+) -> dict[Path, CatalogSyncResult | Exception]:
+    """Transforma en un pool de procesos y escribe cada archivo apenas está listo."""
+    resultados: dict[Path, CatalogSyncResult | Exception] = {}
+    with (
+        ProcessPoolExecutor(max_workers=max_workers) as procesos,
+        ThreadPoolExecutor(max_workers=max_workers) as escritores,
+    ):
+        transformaciones = {procesos.submit(transformar_archivo, a): a for a in archivos}
+        escrituras = {}
+        for future in as_completed(transformaciones):
+            archivo = transformaciones[future]
+            try:
+                tablas, segundos = future.result()
+            except Exception as e:
+                resultados[archivo] = e
+                continue
+            logger.info("%s transformado (%.2fs), escribiendo...", archivo.name, segundos)
+            escritura = escritores.submit(sincronizar_tablas, tablas, db)
+            escrituras[escritura] = (archivo, segundos)
+
+        for future in as_completed(escrituras):
+            archivo, segundos = escrituras[future]
+            try:
+                resultado = future.result()
+            except Exception as e:
+                resultados[archivo] = e
+                continue
+            resultado.segundos_transformacion = segundos
+            resultados[archivo] = resultado
+    return resultados
 
-    return productos_cargados
 
+def sync_catalog(
+    db: DatabaseConnection,
+    csv_dir: Path | None = None,
+    max_workers: int = 1,
+) -> CatalogSyncResult:
+    """Sincroniza el catálogo completo con los archivos CSV.
 
-def load_catalog(db: DatabaseConnection, csv_dir: Path | None = None) -> int:
-    """Carga el catálogo completo desde los archivos CSV.
+    Seguro para ejecutar en cada arranque: si nada cambió, solo lee los hashes.
 
     Args:
         db: Conexión a la base de datos.
         csv_dir: Directorio con los CSVs. Si no se especifica, usa el default.
+        max_workers: Archivos procesados en paralelo (1 = secuencial, sin pools).
 
     Returns:
-        Total de productos cargados.
+        Resumen de la sincronización.
     """
     if csv_dir is None:
         csv_dir = DEFAULT_CATALOG_DIR
 
     if not csv_dir.exists():
         logger.error("Directorio de catálogo no encontrado: %s", csv_dir)
-        return 0
+        return CatalogSyncResult()
 
-    archivos = ["RDT_productos.csv", "RCTI_productos.csv", "RCMI_productos.csv"]
-    archivos_encontrados = [csv_dir / a for a in archivos if (csv_dir / a).exists()]
+    archivos_encontrados = sorted(csv_dir.glob(CATALOG_GLOB))
 
     if not archivos_encontrados:
         logger.warning("No se encontraron archivos CSV en: %s", csv_dir)
-        return 0
-
-    total = 0
-    for archivo in archivos_encontrados:
-        try:
-            total += procesar_csv(archivo, db)
-        except Exception as e:
-            logger.error("Error procesando %s: %s", archivo.name, e)
-
-    logger.info("Catálogo cargado: %d productos", total)
+        return CatalogSyncResult()
+
+    inicio = time.perf_counter()
+    workers = min(max_workers, len(archivos_encontrados))
+    if workers > 1:
+        resultados = _sincronizar_en_paralelo(archivos_encontrados, db, workers)
+    else:
+        resultados = {}
+        for archivo in archivos_encontrados:
+            try:
+                resultados[archivo] = procesar_csv(archivo, db)
+            except Exception as e:
+                resultados[archivo] = e
+
+    total = CatalogSyncResult(codigos=set())
+    completo = True
+    for posicion, archivo in enumerate(archivos_encontrados, start=1):
+        resultado = resultados[archivo]
+        if isinstance(resultado, Exception):
+            logger.error("Error procesando %s: %s", archivo.name, resultado)
+            completo = False
+            continue
+        logger.info(
+            "[%d/%d] %s: %d nuevos, %d actualizados, %d sin cambios "
+            "(transformación %.2fs, escritura %.2fs)",
+            posicion,
+            len(archivos_encontrados),
+            archivo.name,
+            resultado.nuevos,
+            resultado.actualizados,
+            resultado.sin_cambios,
+            resultado.segundos_transformacion,
+            resultado.segundos_escritura,
+        )
+        total.nuevos += resultado.nuevos
+        total.actualizados += resultado.actualizados
+        total.sin_cambios += resultado.sin_cambios
+        total.codigos |= resultado.codigos
+        total.segundos_transformacion += resultado.segundos_transformacion
+        total.segundos_escritura += resultado.segundos_escritura
+
+    # Con un archivo fallido no se sabe qué productos faltan: no se elimina nada
+    if completo:
+        total.eliminados = marcar_eliminados(db, total.codigos)
+    else:
+        logger.warning("Sincronización parcial: no se marcan productos eliminados")
+
+    if total.escritos or total.eliminados:
+        version = incrementar_version_catalogo(db)
+        logger.info("Versión del catálogo: %d", version)
+
+    logger.info(
+        "Catálogo sincronizado en %.2fs: %d nuevos, %d actualizados, %d sin cambios, %d eliminados",
+        time.perf_counter() - inicio,
+        total.nuevos,
+        total.actualizados,
+        total.sin_cambios,
+        total.eliminados,
+    )
     return total
@@ -0,0 +1,349 @@
+"""Historial de extracciones: items extraídos, resultados de matching y tiempos.
+
+Escritura: los resultados se acumulan en un LoteResultados y se escriben juntos
+en una sola transacción, con una sentencia `execute_values` por tabla: el costo
+de escritura crece con la cantidad de lotes y no con la de items.
+
+Lectura (ExtraccionRepository): historial paginado por fecha o licitación con
+keyset sobre los índices de la migración 007, y el detalle de una extracción
+(items, matches y tiempos) en una consulta por tabla, sin re-ejecutar nada.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+
+from psycopg2.extensions import cursor
+from psycopg2.extras import Json, execute_values
+
+from licitaciones.db.connection import DatabaseConnection
+from licitaciones.domain.extraction_models import ItemLicitado, LicitacionCompleta
+from licitaciones.matching.matcher import MatchResult
+
+# Filas por sentencia en execute_values
+INSERT_PAGE_SIZE = 500
+
+_INSERTAR_EXTRACCIONES = (
+    "INSERT INTO extracciones (id, licitacion_id, pdf_path, paginas) VALUES %s "
+    "ON CONFLICT (id) DO NOTHING"
+)
+
+_UPSERT_ITEMS = (
+    "INSERT INTO extraccion_items (extraccion_id, orden, numero_item, cantidad, descripcion, "
+    "item, match_score, match_notas) VALUES %s "
+    "ON CONFLICT (extraccion_id, orden) DO UPDATE SET numero_item = EXCLUDED.numero_item, "
+    "cantidad = EXCLUDED.cantidad, descripcion = EXCLUDED.descripcion, item = EXCLUDED.item, "
+    "match_score = EXCLUDED.match_score, match_notas = EXCLUDED.match_notas"
+)
+
+# Un item re-matcheado (combinado con otra parte del documento) reemplaza sus matches
+_BORRAR_MATCHES = (
+    "DELETE FROM extraccion_matches m USING (VALUES %s) AS v(extraccion_id, orden) "
+    "WHERE m.extraccion_id = v.extraccion_id AND m.orden = v.orden"
+)
+
+_INSERTAR_MATCHES = (
+    "INSERT INTO extraccion_matches (extraccion_id, orden, posicion, producto_id, score) VALUES %s"
+)
+
+_FINALIZAR_EXTRACCIONES = (
+    "UPDATE extracciones e SET estado = v.estado, error = v.error, "
+    "especificaciones_comunes = v.comunes, total_items = v.total_items, "
+    "finished_at = CURRENT_TIMESTAMP "
+    "FROM (VALUES %s) AS v(id, estado, error, comunes, total_items) WHERE e.id = v.id"
+)
+
+_UPSERT_ETAPAS = (
+    "INSERT INTO extraccion_etapas (extraccion_id, etapa, segundos) VALUES %s "
+    "ON CONFLICT (extraccion_id, etapa) DO UPDATE SET segundos = EXCLUDED.segundos"
+)
+
+_COLUMNAS_EXTRACCION = (
+    "id::text, licitacion_id, pdf_path, paginas, estado, error, total_items, "
+    "created_at, finished_at"
+)
+
+
+def formatear_paginas(page_ranges: list[tuple[int, int]] | None) -> str | None:
+    """Rangos de páginas como texto ("1-10, 15-25"), el formato de --pages."""
+    if not page_ranges:
+        return None
+    return ", ".join(f"{start}-{end}" for start, end in page_ranges)
+
+
+@dataclass
+class LoteResultados:
+    """Filas pendientes de escribir, agrupadas por tabla.
+
+    Items y matches se indexan por (extraccion_id, orden): si un item se
+    agrega dos veces en el mismo lote, queda la última versión.
+    """
+
+    extracciones: list[tuple] = field(default_factory=list)
+    items: dict[tuple[str, int], tuple] = field(default_factory=dict)
+    matches: dict[tuple[str, int], list[tuple]] = field(default_factory=dict)
+    finalizadas: list[tuple] = field(default_factory=list)
+    etapas: list[tuple] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.extracciones) + len(self.items) + len(self.finalizadas)
+
+    def agregar_extraccion(
+        self,
+        extraccion_id: str,
+        pdf_path: str,
+        page_ranges: list[tuple[int, int]] | None = None,
+        licitacion_id: str | None = None,
+    ) -> None:
+        """Registra el inicio de una extracción."""
+        self.extracciones.append(
+            (extraccion_id, licitacion_id, pdf_path, formatear_paginas(page_ranges))
+        )
+
+    def agregar_item(
+        self,
+        extraccion_id: str,
+        orden: int,
+        item: ItemLicitado,
+        resultado: MatchResult | None = None,
+    ) -> None:
+        """Registra un item extraído y, si lo hay, su resultado de matching."""
+        clave = (extraccion_id, orden)
+        self.items[clave] = (
+            extraccion_id,
+            orden,
+            item.numero_item,
+            item.cantidad,
+            item.descripcion,
+            Json(item.model_dump(mode="json", exclude_none=True)),
+            resultado.score if resultado else None,
+            resultado.notas if resultado else None,
+        )
+        productos = resultado.productos_coincidentes if resultado else []
+        scores = resultado.scores if resultado else []
+        self.matches[clave] = [
+            (extraccion_id, orden, posicion, producto.id, score)
+            for posicion, (producto, score) in enumerate(zip(productos, scores, strict=True))
+        ]
+
+    def finalizar_extraccion(
+        self,
+        extraccion_id: str,
+        licitacion: LicitacionCompleta | None = None,
+        error: str | None = None,
+        etapas: dict[str, float] | None = None,
+    ) -> None:
+        """Registra el fin de una extracción, con su resultado o su error y sus tiempos."""
+        self.etapas.extend(
+            (extraccion_id, etapa, round(segundos, 3)) for etapa, segundos in (etapas or {}).items()
+        )
+        comunes = licitacion.especificaciones_comunes if licitacion else None
+        self.finalizadas.append(
+            (
+                extraccion_id,
+                "error" if error else "ok",
+                error,
+                Json(comunes.model_dump(mode="json", exclude_none=True)) if comunes else None,
+                len(licitacion.items) if licitacion else None,
+            )
+        )
+
+
+def escribir_lote(cur: cursor, lote: LoteResultados) -> None:
+    """Escribe un lote con una sentencia por tabla (en la transacción de `cur`).
+
+    El orden respeta las claves foráneas: extracciones, items, matches y
+    finalmente el cierre de las extracciones terminadas con sus tiempos.
+    """
+    if lote.extracciones:
+        execute_values(cur, _INSERTAR_EXTRACCIONES, lote.extracciones, page_size=INSERT_PAGE_SIZE)
+    if lote.items:
+        execute_values(cur, _UPSERT_ITEMS, list(lote.items.values()), page_size=INSERT_PAGE_SIZE)
+        execute_values(
+            cur,
+            _BORRAR_MATCHES,
+            list(lote.matches),
+            template="(%s::uuid, %s::int)",
+            page_size=INSERT_PAGE_SIZE,
+        )
+        matches = [fila for filas in lote.matches.values() for fila in filas]
+        if matches:
+            execute_values(cur, _INSERTAR_MATCHES, matches, page_size=INSERT_PAGE_SIZE)
+    if lote.finalizadas:
+        execute_values(
+            cur,
+            _FINALIZAR_EXTRACCIONES,
+            lote.finalizadas,
+            template="(%s::uuid, %s, %s, %s::jsonb, %s::int)",
+            page_size=INSERT_PAGE_SIZE,
+        )
+    if lote.etapas:
+        execute_values(cur, _UPSERT_ETAPAS, lote.etapas, page_size=INSERT_PAGE_SIZE)
+
+
+def guardar_lote(db: DatabaseConnection, lote: LoteResultados) -> None:
+    """Escribe un lote en una transacción propia."""
+    if not len(lote):
+        return
+    with db.get_cursor() as cur:
+        escribir_lote(cur, lote)
+
+
+@dataclass
+class ExtraccionResumen:
+    """Una extracción del historial."""
+
+    id: str
+    licitacion_id: str | None
+    pdf_path: str
+    paginas: str | None
+    estado: str
+    error: str | None
+    total_items: int | None
+    created_at: datetime
+    finished_at: datetime | None
+
+
+@dataclass
+class ProductoCoincidente:
+    """Producto del catálogo que matchea un item, con los datos para mostrarlo."""
+
+    id: int
+    codigo: str
+    marca: str
+    modelo: str
+    tension_nominal: int
+    corriente_nominal: int
+    regulador_diodos: str | None
+    score: float
+
+
+@dataclass
+class ItemConMatches:
+    """Item extraído con su resultado de matching."""
+
+    orden: int
+    item: dict
+    match_score: float | None
+    match_notas: str | None
+    productos: list[ProductoCoincidente] = field(default_factory=list)
+
+
+@dataclass
+class ExtraccionDetalle:
+    """Extracción completa: resumen, especificaciones comunes, items y tiempos."""
+
+    resumen: ExtraccionResumen
+    especificaciones_comunes: dict | None
+    items: list[ItemConMatches]
+    etapas: dict[str, float]
+
+
+def _float(value: Decimal | None) -> float | None:
+    return float(value) if value is not None else None
+
+
+class ExtraccionRepository:
+    """Escritura en lote y consultas de historial de extracciones."""
+
+    def __init__(self, db: DatabaseConnection) -> None:
+        """
+        Args:
+            db: Conexión a la base de datos
+        """
+        self.db = db
+
+    def guardar(self, lote: LoteResultados) -> None:
+        """Escribe un lote en una transacción propia."""
+        guardar_lote(self.db, lote)
+
+    def listar(
+        self,
+        licitacion_id: str | None = None,
+        desde: datetime | None = None,
+        antes_de: tuple[datetime, str] | None = None,
+        limite: int = 50,
+    ) -> list[ExtraccionResumen]:
+        """
+        Historial de extracciones, las más recientes primero
+
+        Args:
+            licitacion_id: Solo las de esta licitación (SHA-256 del PDF)
+            desde: Solo las creadas a partir de esta fecha
+            antes_de: (created_at, id) de la última fila de la página anterior
+            limite: Máximo de filas
+
+        Returns:
+            Extracciones ordenadas por fecha descendente
+        """
+        condiciones, params = [], []
+        if licitacion_id is not None:
+            condiciones.append("licitacion_id = %s")
+            params.append(licitacion_id)
+        if desde is not None:
+            condiciones.append("created_at >= %s")
+            params.append(desde)
+        if antes_de is not None:
+            condiciones.append("(created_at, id) < (%s, %s::uuid)")
+            params.extend(antes_de)
+        where = f"WHERE {' AND '.join(condiciones)} " if condiciones else ""
+        with self.db.get_cursor() as cur:
+            cur.execute(
+                f"SELECT {_COLUMNAS_EXTRACCION} FROM extracciones {where}"
+                "ORDER BY created_at DESC, id DESC LIMIT %s",
+                (*params, limite),
+            )
+            return [ExtraccionResumen(*fila) for fila in cur.fetchall()]
+
+    def obtener(self, extraccion_id: str) -> ExtraccionDetalle | None:
+        """
+        Detalle de una extracción: items con sus productos coincidentes y tiempos
+
+        Args:
+            extraccion_id: Id de la extracción
+
+        Returns:
+            El detalle, o None si no existe
+        """
+        with self.db.get_cursor() as cur:
+            cur.execute(
+                f"SELECT {_COLUMNAS_EXTRACCION}, especificaciones_comunes "
+                "FROM extracciones WHERE id = %s::uuid",
+                (extraccion_id,),
+            )
+            fila = cur.fetchone()
+            if fila is None:
+                return None
+
+            cur.execute(
+                "SELECT orden, item, match_score, match_notas FROM extraccion_items "
+                "WHERE extraccion_id = %s::uuid ORDER BY orden",
+                (extraccion_id,),
+            )
+            items = {
+                orden: ItemConMatches(orden, item, _float(score), notas)
+                for orden, item, score, notas in cur.fetchall()
+            }
+
+            cur.execute(
+                "SELECT m.orden, p.id, p.codigo, p.marca, p.modelo, p.tension_nominal, "
+                "p.corriente_nominal, p.regulador_diodos, m.score "
+                "FROM extraccion_matches m JOIN productos p ON p.id = m.producto_id "
+                "WHERE m.extraccion_id = %s::uuid ORDER BY m.orden, m.posicion",
+                (extraccion_id,),
+            )
+            for orden, *producto, score in cur.fetchall():
+                items[orden].productos.append(ProductoCoincidente(*producto, float(score)))
+
+            cur.execute(
+                "SELECT etapa, segundos FROM extraccion_etapas WHERE extraccion_id = %s::uuid",
+                (extraccion_id,),
+            )
+            etapas = {etapa: float(segundos) for etapa, segundos in cur.fetchall()}
+
+        return ExtraccionDetalle(
+            resumen=ExtraccionResumen(*fila[:-1]),
+            especificaciones_comunes=fila[-1],
+            items=list(items.values()),
+            etapas=etapas,
+        )
@@ -1,13 +1,13 @@
 """Inicialización de la base de datos.
 
 Verifica el estado de la BD y la inicializa si es necesario:
-1. Crea tablas si no existen (migrations)
-2. Carga catálogo si está vacío
+1. Aplica las migraciones pendientes (registradas en schema_migrations)
+2. Sincroniza el catálogo con los CSVs (solo escribe lo que cambió)
 """
 
 from pathlib import Path
 
-from licitaciones.db.catalog import load_catalog
+from licitaciones.db.catalog import sync_catalog
 from licitaciones.db.connection import DatabaseConnection
 from licitaciones.logger import get_logger
 
@@ -15,6 +15,7 @@ logger = get_logger(__name__)
 
 # Directorio de migraciones SQL
 MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+INITIAL_MIGRATION = "001_initial_schema.sql"
 
 
 def _check_tables_exist(db: DatabaseConnection) -> bool:
@@ -34,19 +35,28 @@ def _check_tables_exist(db: DatabaseConnection) -> bool:
         return False
 
 
-def _count_products(db: DatabaseConnection) -> int:
-    """Cuenta los productos en la base de datos."""
-    try:
-        with db.get_cursor() as cur:
-            cur.execute("SELECT COUNT(*) FROM productos")
-            result = cur.fetchone()
-            return result[0] if result else 0
-    except Exception:
-        return 0
-
+def _applied_migrations(db: DatabaseConnection, schema_exists: bool) -> set[str]:
+    """Migraciones ya aplicadas según schema_migrations.
 
-def _run_migrations(db: DatabaseConnection) -> bool:
-    """Ejecuta las migraciones SQL para crear el esquema."""
+    Una BD creada antes de registrar migraciones ya tiene aplicada la inicial.
+    """
+    with db.get_cursor() as cur:
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                nombre VARCHAR(255) PRIMARY KEY,
+                aplicada_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        cur.execute("SELECT nombre FROM schema_migrations")
+        applied = {row[0] for row in cur.fetchall()}
+        if schema_exists and not applied:
+            cur.execute("INSERT INTO schema_migrations (nombre) VALUES (%s)", (INITIAL_MIGRATION,))
+            applied.add(INITIAL_MIGRATION)
+    return applied
+
+
+def _run_migrations(db: DatabaseConnection, schema_exists: bool) -> bool:
+    """Ejecuta las migraciones SQL pendientes, en orden."""
     if not MIGRATIONS_DIR.exists():
         logger.error("Directorio de migraciones no encontrado: %s", MIGRATIONS_DIR)
         return False
@@ -57,11 +67,20 @@ def _run_migrations(db: DatabaseConnection) -> bool:
         logger.warning("No se encontraron archivos de migración")
         return True
 
-    logger.info("Ejecutando %d migraciones...", len(migration_files))
+    applied = _applied_migrations(db, schema_exists)
+    pending = [f for f in migration_files if f.name not in applied]
+    if not pending:
+        return True
+
+    logger.info("Ejecutando %d migraciones...", len(pending))
 
-    for migration_file in migration_files:
+    for migration_file in pending:
         try:
-            db.execute_script(str(migration_file))
+            with db.get_cursor() as cur:
+                cur.execute(migration_file.read_text(encoding="utf-8"))
+                cur.execute(
+                    "INSERT INTO schema_migrations (nombre) VALUES (%s)", (migration_file.name,)
+                )
             logger.info("  %s OK", migration_file.name)
         except Exception as e:
             logger.error("  %s ERROR: %s", migration_file.name, e)
@@ -70,36 +89,33 @@ def _run_migrations(db: DatabaseConnection) -> bool:
     return True
 
 
-def ensure_database_ready(db: DatabaseConnection) -> bool:
+def ensure_database_ready(db: DatabaseConnection, catalog_workers: int = 1) -> bool:
     """Asegura que la base de datos esté lista para usar.
 
-    1. Verifica si las tablas existen, si no las crea
-    2. Verifica si hay productos, si no carga el catálogo
+    1. Aplica las migraciones pendientes (crea las tablas si no existen)
+    2. Sincroniza el catálogo: inserta, actualiza o marca como eliminados
+       solo los productos que cambiaron en los CSVs
 
     Args:
         db: Conexión a la base de datos.
+        catalog_workers: Archivos del catálogo procesados en paralelo.
 
     Returns:
         True si la base de datos está lista, False si hubo error.
     """
-    # 1. Verificar/crear tablas
-    if not _check_tables_exist(db):
+    # 1. Verificar/crear tablas y aplicar migraciones pendientes
+    schema_exists = _check_tables_exist(db)
+    if not schema_exists:
         logger.info("Tablas no encontradas, ejecutando migraciones...")
-        if not _run_migrations(db):
-            logger.error("Error ejecutando migraciones")
-            return False
-        logger.info("Esquema creado correctamente")
-
-    # 2. Verificar/cargar catálogo
-    product_count = _count_products(db)
-    if product_count == 0:
-        logger.info("Base de datos vacía, cargando catálogo...")
-        loaded = load_catalog(db)
-        if loaded == 0:
-            logger.warning("No se cargaron productos (verificar archivos CSV)")
-        else:
-            logger.info("Catálogo cargado: %d productos", loaded)
+    if not _run_migrations(db, schema_exists):
+        logger.error("Error ejecutando migraciones")
+        return False
+
+    # 2. Sincronizar catálogo
+    result = sync_catalog(db, max_workers=catalog_workers)
+    if not result.codigos:
+        logger.warning("No se cargaron productos (verificar archivos CSV)")
     else:
-        logger.info("Base de datos lista (%d productos)", product_count)
+        logger.info("Base de datos lista (%d productos en catálogo)", len(result.codigos))
 
     return True
@@ -0,0 +1,59 @@
+-- ============================================
+-- Sincronización incremental del catálogo
+-- ============================================
+-- Idempotente: docker-entrypoint-initdb.d la aplica junto con la 001 y
+-- ensure_database_ready puede volver a aplicarla en una BD sin schema_migrations.
+
+-- Hash de la columna del producto en el CSV de origen (NULL = cargado sin hash)
+ALTER TABLE productos ADD COLUMN IF NOT EXISTS hash_origen CHAR(64);
+
+-- Tombstone: el producto ya no está en el catálogo (no se borra por referencias)
+ALTER TABLE productos ADD COLUMN IF NOT EXISTS eliminado_at TIMESTAMP;
+
+CREATE INDEX IF NOT EXISTS idx_productos_vigentes ON productos(id) WHERE eliminado_at IS NULL;
+
+COMMENT ON COLUMN productos.hash_origen IS 'SHA-256 de la columna del producto en el CSV del catálogo';
+COMMENT ON COLUMN productos.eliminado_at IS 'Fecha en que el producto dejó de estar en el catálogo (NULL = vigente)';
+
+-- Las vistas solo muestran productos vigentes
+CREATE OR REPLACE VIEW v_productos_completo AS
+SELECT 
+    p.id,
+    p.codigo,
+    p.marca,
+    p.modelo,
+    p.tension_nominal,
+    p.corriente_nominal,
+    p.regulador_diodos,
+    p.origen,
+    p.tipo,
+    e.temperatura_maxima,
+    e.temperatura_minima,
+    e.tipo_instalacion,
+    a.tipo as tipo_alimentacion,
+    a.tension as tension_alimentacion,
+    g.ancho,
+    g.alto,
+    g.profundidad,
+    g.peso,
+    ga.meses as garantia_meses,
+    p.created_at,
+    p.updated_at
+FROM productos p
+LEFT JOIN especificaciones e ON p.id = e.producto_id
+LEFT JOIN alimentacion a ON p.id = a.producto_id
+LEFT JOIN gabinete g ON p.id = g.producto_id
+LEFT JOIN garantia ga ON p.id = ga.producto_id
+WHERE p.eliminado_at IS NULL;
+
+CREATE OR REPLACE VIEW v_productos_por_tension AS
+SELECT 
+    tension_nominal,
+    COUNT(*) as cantidad,
+    array_agg(DISTINCT marca) as marcas,
+    MIN(corriente_nominal) as corriente_min,
+    MAX(corriente_nominal) as corriente_max
+FROM productos
+WHERE eliminado_at IS NULL
+GROUP BY tension_nominal
+ORDER BY tension_nominal;
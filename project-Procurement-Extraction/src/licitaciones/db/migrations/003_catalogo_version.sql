@@ -0,0 +1,15 @@
+-- ============================================
+-- Versión del catálogo
+-- ============================================
+-- Contador que la sincronización del catálogo incrementa cuando escribe o
+-- elimina productos. Las cachés de productos en memoria lo comparan para
+-- invalidarse. Idempotente (ver 002).
+
+CREATE TABLE IF NOT EXISTS catalogo_version (
+    id SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO catalogo_version (id, version) VALUES (1, 0) ON CONFLICT (id) DO NOTHING;
+
+COMMENT ON TABLE catalogo_version IS 'Contador de versión del catálogo (una sola fila)';
@@ -0,0 +1,55 @@
+-- ============================================
+-- Índices para la búsqueda en el catálogo
+-- ============================================
+-- Cubren las columnas que filtran las consultas generadas (QUERY_GENERATOR_PROMPT
+-- y su sanitizer):
+--   * Texto: GIN con gin_trgm_ops (pg_trgm). Aceleran ILIKE '%x%' y el
+--     operador %; similarity(col, 'x') > n solo usa el índice si va
+--     acompañado de col % 'x' (ProductoRepository lo agrega al reescribir).
+--   * Números: B-tree simples o compuestos para igualdades y rangos.
+-- Idempotente (ver 002).
+
+-- similarity(), el operador % y gin_trgm_ops
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- productos
+CREATE INDEX IF NOT EXISTS idx_productos_codigo_trgm ON productos USING GIN (codigo gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_productos_marca_trgm ON productos USING GIN (marca gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_productos_modelo_trgm ON productos USING GIN (modelo gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_productos_tipo_trgm ON productos USING GIN (tipo gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_productos_tension_corriente ON productos(tension_nominal, corriente_nominal);
+
+-- especificaciones
+CREATE INDEX IF NOT EXISTS idx_especificaciones_tipo_instalacion_trgm
+    ON especificaciones USING GIN (tipo_instalacion gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_especificaciones_tipo_servicio_trgm
+    ON especificaciones USING GIN (tipo_servicio gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_especificaciones_ventilacion_trgm
+    ON especificaciones USING GIN (ventilacion gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_especificaciones_tipo_rectificador_trgm
+    ON especificaciones USING GIN (tipo_rectificador gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_especificaciones_temperaturas
+    ON especificaciones(temperatura_maxima, temperatura_minima);
+CREATE INDEX IF NOT EXISTS idx_especificaciones_humedad ON especificaciones(humedad_relativa_max);
+CREATE INDEX IF NOT EXISTS idx_especificaciones_flote
+    ON especificaciones(tension_flote_min, tension_flote_max);
+CREATE INDEX IF NOT EXISTS idx_especificaciones_fondo
+    ON especificaciones(tension_fondo_min, tension_fondo_max);
+
+-- alimentacion
+CREATE INDEX IF NOT EXISTS idx_alimentacion_tipo_trgm ON alimentacion USING GIN (tipo gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_alimentacion_tension_trgm ON alimentacion USING GIN (tension gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_alimentacion_frecuencia ON alimentacion(frecuencia);
+
+-- salida
+CREATE INDEX IF NOT EXISTS idx_salida_tension_corriente ON salida(tension_nominal, corriente_nominal);
+CREATE INDEX IF NOT EXISTS idx_salida_consumos ON salida(maxima_corriente_consumos);
+
+-- gabinete
+CREATE INDEX IF NOT EXISTS idx_gabinete_material_trgm ON gabinete USING GIN (material gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_gabinete_grado_proteccion_trgm
+    ON gabinete USING GIN (grado_proteccion gin_trgm_ops);
+
+-- aparatos_medida
+CREATE INDEX IF NOT EXISTS idx_aparatos_medida_protocolo_trgm
+    ON aparatos_medida USING GIN (protocolo_comunicacion gin_trgm_ops);
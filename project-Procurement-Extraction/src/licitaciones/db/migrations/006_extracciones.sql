@@ -0,0 +1,46 @@
+-- ============================================
+-- Resultados de extracción y matching
+-- ============================================
+-- Una fila por ejecución de extracción sobre un PDF, sus items extraídos y los
+-- productos del catálogo que matchean cada item. Los escribe el pipeline de
+-- streaming (licitaciones/streaming.py) en lotes, ver db/extracciones.py.
+-- Idempotente (ver 002).
+
+CREATE TABLE IF NOT EXISTS extracciones (
+    id UUID PRIMARY KEY,  -- Generado por la aplicación, para escribir items en el mismo lote
+    pdf_path TEXT NOT NULL,
+    paginas TEXT,  -- Rangos procesados ("1-10, 15-25"); NULL = todo el PDF
+    estado VARCHAR(20) NOT NULL DEFAULT 'en_curso',  -- 'en_curso', 'ok', 'error'
+    error TEXT,
+    especificaciones_comunes JSONB,
+    total_items INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS extraccion_items (
+    extraccion_id UUID NOT NULL REFERENCES extracciones(id) ON DELETE CASCADE,
+    orden INTEGER NOT NULL,  -- Posición del item en la licitación (0, 1, ...)
+    numero_item INTEGER,
+    cantidad INTEGER,
+    descripcion TEXT,
+    item JSONB NOT NULL,  -- ItemLicitado completo
+    match_score DECIMAL(5,4),
+    match_notas TEXT,
+    PRIMARY KEY (extraccion_id, orden)
+);
+
+CREATE TABLE IF NOT EXISTS extraccion_matches (
+    extraccion_id UUID NOT NULL,
+    orden INTEGER NOT NULL,
+    posicion SMALLINT NOT NULL,  -- Ranking del producto para el item (0 = mejor)
+    producto_id BIGINT NOT NULL REFERENCES productos(id),
+    score DECIMAL(5,4) NOT NULL,
+    PRIMARY KEY (extraccion_id, orden, posicion),
+    FOREIGN KEY (extraccion_id, orden)
+        REFERENCES extraccion_items(extraccion_id, orden) ON DELETE CASCADE
+);
+
+COMMENT ON TABLE extracciones IS 'Ejecuciones de extracción sobre PDFs de licitaciones';
+COMMENT ON TABLE extraccion_items IS 'Items licitados extraídos en cada ejecución';
+COMMENT ON TABLE extraccion_matches IS 'Productos del catálogo que matchean cada item extraído';
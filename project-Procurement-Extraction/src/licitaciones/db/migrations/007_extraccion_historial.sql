@@ -0,0 +1,26 @@
+-- ============================================
+-- Historial de extracciones
+-- ============================================
+-- Identificador de licitación, tiempos por etapa del pipeline e índices para
+-- las consultas de historial (por licitación y por fecha, ver
+-- db/extracciones.py). Idempotente (ver 002).
+
+-- SHA-256 del PDF: las re-ejecuciones sobre la misma licitación comparten id
+ALTER TABLE extracciones ADD COLUMN IF NOT EXISTS licitacion_id VARCHAR(64);
+
+CREATE TABLE IF NOT EXISTS extraccion_etapas (
+    extraccion_id UUID NOT NULL REFERENCES extracciones(id) ON DELETE CASCADE,
+    etapa VARCHAR(30) NOT NULL,  -- 'extraccion', 'estructuracion', 'matching', 'primer_match', 'total'
+    segundos DECIMAL(10,3) NOT NULL,
+    PRIMARY KEY (extraccion_id, etapa)
+);
+
+-- Historial paginado por fecha (keyset: created_at, id) y por licitación
+CREATE INDEX IF NOT EXISTS idx_extracciones_fecha ON extracciones(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_extracciones_licitacion
+    ON extracciones(licitacion_id, created_at DESC, id DESC);
+
+-- Extracciones en las que aparece un producto
+CREATE INDEX IF NOT EXISTS idx_extraccion_matches_producto ON extraccion_matches(producto_id);
+
+COMMENT ON TABLE extraccion_etapas IS 'Segundos de cada etapa del pipeline por extracción';
@@ -5,7 +5,7 @@ if TYPE_CHECKING:
     from licitaciones.domain.entities.tipo_alarma import TipoAlarma
 
 
-@dataclass
+@dataclass(slots=True)
 class Alarma:
     """Entity - Alarma del producto"""
 
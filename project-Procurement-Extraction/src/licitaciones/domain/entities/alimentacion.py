@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from licitaciones.domain.valueObjects.value_objects import RangoTension
 
 
-@dataclass
+@dataclass(slots=True)
 class Alimentacion:
     """Entity - Especificaciones de alimentación"""
 
@@ -5,7 +5,7 @@ if TYPE_CHECKING:
     from licitaciones.domain.entities.tipo_ensayo import TipoEnsayo
 
 
-@dataclass
+@dataclass(slots=True)
 class Ensayo:
     """Entity - Ensayo realizado al producto"""
 
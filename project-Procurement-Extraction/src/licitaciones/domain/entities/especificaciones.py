@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Especificaciones:
     """Entity - Especificaciones técnicas del producto"""
 
@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from licitaciones.domain.valueObjects.value_objects import Dimensiones
 
 
-@dataclass
+@dataclass(slots=True)
 class Gabinete:
     """Entity - Especificaciones del gabinete"""
 
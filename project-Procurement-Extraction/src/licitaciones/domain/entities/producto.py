@@ -14,7 +14,7 @@ from licitaciones.domain.entities.senalizacion import Senalizacion
 from licitaciones.domain.valueObjects.value_objects import Codigo
 
 
-@dataclass
+@dataclass(slots=True)
 class Producto:
     """Aggregate Root - Entidad principal del dominio"""
 
@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from licitaciones.domain.entities.producto import Producto
 
 
-@dataclass
+@dataclass(slots=True)
 class ProductoConScore:
     """
     Entidad que representa un Producto con su score de coincidencia
@@ -1,5 +1,6 @@
 # domain/repositories/producto_repository.py
 from abc import ABC, abstractmethod
+from collections.abc import Iterable
 
 from licitaciones.domain.entities.producto import Producto
 
@@ -16,3 +17,7 @@ class IProductoRepository(ABC):
         umbral_minimo: float = 0.5,
     ) -> list[Producto]:
         """Busca productos por una cadena de búsqueda"""
+
+    @abstractmethod
+    def get_many(self, producto_ids: Iterable[int]) -> dict[int, Producto]:
+        """Obtiene productos por id"""
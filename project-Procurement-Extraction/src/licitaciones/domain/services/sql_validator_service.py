@@ -2,10 +2,58 @@
 """
 Servicio de dominio para validar queries SQL generadas por LLM
 Previene inyección SQL y asegura que solo se ejecuten queries seguras
+
+La validación es un único recorrido lineal sobre los tokens de la query
+(literales, comentarios, identificadores, puntuación) con un patrón
+precompilado: comandos, statements, comentarios y tablas se verifican en la
+misma pasada, y lo que está dentro de literales o comentarios no cuenta.
 """
 
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+# Un token por alternativa; el orden importa (literales y comentarios primero).
+# Los espacios no son tokens: finditer los saltea sin pasar por Python.
+# Los literales se cortan donde los corta PostgreSQL: E'...' admite escapes con
+# barra (E'\'' no cierra) y $tag$...$tag$ no termina en una comilla.
+_TOKEN = re.compile(
+    r"""
+    (?P<literal>[Ee]'(?:[^'\\]|\\.|'')*'
+        | '(?:[^']|'')*'
+        | \$(?P<tag>[A-Za-z_][A-Za-z0-9_]*|)\$.*?\$(?P=tag)\$)
+    | (?P<comentario>--[^\n]*|/\*.*?\*/)
+    | (?P<sin_cerrar>'|/\*|\$(?:[A-Za-z_][A-Za-z0-9_]*)?\$)
+    | (?P<quoted>"(?:[^"]|"")*")
+    | (?P<palabra>[A-Za-z_][A-Za-z0-9_$]*(?:\.[A-Za-z_][A-Za-z0-9_$]*)*)
+    | (?P<numero>[0-9]+(?:\.[0-9]*)?)
+    | (?P<otro>\S)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+# Palabras clave después de las cuales "(" abre una subquery y no una llamada a función
+_ANTES_DE_SUBQUERY = frozenset(
+    {
+        "ALL", "AND", "ANY", "AS", "ELSE", "EXCEPT", "EXISTS", "FROM", "IN", "INTERSECT",
+        "JOIN", "LATERAL", "NOT", "ON", "OR", "SELECT", "SOME", "THEN", "UNION", "WHEN",
+        "WHERE", "WITH",
+    }
+)  # fmt: skip
+
+# Palabras clave que cierran la lista de tablas de un FROM
+_FIN_DE_FROM = frozenset(
+    {
+        "EXCEPT", "FETCH", "FOR", "GROUP", "HAVING", "INTERSECT", "JOIN", "LIMIT", "OFFSET",
+        "ON", "ORDER", "SELECT", "UNION", "USING", "WHERE", "WINDOW",
+    }
+)  # fmt: skip
+
+
+def _nombre(valor: str, tipo: str) -> str:
+    """Nombre de un identificador: sin comillas (respeta mayúsculas) o en minúsculas."""
+    if tipo == "quoted":
+        return valor[1:-1].replace('""', '"')
+    return valor.lower()
 
 
 @dataclass
@@ -15,6 +63,8 @@ class SQLValidationResult:
     es_valido: bool
     errores: list[str]
     advertencias: list[str]
+    tablas: set[str] = field(default_factory=set)  # Tablas referenciadas (minúsculas)
+    identificadores: set[str] = field(default_factory=set)  # Palabras fuera de literales
 
 
 class SQLValidatorService:
@@ -58,6 +108,9 @@ class SQLValidatorService:
         "senalizaciones",
     }
 
+    # Largo máximo de la query
+    MAX_LARGO = 50000  # 50KB
+
     def validar(self, sql: str) -> SQLValidationResult:
         """
         Valida que el SQL sea seguro para ejecutar
@@ -66,78 +119,146 @@ class SQLValidatorService:
             sql: Query SQL a validar
 
         Returns:
-            SQLValidationResult con el resultado de la validación
+            SQLValidationResult con el resultado de la validación y las tablas usadas
         """
         errores = []
         advertencias = []
 
-        # Normalizar SQL (a mayúsculas para comparaciones)
-        sql_upper = sql.upper()
+        if len(sql) > self.MAX_LARGO:
+            errores.append("Query demasiado larga")
+
+        primera = None  # Primera palabra de la query
+        comandos: dict[str, None] = {}  # Prohibidos, en orden de aparición
+        tablas: set[str] = set()
+        identificadores: set[str] = set()
+        puntos_y_coma = 0
+        despues_de_statement = False  # Hay tokens después de un ";"
+        hay_comentarios = False
+        sin_cerrar = False
+
+        # Estado por nivel de paréntesis: dentro de una lista FROM / de una llamada a función
+        en_from = [False]
+        en_funcion = [False]
+        esperando_tabla = False
+        tabla_actual: list[str] | None = None  # Nombre (posiblemente calificado) en curso
+        anterior = ""  # Token significativo anterior (palabras en mayúsculas)
+
+        for token in _TOKEN.finditer(sql):
+            tipo = token.lastgroup
+            if tipo == "comentario":
+                hay_comentarios = True
+                continue
+            if tipo == "sin_cerrar":
+                sin_cerrar = True
+                break
+
+            valor = token.group()
+            if puntos_y_coma and valor != ";":
+                despues_de_statement = True
+
+            if tabla_actual is not None:
+                # Nombre calificado: esquema.tabla
+                if valor == "." or (anterior == "." and tipo in ("palabra", "quoted")):
+                    tabla_actual.append(_nombre(valor, tipo))
+                    anterior = valor
+                    continue
+                tablas.add("".join(tabla_actual))
+                tabla_actual = None
+
+            if esperando_tabla and tipo == "quoted":
+                esperando_tabla = False
+                tabla_actual = [_nombre(valor, tipo)]
+                anterior = valor
+                continue
+
+            if tipo == "palabra":
+                palabra = valor.upper()
+                minuscula = valor.lower()
+                if primera is None:
+                    primera = palabra
+                if "." in palabra:  # Nombre calificado (alias.columna, esquema.tabla)
+                    identificadores.update(minuscula.split("."))
+                    for parte in palabra.split("."):
+                        if parte in self.COMANDOS_PROHIBIDOS:
+                            comandos[parte] = None
+                else:
+                    identificadores.add(minuscula)
+                    if palabra in self.COMANDOS_PROHIBIDOS:
+                        comandos[palabra] = None
+                if palabra == "SELECT":
+                    en_funcion[-1] = False  # ARRAY(SELECT ...): subquery, no argumentos
+
+                if esperando_tabla and palabra not in ("LATERAL", "ONLY"):
+                    esperando_tabla = False
+                    tabla_actual = [minuscula]
+                elif palabra == "FROM" and not en_funcion[-1]:
+                    en_from[-1] = True
+                    esperando_tabla = True
+                elif palabra == "JOIN":
+                    en_from[-1] = True
+                    esperando_tabla = True
+                elif palabra in _FIN_DE_FROM:
+                    en_from[-1] = False
+                anterior = palabra
+                continue
+
+            esperando_tabla = False
+            if tipo == "quoted":
+                identificadores.add(_nombre(valor, tipo).lower())
+            elif valor == "(":
+                # "nombre(" es una llamada a función, salvo después de palabras clave
+                es_funcion = anterior[:1].isalpha() or anterior.startswith("_")
+                en_funcion.append(es_funcion and anterior not in _ANTES_DE_SUBQUERY)
+                en_from.append(False)
+            elif valor == ")":
+                if len(en_from) > 1:
+                    en_from.pop()
+                    en_funcion.pop()
+            elif valor == "," and en_from[-1]:
+                esperando_tabla = True
+            elif valor == ";":
+                puntos_y_coma += 1
+            anterior = valor
+
+        if tabla_actual is not None:
+            tablas.add("".join(tabla_actual))
 
         # 1. Verificar que sea una query SELECT
-        if not sql_upper.strip().startswith("SELECT"):
+        if primera != "SELECT":
             errores.append("Solo se permiten queries SELECT")
 
-        # 2. Buscar comandos prohibidos
-        for comando in self.COMANDOS_PROHIBIDOS:
-            # Buscar el comando como palabra completa
-            pattern = r"\b" + comando + r"\b"
-            if re.search(pattern, sql_upper):
-                errores.append(f"Comando prohibido detectado: {comando}")
+        # 2. Comandos prohibidos
+        for comando in comandos:
+            errores.append(f"Comando prohibido detectado: {comando}")
 
-        # 3. Verificar que no haya punto y coma múltiples (múltiples statements)
-        if sql.count(";") > 1:
+        # 3. Múltiples statements
+        if puntos_y_coma > 1 or despues_de_statement:
             errores.append("No se permiten múltiples statements SQL")
 
-        # 4. Verificar que no haya comentarios maliciosos
-        if "--" in sql or "/*" in sql or "*/" in sql:
+        # 4. Literales o comentarios sin cerrar (ocultan el resto de la query)
+        if sin_cerrar:
+            errores.append("Literal o comentario sin cerrar")
+
+        # 5. Comentarios
+        if hay_comentarios:
             advertencias.append("Se detectaron comentarios SQL, verificar que no sean maliciosos")
 
-        # 5. Verificar tablas usadas
-        tablas_encontradas = self._extraer_tablas(sql)
-        tablas_no_permitidas = tablas_encontradas - self.TABLAS_PERMITIDAS
+        # 6. Tablas usadas
+        tablas_no_permitidas = tablas - self.TABLAS_PERMITIDAS
         if tablas_no_permitidas:
-            errores.append(f"Tablas no permitidas: {', '.join(tablas_no_permitidas)}")
+            errores.append(f"Tablas no permitidas: {', '.join(sorted(tablas_no_permitidas))}")
 
-        # 6. Verificar límite de resultados (opcional pero recomendado)
-        if "LIMIT" not in sql_upper:
+        # 7. Límite de resultados (opcional pero recomendado)
+        if "limit" not in identificadores:
             advertencias.append("Query sin LIMIT, podría retornar muchos resultados")
 
-        # 7. Verificar longitud de la query
-        if len(sql) > 50000:  # 50KB
-            errores.append("Query demasiado larga")
-
-        es_valido = len(errores) == 0
-
-        return SQLValidationResult(es_valido=es_valido, errores=errores, advertencias=advertencias)
-
-    def _extraer_tablas(self, sql: str) -> set[str]:
-        """
-        Extrae los nombres de tablas de la query SQL
-
-        Este es un método simplificado que busca patrones comunes.
-        Para producción, considera usar un parser SQL real como sqlparse.
-        """
-        tablas = set()
-        sql_upper = sql.upper()
-
-        # Patrones para encontrar tablas
-        patterns = [
-            r"FROM\s+([a-zA-Z_][a-zA-Z0-9_]*)",
-            r"JOIN\s+([a-zA-Z_][a-zA-Z0-9_]*)",
-            r"INNER\s+JOIN\s+([a-zA-Z_][a-zA-Z0-9_]*)",
-            r"LEFT\s+JOIN\s+([a-zA-Z_][a-zA-Z0-9_]*)",
-            r"RIGHT\s+JOIN\s+([a-zA-Z_][a-zA-Z0-9_]*)",
-            r"OUTER\s+JOIN\s+([a-zA-Z_][a-zA-Z0-9_]*)",
-        ]
-
-        for pattern in patterns:
-            matches = re.finditer(pattern, sql_upper)
-            for match in matches:
-                tabla = match.group(1).lower()
-                tablas.add(tabla)
-
-        return tablas
+        return SQLValidationResult(
+            es_valido=not errores,
+            errores=errores,
+            advertencias=advertencias,
+            tablas=tablas,
+            identificadores=identificadores,
+        )
 
 
 # Ejemplos de uso
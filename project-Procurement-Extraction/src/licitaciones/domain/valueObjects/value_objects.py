@@ -13,7 +13,7 @@ import re
 from dataclasses import dataclass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Codigo:
     """Value Object - Código único del producto Ejemplo: "REC-48V-100A" """
 
@@ -27,7 +27,7 @@ class Codigo:
             raise ValueError("El código debe contener solo letras mayúsculas, números y guiones")
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Dimensiones:
     """Value Object - Dimensiones del gabinete"""
 
@@ -53,7 +53,7 @@ class Dimensiones:
         return f"{self.ancho}x{self.alto}x{self.profundidad} mm"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RangoTension:
     """Value Object - Rango de tensión"""
 
@@ -89,7 +89,7 @@ class RangoTension:
         return f"{self.minimo}-{self.maximo}{self.unidad}"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Medicion:
     """Value Object - Medición de aparatos"""
 
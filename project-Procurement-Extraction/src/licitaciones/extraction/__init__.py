@@ -1,7 +1,10 @@
 """PDF extraction and processing module."""
 
 from licitaciones.extraction.extraction_pipeline import ExtractionPipeline
-from licitaciones.extraction.product_extractor import GeminiProductExtractor
+from licitaciones.extraction.product_extractor import (
+    AsyncGeminiProductExtractor,
+    GeminiProductExtractor,
+)
 from licitaciones.extraction.properties_extractor import (
     GeminiPropertiesExtractor,
     OpenAIPropertiesExtractor,
@@ -12,6 +15,7 @@ from licitaciones.extraction.protocols import (
 )
 
 __all__ = [
+    "AsyncGeminiProductExtractor",
     "ExtractionPipeline",
     "GeminiProductExtractor",
     "GeminiPropertiesExtractor",
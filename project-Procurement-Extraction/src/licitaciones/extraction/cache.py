@@ -0,0 +1,129 @@
+"""Caché direccionada por contenido para el pipeline de extracción.
+
+Guarda por separado las dos etapas pagas del pipeline:
+1. raw: texto devuelto por el ProductExtractor (Gemini), con clave en el hash
+   del PDF (y rango de páginas) más el fingerprint del extractor.
+2. structured: LicitacionCompleta validada, con clave en el hash del texto raw
+   más el fingerprint del estructurador.
+
+Como la etapa 2 depende del hash del texto raw, cambiar un prompt o modelo
+invalida solamente la etapa afectada (y las que dependen de su salida).
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+from licitaciones.domain.extraction_models import LicitacionCompleta
+from licitaciones.logger import get_logger
+
+logger = get_logger(__name__)
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def sha256_text(text: str) -> str:
+    """Hash SHA-256 hexadecimal de un texto."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def sha256_bytes(data: bytes) -> str:
+    """Hash SHA-256 hexadecimal de un contenido en memoria."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_file(path: Path) -> str:
+    """Hash SHA-256 hexadecimal de un archivo, leído en bloques."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=8)
+def schema_version(model: type = LicitacionCompleta) -> str:
+    """Versión del schema Pydantic, derivada de su JSON schema (memoizada)."""
+    schema = json.dumps(model.model_json_schema(), sort_keys=True, separators=(",", ":"))
+    return sha256_text(schema)[:16]
+
+
+def pdf_content_key(pdf_path: Path, page_ranges: list[tuple[int, int]] | None = None) -> str:
+    """Clave de contenido para un PDF y la selección de páginas a procesar.
+
+    Args:
+        pdf_path: Ruta al PDF original.
+        page_ranges: Rangos de páginas seleccionados (1-indexed, inclusive).
+
+    Returns:
+        Hash SHA-256 del contenido del PDF combinado con los rangos.
+    """
+    selection = json.dumps([list(r) for r in page_ranges] if page_ranges else None)
+    return sha256_text(f"{sha256_file(pdf_path)}:{selection}")
+
+
+def stage_key(*parts: str) -> str:
+    """Combina las partes de una clave de etapa en un único hash."""
+    return sha256_text("\x1f".join(parts))
+
+
+class ExtractionCache:
+    """Caché en disco de resultados de extracción.
+
+    Layout: `{cache_dir}/{etapa}/{clave[:2]}/{clave}.{ext}`. Las escrituras son
+    atómicas (archivo temporal + rename) para tolerar procesos concurrentes.
+    """
+
+    def __init__(self, cache_dir: Path) -> None:
+        """Inicializa la caché.
+
+        Args:
+            cache_dir: Directorio raíz de la caché (se crea si no existe).
+        """
+        self._cache_dir = Path(cache_dir)
+
+    def get_raw_text(self, key: str) -> str | None:
+        """Obtiene el texto raw de la etapa de extracción, si existe."""
+        return self._read(self._path("raw", key, "txt"))
+
+    def put_raw_text(self, key: str, raw_text: str) -> None:
+        """Guarda el texto raw de la etapa de extracción."""
+        self._write(self._path("raw", key, "txt"), raw_text)
+
+    def get_structured(self, key: str) -> LicitacionCompleta | None:
+        """Obtiene el resultado estructurado, si existe y sigue siendo válido."""
+        content = self._read(self._path("structured", key, "json"))
+        if content is None:
+            return None
+        try:
+            return LicitacionCompleta.model_validate_json(content)
+        except ValueError:
+            logger.warning("Entrada de caché inválida descartada: %s", key)
+            return None
+
+    def put_structured(self, key: str, result: LicitacionCompleta) -> None:
+        """Guarda el resultado estructurado y validado."""
+        self._write(self._path("structured", key, "json"), result.model_dump_json())
+
+    def _path(self, stage: str, key: str, extension: str) -> Path:
+        return self._cache_dir / stage / key[:2] / f"{key}.{extension}"
+
+    def _read(self, path: Path) -> str | None:
+        try:
+            return path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def _write(self, path: Path, content: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
@@ -0,0 +1,230 @@
+"""Estructuración map-reduce para textos extraídos muy largos.
+
+El texto raw se parte en límites de ítem ("Item 1", "Ítem 2", "Renglón 3"...),
+cada chunk se estructura en paralelo con el PropertiesExtractor configurado y
+los LicitacionCompleta parciales se combinan de forma determinística:
+
+- Items: se deduplican por `numero_item` (o por descripción/marca/modelo si
+  no tienen número) y sus campos se combinan.
+- Especificaciones comunes: se combinan campo a campo.
+
+En ambos casos gana el primer valor no nulo en orden de documento, y los
+sub-modelos anidados se combinan recursivamente.
+"""
+
+import re
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+from pydantic import BaseModel
+
+from licitaciones.domain.extraction_models import ItemLicitado, LicitacionCompleta
+from licitaciones.extraction.protocols import PropertiesExtractorProtocol
+from licitaciones.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Encabezado de ítem al inicio de línea, con o sin markdown: "**Item 1:**", "### Ítem N° 2"
+ITEM_HEADER_PATTERN = re.compile(
+    r"^[ \t]*(?:[#*>-]+[ \t]*)*(?:[íi]tem|rengl[oó]n)[ \t]*(?:n[°º.]*[ \t]*)?\d+",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+_PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n")
+
+
+def split_into_sections(raw_text: str) -> list[str]:
+    """Parte el texto en el preámbulo y una sección por encabezado de ítem."""
+    starts = [m.start() for m in ITEM_HEADER_PATTERN.finditer(raw_text)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    bounds = starts + [len(raw_text)]
+    sections = [raw_text[a:b] for a, b in zip(bounds, bounds[1:], strict=False)]
+    return [s for s in sections if s.strip()]
+
+
+def _split_oversized(section: str, max_chars: int) -> list[str]:
+    """Parte una sección más larga que max_chars en párrafos (o cortes duros)."""
+    pieces = []
+    start = 0
+    for match in _PARAGRAPH_BREAK.finditer(section):
+        pieces.append(section[start : match.end()])
+        start = match.end()
+    pieces.append(section[start:])
+
+    result = []
+    for piece in pieces:
+        while len(piece) > max_chars:
+            result.append(piece[:max_chars])
+            piece = piece[max_chars:]
+        result.append(piece)
+    return _pack(result, max_chars)
+
+
+def _pack(parts: list[str], max_chars: int) -> list[str]:
+    """Agrupa partes consecutivas en chunks de hasta max_chars."""
+    chunks: list[str] = []
+    current = ""
+    for part in parts:
+        if current and len(current) + len(part) > max_chars:
+            chunks.append(current)
+            current = ""
+        current += part
+    if current.strip():
+        chunks.append(current)
+    return chunks
+
+
+def split_at_item_boundaries(raw_text: str, max_chars: int) -> list[str]:
+    """Parte el texto en chunks de hasta max_chars sin cortar ítems.
+
+    Los ítems consecutivos se agrupan mientras entren en el límite. Solo un
+    ítem que por sí solo supera el límite se parte, en límites de párrafo.
+
+    Args:
+        raw_text: Texto devuelto por el ProductExtractor.
+        max_chars: Tamaño máximo de cada chunk en caracteres.
+
+    Returns:
+        Lista de chunks en orden de documento.
+    """
+    if len(raw_text) <= max_chars:
+        return [raw_text]
+
+    sections = []
+    for section in split_into_sections(raw_text):
+        if len(section) > max_chars:
+            sections.extend(_split_oversized(section, max_chars))
+        else:
+            sections.append(section)
+    return _pack(sections, max_chars)
+
+
+def merge_models(first: BaseModel | None, second: BaseModel | None) -> BaseModel | None:
+    """Combina dos instancias del mismo modelo; gana el primer valor no nulo.
+
+    Los sub-modelos presentes en ambas se combinan recursivamente.
+    """
+    if first is None:
+        return second
+    if second is None:
+        return first
+
+    merged = {}
+    for name in type(first).model_fields:
+        a, b = getattr(first, name), getattr(second, name)
+        if isinstance(a, BaseModel) and isinstance(b, BaseModel):
+            merged[name] = merge_models(a, b)
+        else:
+            merged[name] = a if a is not None else b
+    return type(first).model_construct(**merged)
+
+
+def _normalize(value: str | None) -> str:
+    return " ".join((value or "").lower().split())
+
+
+def item_key(item: ItemLicitado) -> tuple:
+    """Identidad de un ítem para deduplicar entre chunks."""
+    if item.numero_item is not None:
+        return ("numero", item.numero_item)
+    return ("texto", _normalize(item.descripcion), _normalize(item.marca), _normalize(item.modelo))
+
+
+def merge_licitaciones(parts: list[LicitacionCompleta]) -> LicitacionCompleta:
+    """Combina resultados parciales (en orden de documento) en uno solo.
+
+    Args:
+        parts: LicitacionCompleta de cada chunk, en el orden de los chunks.
+
+    Returns:
+        LicitacionCompleta con ítems deduplicados y especificaciones comunes
+        combinadas. Los ítems quedan en orden de primera aparición.
+    """
+    especificaciones = None
+    items: dict[tuple, ItemLicitado] = {}
+
+    for part in parts:
+        especificaciones = merge_models(especificaciones, part.especificaciones_comunes)
+        for item in part.items:
+            key = item_key(item)
+            items[key] = merge_models(items.get(key), item)
+
+    merged = LicitacionCompleta.model_construct(
+        especificaciones_comunes=especificaciones,
+        items=list(items.values()),
+    )
+    # model_construct no valida: revalidar antes de que el resultado salga del pipeline
+    return LicitacionCompleta.model_validate(merged.model_dump())
+
+
+class ChunkedPropertiesExtractor:
+    """PropertiesExtractor que estructura textos largos por chunks en paralelo.
+
+    Los textos que entran en un solo chunk se delegan sin cambios, así que la
+    latencia para textos largos pasa a depender del chunk más lento y no del
+    largo total.
+    """
+
+    def __init__(
+        self,
+        extractor: PropertiesExtractorProtocol,
+        max_chunk_chars: int = 40_000,
+        max_workers: int = 4,
+    ) -> None:
+        """Inicializa el extractor.
+
+        Args:
+            extractor: Estructurador usado para cada chunk.
+            max_chunk_chars: Tamaño máximo de cada chunk en caracteres.
+            max_workers: Chunks estructurados en paralelo.
+        """
+        self._extractor = extractor
+        self._max_chunk_chars = max_chunk_chars
+        self._max_workers = max(1, max_workers)
+
+    @property
+    def fingerprint(self) -> str:
+        """Fingerprint del estructurador más el tamaño de chunk."""
+        return f"{self._extractor.fingerprint}:chunked:{self._max_chunk_chars}"
+
+    def structure_properties(self, raw_text: str) -> LicitacionCompleta:
+        """Estructura el texto, partiéndolo en chunks si es necesario.
+
+        Args:
+            raw_text: Texto no estructurado con información de productos.
+
+        Returns:
+            LicitacionCompleta combinada de todos los chunks.
+        """
+        chunks = split_at_item_boundaries(raw_text, self._max_chunk_chars)
+        if len(chunks) == 1:
+            return self._extractor.structure_properties(raw_text)
+        return merge_licitaciones(list(self._structure_chunks(chunks)))
+
+    def iter_parts(self, raw_text: str) -> Iterator[LicitacionCompleta]:
+        """Estructura el texto y entrega cada chunk apenas está listo.
+
+        Los chunks se procesan en paralelo pero se entregan en orden de
+        documento; combinarlos con merge_licitaciones da el mismo resultado que
+        structure_properties.
+
+        Args:
+            raw_text: Texto no estructurado con información de productos.
+
+        Yields:
+            LicitacionCompleta parcial de cada chunk.
+        """
+        chunks = split_at_item_boundaries(raw_text, self._max_chunk_chars)
+        if len(chunks) == 1:
+            yield self._extractor.structure_properties(raw_text)
+            return
+        yield from self._structure_chunks(chunks)
+
+    def _structure_chunks(self, chunks: list[str]) -> Iterator[LicitacionCompleta]:
+        logger.info(
+            "Estructurando %d chunks de hasta %d caracteres", len(chunks), self._max_chunk_chars
+        )
+        with ThreadPoolExecutor(max_workers=min(self._max_workers, len(chunks))) as pool:
+            # map preserva el orden de los chunks, necesario para un merge determinístico
+            yield from pool.map(self._extractor.structure_properties, chunks)
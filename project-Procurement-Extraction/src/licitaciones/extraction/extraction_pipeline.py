@@ -3,13 +3,22 @@
 Orquesta los extractores siguiendo el principio de inversión de dependencias.
 """
 
-import os
+from collections.abc import Iterator
 from pathlib import Path
 
 from licitaciones.config import get_settings
 from licitaciones.domain.extraction_models import LicitacionCompleta
-from licitaciones.extraction.pdf_processor import PDFProcessor
+from licitaciones.extraction.cache import (
+    ExtractionCache,
+    pdf_content_key,
+    sha256_text,
+    stage_key,
+)
+from licitaciones.extraction.chunked_structuring import merge_licitaciones
+from licitaciones.extraction.page_triage import select_page_ranges, triage_fingerprint
+from licitaciones.extraction.pdf_processor import PDFProcessor, PDFQualityReport
 from licitaciones.extraction.protocols import (
+    PDFSource,
     ProductExtractorProtocol,
     PropertiesExtractorProtocol,
 )
@@ -30,6 +39,7 @@ class ExtractionPipeline:
         pdf_preprocessor: PDFProcessor,
         product_extractor: ProductExtractorProtocol,
         properties_extractor: PropertiesExtractorProtocol,
+        cache: ExtractionCache | None = None,
     ) -> None:
         """Inicializa el pipeline.
 
@@ -37,11 +47,13 @@ class ExtractionPipeline:
             pdf_preprocessor: Procesador de PDF para validaciones y análisis de calidad.
             product_extractor: Extractor de productos (cumple ProductExtractorProtocol).
             properties_extractor: Estructurador de propiedades (cumple PropertiesExtractorProtocol).
+            cache: Caché opcional de resultados por contenido. Si es None, no se cachea.
         """
         self.settings = get_settings()
         self._pdf_preprocessor = pdf_preprocessor
         self._product_extractor = product_extractor
         self._properties_extractor = properties_extractor
+        self._cache = cache
 
     def process_pdf(
         self,
@@ -50,56 +62,184 @@ class ExtractionPipeline:
     ) -> LicitacionCompleta:
         """Procesa un PDF y retorna datos estructurados.
 
+        Si hay caché configurada, el texto raw y el resultado estructurado se
+        reutilizan por contenido: una re-ejecución sobre el mismo PDF (o el mismo
+        rango de páginas) no vuelve a llamar a los LLMs.
+
         Args:
             pdf_path: Ruta al archivo PDF.
             page_ranges: Lista opcional de rangos de páginas a procesar.
                 Formato: [(start, end), ...], 1-indexed, inclusive.
                 Ej: [(1, 10), (15, 25)] procesa páginas 1-10 y 15-25.
+                Sin rangos y con `page_triage_enabled`, las páginas se eligen
+                solas (ver page_triage).
 
         Returns:
             LicitacionCompleta con todos los datos extraídos.
         """
-        temp_pdf_path: str | None = None
-        pdf_to_process = str(pdf_path)
-
-        try:
-            # Paso 0: Extraer páginas si se especificaron rangos
-            if page_ranges:
-                temp_pdf_path = self._pdf_preprocessor.extract_pages(str(pdf_path), page_ranges)
-                pdf_to_process = temp_pdf_path
-
-            # Paso 1: Preprocesar PDF (calidad, validaciones)
-            pdf_quality = self._pdf_preprocessor.check_quality(pdf_to_process)
-            logger.info(
-                "PDF quality analysis: score=%d, digital=%s, pages=%d, "
-                "text_ratio=%.3f, image_coverage=%.2f, ocr_ratio=%.2f, "
-                "low_res_images=%d, rotated_text=%.2f",
-                pdf_quality.quality_score,
-                pdf_quality.is_digital,
-                pdf_quality.pages_analyzed,
-                pdf_quality.text_to_size_ratio,
-                pdf_quality.image_coverage_ratio,
-                pdf_quality.ocr_text_ratio,
-                pdf_quality.low_res_image_count,
-                pdf_quality.rotated_text_ratio,
-            )
-            if pdf_quality.quality_score < self.settings.pdf_min_acceptable_quality_score:
-                raise ValueError(
-                    f"PDF quality score ({pdf_quality.quality_score}) is below minimum "
-                    f"threshold ({self.settings.pdf_min_acceptable_quality_score}). "
-                    f"Digital: {pdf_quality.is_digital}, "
-                    f"OCR ratio: {pdf_quality.ocr_text_ratio:.2f}, "
-                    f"Image coverage: {pdf_quality.image_coverage_ratio:.2f}"
+        raw_text = self.extract_raw_text(pdf_path, page_ranges)
+
+        # Paso 3: Estructurar con modelo de lenguaje
+        if self._cache is None:
+            return self._properties_extractor.structure_properties(raw_text)
+
+        structured_key = self._structured_key(raw_text)
+        structured_data = self._cache.get_structured(structured_key)
+        if structured_data is not None:
+            logger.info("Extraction cache hit (structured): %s", structured_key[:12])
+            return structured_data
+
+        structured_data = self._properties_extractor.structure_properties(raw_text)
+        self._cache.put_structured(structured_key, structured_data)
+        return structured_data
+
+    def extract_raw_text(
+        self,
+        pdf_path: Path,
+        page_ranges: list[tuple[int, int]] | None = None,
+    ) -> str:
+        """Pasos 0-2: valida calidad y extrae el texto raw (desde caché si la hay).
+
+        Args:
+            pdf_path: Ruta al archivo PDF.
+            page_ranges: Lista opcional de rangos de páginas a procesar.
+
+        Returns:
+            Texto devuelto por el ProductExtractor.
+        """
+        raw_key: str | None = None
+        if self._cache is not None:
+            content_key = pdf_content_key(pdf_path, page_ranges)
+            parts = [content_key, self._product_extractor.fingerprint]
+            if self._triage_enabled(page_ranges):
+                # Otras reglas de triage eligen otras páginas
+                parts.append(
+                    triage_fingerprint(
+                        self.settings.page_triage_min_score,
+                        self.settings.page_triage_context_pages,
+                        self.settings.page_triage_max_ratio,
+                    )
                 )
+            raw_key = stage_key(*parts)
 
-            # Paso 2: Extraer texto del PDF
-            raw_text = self._product_extractor.extract_from_pdf(Path(pdf_to_process))
+        raw_text = self._cache.get_raw_text(raw_key) if raw_key else None
+        if raw_text is not None:
+            logger.info("Extraction cache hit (raw text): %s", raw_key[:12])
+            return raw_text
 
-            # Paso 3: Estructurar con modelo de lenguaje
-            structured_data = self._properties_extractor.structure_properties(raw_text)
+        raw_text = self._extract_raw_text(pdf_path, page_ranges)
+        if raw_key:
+            self._cache.put_raw_text(raw_key, raw_text)
+        return raw_text
 
-            return structured_data
-        finally:
-            # Cleanup: eliminar PDF temporal si se creó
-            if temp_pdf_path and os.path.exists(temp_pdf_path):
-                os.unlink(temp_pdf_path)
+    def iter_structured(self, raw_text: str) -> Iterator[LicitacionCompleta]:
+        """Paso 3 incremental: entrega resultados parciales a medida que se estructuran.
+
+        Con un estructurador por chunks (ver ChunkedPropertiesExtractor.iter_parts)
+        cada chunk se entrega apenas está listo, en orden de documento; con
+        cualquier otro, un único resultado. Combinar las partes con
+        merge_licitaciones da lo mismo que process_pdf, y eso es lo que se cachea.
+
+        Args:
+            raw_text: Texto devuelto por extract_raw_text.
+
+        Yields:
+            LicitacionCompleta parciales.
+        """
+        structured_key = self._structured_key(raw_text) if self._cache is not None else None
+        if structured_key:
+            structured_data = self._cache.get_structured(structured_key)
+            if structured_data is not None:
+                logger.info("Extraction cache hit (structured): %s", structured_key[:12])
+                yield structured_data
+                return
+
+        iter_parts = getattr(self._properties_extractor, "iter_parts", None)
+        parts = []
+        if iter_parts is None:
+            parts.append(self._properties_extractor.structure_properties(raw_text))
+            yield parts[0]
+        else:
+            for part in iter_parts(raw_text):
+                parts.append(part)
+                yield part
+
+        if structured_key:
+            merged = parts[0] if len(parts) == 1 else merge_licitaciones(parts)
+            self._cache.put_structured(structured_key, merged)
+
+    def _structured_key(self, raw_text: str) -> str:
+        return stage_key(sha256_text(raw_text), self._properties_extractor.fingerprint)
+
+    def _triage_enabled(self, page_ranges: list[tuple[int, int]] | None) -> bool:
+        """El triage de páginas corre solo si no se pidieron rangos explícitos."""
+        return not page_ranges and self.settings.page_triage_enabled
+
+    def _extract_raw_text(
+        self,
+        pdf_path: Path,
+        page_ranges: list[tuple[int, int]] | None,
+    ) -> str:
+        """Selecciona páginas, valida calidad y extrae el texto raw del PDF."""
+        # Paso 0: Extraer páginas si se especificaron rangos (en memoria: el mismo
+        # buffer pasa por el análisis de calidad y la subida, sin archivo temporal)
+        pdf: PDFSource = pdf_path
+        if page_ranges:
+            pdf = self._pdf_preprocessor.extract_pages(str(pdf_path), page_ranges)
+
+        # Paso 1: Preprocesar PDF (calidad, validaciones). Con triage, el mismo
+        # recorrido puntúa cada página
+        triage = self._triage_enabled(page_ranges)
+        pdf_quality = self._pdf_preprocessor.check_quality(
+            pdf if isinstance(pdf, bytes) else str(pdf), triage=triage
+        )
+        logger.info(
+            "PDF quality analysis: score=%d, digital=%s, pages=%d, "
+            "text_ratio=%.3f, image_coverage=%.2f, ocr_ratio=%.2f, "
+            "low_res_images=%d, rotated_text=%.2f",
+            pdf_quality.quality_score,
+            pdf_quality.is_digital,
+            pdf_quality.pages_analyzed,
+            pdf_quality.text_to_size_ratio,
+            pdf_quality.image_coverage_ratio,
+            pdf_quality.ocr_text_ratio,
+            pdf_quality.low_res_image_count,
+            pdf_quality.rotated_text_ratio,
+        )
+        logger.debug(
+            "PDF quality scan: early_exit=%s, timings=%s",
+            pdf_quality.early_exit,
+            {metric: round(seconds, 4) for metric, seconds in pdf_quality.timings.items()},
+        )
+        if pdf_quality.quality_score < self.settings.pdf_min_acceptable_quality_score:
+            raise ValueError(
+                f"PDF quality score ({pdf_quality.quality_score}) is below minimum "
+                f"threshold ({self.settings.pdf_min_acceptable_quality_score}). "
+                f"Digital: {pdf_quality.is_digital}, "
+                f"OCR ratio: {pdf_quality.ocr_text_ratio:.2f}, "
+                f"Image coverage: {pdf_quality.image_coverage_ratio:.2f}"
+            )
+
+        # Paso 1b: Quedarse con las páginas de especificaciones técnicas
+        if triage:
+            pdf = self._triage_pages(pdf_path, pdf_quality)
+
+        # Paso 2: Extraer texto del PDF
+        return self._product_extractor.extract_from_pdf(pdf)
+
+    def _triage_pages(self, pdf_path: Path, pdf_quality: PDFQualityReport) -> PDFSource:
+        """Extrae las páginas elegidas por el triage, o devuelve el PDF completo."""
+        page_ranges = select_page_ranges(
+            pdf_quality.page_scores,
+            self.settings.page_triage_min_score,
+            self.settings.page_triage_context_pages,
+            self.settings.page_triage_max_ratio,
+        )
+        total_pages = len(pdf_quality.page_scores)
+        if page_ranges is None:
+            logger.info("Page triage: sending all %d pages", total_pages)
+            return pdf_path
+
+        selected = sum(end - start + 1 for start, end in page_ranges)
+        logger.info("Page triage: sending %d of %d pages %s", selected, total_pages, page_ranges)
+        return self._pdf_preprocessor.extract_pages(str(pdf_path), page_ranges)
@@ -0,0 +1,239 @@
+"""Registro de archivos subidos a Gemini, reutilizables entre llamadas.
+
+Subir un PDF y esperar a que Gemini lo procese cuesta un round trip por
+llamada. El registro indexa los archivos subidos por el hash de contenido del
+PDF, los mantiene vivos durante un TTL (renovado con cada uso) y los borra en
+un barrido en segundo plano, de modo que varios prompts sobre la misma
+licitación, o corridas sucesivas del pipeline, suben el archivo una sola vez.
+
+`lease` sirve al extractor sincrónico; `alease` es la variante para una subida
+asíncrona, que espera sin bloquear el event loop.
+"""
+
+import asyncio
+import threading
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from licitaciones.extraction.cache import sha256_bytes, sha256_file
+from licitaciones.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Gemini borra los archivos a las 48 h; nunca reutilizar uno cerca de ese límite
+MAX_FILE_AGE_SECONDS = 47 * 3600
+
+# Locks de subida repartidos por hash: acotados, sin importar cuántos PDFs pasen
+KEY_LOCK_STRIPES = 64
+
+
+@dataclass
+class _Entry:
+    """Archivo subido y su estado de uso."""
+
+    file: Any
+    uploaded_at: float
+    expires_at: float
+    leases: int = 0
+
+
+class GeminiFileRegistry:
+    """Archivos subidos a Gemini indexados por hash de contenido.
+
+    Thread-safe: dos leases concurrentes del mismo PDF comparten una única
+    subida (con `alease`, dos corrutinas del mismo event loop). Un archivo en uso nunca se borra; al liberarse queda disponible
+    hasta que vence su TTL. Con `ttl_seconds <= 0` se borra apenas se libera.
+    """
+
+    def __init__(
+        self,
+        delete: Callable[[str], None],
+        ttl_seconds: float = 900,
+        sweep_interval_seconds: float = 60,
+    ) -> None:
+        """Inicializa el registro.
+
+        Args:
+            delete: Borra un archivo remoto dado su nombre.
+            ttl_seconds: Tiempo que un archivo sin usar sigue disponible.
+            sweep_interval_seconds: Cada cuánto corre el barrido de vencidos.
+        """
+        self._delete = delete
+        self._ttl = ttl_seconds
+        self._sweep_interval = sweep_interval_seconds
+        self._entries: dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+        self._key_locks = [threading.Lock() for _ in range(KEY_LOCK_STRIPES)]
+        self._async_key_locks: list[asyncio.Lock] | None = None
+        self._stop = threading.Event()
+        self._sweeper: threading.Thread | None = None
+
+    @contextmanager
+    def lease(self, pdf: Path | bytes, upload: Callable[[Path | bytes], Any]) -> Iterator[Any]:
+        """Obtiene el archivo subido para un PDF, subiéndolo si hace falta.
+
+        Args:
+            pdf: Ruta al PDF local o su contenido en memoria.
+            upload: Sube el PDF y espera a que esté procesado.
+
+        Yields:
+            Archivo de Gemini, válido mientras dure el `with`.
+        """
+        key = _content_key(pdf)
+        entry = self._acquire(key, pdf, upload)
+        try:
+            yield entry.file
+        finally:
+            self._release(key, entry)
+
+    @asynccontextmanager
+    async def alease(
+        self, pdf: Path | bytes, upload: Callable[[Path | bytes], Awaitable[Any]]
+    ) -> AsyncIterator[Any]:
+        """Como `lease`, con una subida asíncrona.
+
+        Usar siempre desde el mismo event loop: los locks por contenido son
+        de asyncio. El borrado (`delete`) se llama desde el loop y no debe
+        bloquearlo.
+
+        Args:
+            pdf: Ruta al PDF local o su contenido en memoria.
+            upload: Corrutina que sube el PDF y espera a que esté procesado.
+
+        Yields:
+            Archivo de Gemini, válido mientras dure el `async with`.
+        """
+        key = await asyncio.to_thread(_content_key, pdf)
+        entry = await self._acquire_async(key, pdf, upload)
+        try:
+            yield entry.file
+        finally:
+            self._release(key, entry)
+
+    def sweep(self) -> int:
+        """Borra los archivos vencidos que no están en uso.
+
+        Returns:
+            Cantidad de archivos borrados.
+        """
+        now = time.monotonic()
+        with self._lock:
+            expired = [
+                (key, entry)
+                for key, entry in self._entries.items()
+                if entry.leases == 0 and entry.expires_at <= now
+            ]
+            for key, _ in expired:
+                del self._entries[key]
+
+        for _, entry in expired:
+            self._delete_quietly(entry.file.name)
+        return len(expired)
+
+    def close(self) -> None:
+        """Detiene el barrido y borra todos los archivos registrados."""
+        self._stop.set()
+        if self._sweeper is not None:
+            self._sweeper.join()
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            self._delete_quietly(entry.file.name)
+
+    def _acquire(
+        self, key: str, pdf: Path | bytes, upload: Callable[[Path | bytes], Any]
+    ) -> _Entry:
+        # Un lock por contenido (compartido con otros hashes de la misma franja):
+        # la segunda llamada espera la subida de la primera
+        with self._key_lock(key):
+            entry = self._reuse(key)
+            if entry is None:
+                entry = self._register(key, upload(pdf))
+        self._ensure_sweeper()
+        return entry
+
+    async def _acquire_async(
+        self, key: str, pdf: Path | bytes, upload: Callable[[Path | bytes], Awaitable[Any]]
+    ) -> _Entry:
+        if self._async_key_locks is None:
+            self._async_key_locks = [asyncio.Lock() for _ in range(KEY_LOCK_STRIPES)]
+        async with self._async_key_locks[_stripe(key)]:
+            entry = self._reuse(key)
+            if entry is None:
+                entry = self._register(key, await upload(pdf))
+        self._ensure_sweeper()
+        return entry
+
+    def _reuse(self, key: str) -> _Entry | None:
+        """Toma un lease sobre el archivo registrado, si sigue vigente."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not self._is_fresh(entry):
+                return None
+            entry.leases += 1
+        logger.debug("Reutilizando archivo subido: %s", entry.file.name)
+        return entry
+
+    def _register(self, key: str, uploaded: Any) -> _Entry:
+        """Registra una subida nueva con un lease tomado."""
+        now = time.monotonic()
+        entry = _Entry(file=uploaded, uploaded_at=now, expires_at=now + self._ttl, leases=1)
+        with self._lock:
+            stale = self._entries.get(key)
+            self._entries[key] = entry
+        if stale is not None and stale.leases == 0:
+            self._delete_quietly(stale.file.name)
+        return entry
+
+    def _release(self, key: str, entry: _Entry) -> None:
+        with self._lock:
+            entry.leases -= 1
+            entry.expires_at = time.monotonic() + self._ttl
+            registered = self._entries.get(key) is entry
+            # Una entrada reemplazada por una subida nueva ya no la ve el barrido
+            delete_now = entry.leases == 0 and (self._ttl <= 0 or not registered)
+            if delete_now and registered:
+                del self._entries[key]
+        if delete_now:
+            self._delete_quietly(entry.file.name)
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        return self._key_locks[_stripe(key)]
+
+    def _is_fresh(self, entry: _Entry) -> bool:
+        now = time.monotonic()
+        return entry.expires_at > now and now - entry.uploaded_at < MAX_FILE_AGE_SECONDS
+
+    def _ensure_sweeper(self) -> None:
+        if self._ttl <= 0:
+            return
+        with self._lock:
+            if self._sweeper is None and not self._stop.is_set():
+                self._sweeper = threading.Thread(
+                    target=self._sweep_loop, name="gemini-file-sweeper", daemon=True
+                )
+                self._sweeper.start()
+
+    def _sweep_loop(self) -> None:
+        while not self._stop.wait(self._sweep_interval):
+            self.sweep()
+
+    def _delete_quietly(self, name: str) -> None:
+        try:
+            self._delete(name)
+        except Exception as e:
+            # Ignorar errores de limpieza
+            logger.debug("No se pudo borrar el archivo %s: %s", name, e)
+
+
+def _content_key(pdf: Path | bytes) -> str:
+    return sha256_bytes(pdf) if isinstance(pdf, bytes) else sha256_file(pdf)
+
+
+def _stripe(key: str) -> int:
+    return int(key[:8], 16) % KEY_LOCK_STRIPES
@@ -0,0 +1,172 @@
+"""Page triage: pick the pages worth sending to the LLM.
+
+Tender PDFs mix technical specifications with long legal and administrative
+sections. Each page is scored locally for technical-spec density from the
+text PageScanner already reads for the quality check (no extra pass):
+
+- technical keywords ("tensión nominal", "corriente", "rectificador", ...),
+- values with units (110 Vcc, 30 A, 50 Hz, 40 °C, ...),
+- table rows (three or more text lines sharing a baseline),
+- minus administrative keywords ("adjudicación", "oferente", ...).
+
+select_page_ranges keeps the pages at or above a minimum score, plus their
+neighbours, as ranges for PDFProcessor.extract_pages.
+"""
+
+import re
+import unicodedata
+from collections import Counter
+
+from licitaciones.extraction.cache import sha256_text
+
+# Keywords are matched on lowercase text without accents
+TECHNICAL_KEYWORDS = (
+    "tension nominal",
+    "corriente nominal",
+    "tension",
+    "corriente",
+    "frecuencia",
+    "potencia",
+    "rectificador",
+    "cargador",
+    "bateria",
+    "banco de baterias",
+    "regulacion",
+    "rizado",
+    "ripple",
+    "alimentacion",
+    "salida",
+    "entrada",
+    "proteccion",
+    "sobretension",
+    "cortocircuito",
+    "tiristor",
+    "diodo",
+    "gabinete",
+    "temperatura",
+    "humedad",
+    "altura",
+    "especificaciones tecnicas",
+    "caracteristicas tecnicas",
+    "datos tecnicos",
+    "iec",
+    "monofasic",
+    "trifasic",
+)
+ADMINISTRATIVE_KEYWORDS = (
+    "adjudicacion",
+    "oferente",
+    "licitante",
+    "pliego",
+    "clausula",
+    "articulo",
+    "penalidad",
+    "multa",
+    "jurisdiccion",
+    "domicilio",
+    "garantia de oferta",
+    "garantia de cumplimiento",
+    "apertura de sobres",
+    "evaluacion de ofertas",
+)
+
+TECHNICAL_WEIGHT = 2.0
+UNIT_WEIGHT = 1.0
+TABLE_ROW_WEIGHT = 0.5
+ADMINISTRATIVE_WEIGHT = 1.0
+
+# Lines whose bottoms are within this many points share a baseline
+BASELINE_TOLERANCE = 2.0
+TABLE_MIN_CELLS = 3
+
+
+def _keyword_pattern(keywords: tuple[str, ...]) -> re.Pattern:
+    # Longest first so "tension nominal" wins over "tension"
+    alternatives = sorted(keywords, key=len, reverse=True)
+    return re.compile(r"\b(?:" + "|".join(map(re.escape, alternatives)) + r")")
+
+
+_TECHNICAL = _keyword_pattern(TECHNICAL_KEYWORDS)
+_ADMINISTRATIVE = _keyword_pattern(ADMINISTRATIVE_KEYWORDS)
+_UNIT_VALUE = re.compile(
+    r"\d+(?:[.,]\d+)?\s*(?:kva|kw|vcc|vca|vdc|vac|v|adc|a|hz|ah|w|°c|ºc|msnm|mm|%)(?![a-z])"
+)
+
+
+def _normalize(text: str) -> str:
+    """Lowercase and strip accents ("Tensión" -> "tension")."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def count_table_rows(line_bottoms: list[float]) -> int:
+    """Count baselines shared by at least TABLE_MIN_CELLS text lines."""
+    baselines = Counter(round(bottom / BASELINE_TOLERANCE) for bottom in line_bottoms)
+    return sum(1 for cells in baselines.values() if cells >= TABLE_MIN_CELLS)
+
+
+def score_page(text: str, table_rows: int = 0) -> float:
+    """Technical-spec score of a page's text (higher = more specs)."""
+    normalized = _normalize(text)
+    score = (
+        TECHNICAL_WEIGHT * len(_TECHNICAL.findall(normalized))
+        + UNIT_WEIGHT * len(_UNIT_VALUE.findall(normalized))
+        + TABLE_ROW_WEIGHT * table_rows
+        - ADMINISTRATIVE_WEIGHT * len(_ADMINISTRATIVE.findall(normalized))
+    )
+    return max(0.0, score)
+
+
+def select_page_ranges(
+    page_scores: dict[int, float | None],
+    min_score: float,
+    context_pages: int = 1,
+    max_ratio: float = 0.8,
+) -> list[tuple[int, int]] | None:
+    """Select the pages to send to the LLM.
+
+    Pages without text (None score) cannot be judged and are always kept.
+
+    Args:
+        page_scores: Score per page (1-indexed) for every page of the document.
+        min_score: Pages at or above this score are kept.
+        context_pages: Neighbours kept on each side of a kept page.
+        max_ratio: If more than this share of pages would be kept, keep all.
+
+    Returns:
+        Ranges of (start, end), 1-indexed and inclusive, or None to send the
+        whole document (nothing technical found, or triage would not save much).
+    """
+    if not any(score is not None and score >= min_score for score in page_scores.values()):
+        return None
+
+    total_pages = max(page_scores)
+    kept: set[int] = set()
+    for page, score in page_scores.items():
+        if score is None or score >= min_score:
+            kept.update(
+                range(max(1, page - context_pages), min(total_pages, page + context_pages) + 1)
+            )
+    if len(kept) > max_ratio * total_pages:
+        return None
+
+    ranges: list[tuple[int, int]] = []
+    for page in sorted(kept):
+        if ranges and ranges[-1][1] == page - 1:
+            ranges[-1] = (ranges[-1][0], page)
+        else:
+            ranges.append((page, page))
+    return ranges
+
+
+def triage_fingerprint(min_score: float, context_pages: int, max_ratio: float) -> str:
+    """Identifies the scoring and selection rules (part of the raw-text cache key)."""
+    rules = (
+        TECHNICAL_KEYWORDS,
+        ADMINISTRATIVE_KEYWORDS,
+        _UNIT_VALUE.pattern,
+        (TECHNICAL_WEIGHT, UNIT_WEIGHT, TABLE_ROW_WEIGHT, ADMINISTRATIVE_WEIGHT),
+        (BASELINE_TOLERANCE, TABLE_MIN_CELLS),
+        (min_score, context_pages, max_ratio),
+    )
+    return f"page-triage:{sha256_text(repr(rules))[:16]}"
@@ -0,0 +1,273 @@
+"""Single-pass page analysis engine used by PDFProcessor.check_quality."""
+
+import time
+from dataclasses import dataclass, field
+
+import fitz
+
+from licitaciones.extraction.page_triage import count_table_rows, score_page
+
+# Normal text direction is (1, 0). Any other value means rotated.
+NORMAL_TEXT_DIRECTION = (1, 0)
+
+# "GlyphlessFont" is used by fitz to mark OCR-generated text
+OCR_FONT_NAME = "GlyphlessFont"
+
+
+@dataclass
+class PageScanStats:
+    """Raw counters accumulated while walking PDF pages.
+
+    All counters are additive, so partial scans over disjoint page sets
+    can be combined with `merge`.
+    """
+
+    pages: int = 0
+    text_bytes: int = 0
+    total_chars: int = 0
+    ocr_chars: int = 0
+    total_lines: int = 0
+    rotated_lines: int = 0
+    image_coverage: float = 0.0  # Sum of per-page coverage ratios
+    low_res_image_count: int = 0
+    # Technical-spec score per page (1-indexed), only when triaging; None = no text
+    page_scores: dict[int, float | None] = field(default_factory=dict)
+    timings: dict[str, float] = field(default_factory=dict)
+
+    def add_timing(self, metric: str, seconds: float) -> None:
+        """Accumulate elapsed seconds for a metric."""
+        self.timings[metric] = self.timings.get(metric, 0.0) + seconds
+
+    def merge(self, other: "PageScanStats") -> None:
+        """Add the counters of another (disjoint) scan into this one."""
+        self.pages += other.pages
+        self.text_bytes += other.text_bytes
+        self.total_chars += other.total_chars
+        self.ocr_chars += other.ocr_chars
+        self.total_lines += other.total_lines
+        self.rotated_lines += other.rotated_lines
+        self.image_coverage += other.image_coverage
+        self.low_res_image_count += other.low_res_image_count
+        self.page_scores.update(other.page_scores)
+        for metric, seconds in other.timings.items():
+            self.add_timing(metric, seconds)
+
+    @property
+    def ocr_text_ratio(self) -> float:
+        """Share of characters coming from OCR."""
+        return self.ocr_chars / self.total_chars if self.total_chars > 0 else 0
+
+    @property
+    def rotated_text_ratio(self) -> float:
+        """Share of lines with non-standard direction."""
+        return self.rotated_lines / self.total_lines if self.total_lines > 0 else 0
+
+    @property
+    def image_coverage_ratio(self) -> float:
+        """Average share of each scanned page covered by images."""
+        return self.image_coverage / self.pages if self.pages > 0 else 0
+
+
+class PageScanner:
+    """Walks each page exactly once and accumulates quality counters.
+
+    Text metrics come from a single `get_text("dict")` call per page. Image
+    placements come from `get_image_info`, and the DPI of every image xref
+    is cached so images repeated across pages are only inspected once.
+    With `triage`, the same text also yields each page's technical-spec
+    score (see page_triage).
+    """
+
+    def __init__(self, low_res_dpi_threshold: int, triage: bool = False) -> None:
+        """Initialize the scanner.
+
+        Args:
+            low_res_dpi_threshold: Images below this average DPI count as low resolution.
+            triage: Also score every page for page triage.
+        """
+        self._low_res_dpi_threshold = low_res_dpi_threshold
+        self._triage = triage
+        self._dpi_by_xref: dict[int, float] = {}
+
+    def scan(self, page: fitz.Page, stats: PageScanStats) -> None:
+        """Scan one page and add its counters to `stats`."""
+        start = time.perf_counter()
+        self._scan_text(page, stats)
+        text_done = time.perf_counter()
+        self._scan_images(page, stats)
+        images_done = time.perf_counter()
+
+        stats.pages += 1
+        stats.add_timing("text", text_done - start)
+        stats.add_timing("images", images_done - text_done)
+
+    def _scan_text(self, page: fitz.Page, stats: PageScanStats) -> None:
+        text_dict = page.get_text("dict")
+        page_text: list[str] = []
+        line_bottoms: list[float] = []
+
+        for block in text_dict.get("blocks", []):
+            for line in block.get("lines", ()):
+                stats.total_lines += 1
+                # Plain-text extraction ends every line with a newline
+                stats.text_bytes += 1
+
+                if tuple(line.get("dir", NORMAL_TEXT_DIRECTION)) != NORMAL_TEXT_DIRECTION:
+                    stats.rotated_lines += 1
+
+                for span in line.get("spans", ()):
+                    text = span.get("text", "")
+                    stats.total_chars += len(text)
+                    stats.text_bytes += len(text.encode("utf-8"))
+                    if span.get("font") == OCR_FONT_NAME:
+                        stats.ocr_chars += len(text)
+                    if self._triage:
+                        page_text.append(text)
+
+                if self._triage:
+                    page_text.append("\n")
+                    line_bottoms.append(line["bbox"][3])
+
+        if self._triage:
+            text = "".join(page_text)
+            stats.page_scores[page.number + 1] = (
+                score_page(text, count_table_rows(line_bottoms)) if text.strip() else None
+            )
+
+    def _scan_images(self, page: fitz.Page, stats: PageScanStats) -> None:
+        page_rect = page.rect
+        page_area = page_rect.width * page_rect.height
+        page_image_area = 0.0
+        seen_xrefs: set[int] = set()
+
+        for info in page.get_image_info(xrefs=True):
+            xref = info.get("xref", 0)
+            if not xref:
+                continue  # Inline images have no xref and were never counted
+
+            bbox = fitz.Rect(info["bbox"])
+            page_image_area += bbox.width * bbox.height
+
+            # Low resolution is counted once per image per page
+            if xref in seen_xrefs:
+                continue
+            seen_xrefs.add(xref)
+
+            avg_dpi = self._dpi_by_xref.get(xref)
+            if avg_dpi is None:
+                xres = info.get("xres", 0)
+                yres = info.get("yres", 0)
+                avg_dpi = (xres + yres) / 2 if xres and yres else 0
+                self._dpi_by_xref[xref] = avg_dpi
+
+            if 0 < avg_dpi < self._low_res_dpi_threshold:
+                stats.low_res_image_count += 1
+
+        if page_area > 0:
+            # Overlapping images cannot cover more than the whole page
+            stats.image_coverage += min(page_image_area / page_area, 1.0)
+
+
+def compute_quality_score(
+    is_digital: bool,
+    ocr_text_ratio: float,
+    image_coverage_ratio: float,
+    low_res_image_count: int,
+    rotated_text_ratio: float,
+) -> float:
+    """Apply the weighted quality penalties (see PDFProcessor.check_quality)."""
+    score = 100.0
+    score -= 40 if not is_digital else 0  # Scanned PDF without text
+    score -= 30 * ocr_text_ratio  # OCR text has error risk
+    score -= 25 * image_coverage_ratio  # High image coverage = likely scanned
+    score -= 20 if low_res_image_count > 0 else 0  # Low quality images
+    score -= 15 * rotated_text_ratio  # Rotated text extraction issues
+    return score
+
+
+def quality_score_bounds(
+    stats: PageScanStats,
+    total_pages: int,
+    is_digital: bool,
+) -> tuple[float, float]:
+    """Bound the final quality score given the pages scanned so far.
+
+    Pages not yet scanned can only add text, OCR characters, lines and images,
+    so the best case is clean text (ratios driven towards 0, no new images) and
+    the worst case is fully covered, low resolution, OCR'd and rotated pages.
+    `is_digital` never flips back once reached because text only grows.
+
+    Args:
+        stats: Counters for the pages scanned so far.
+        total_pages: Number of pages in the document.
+        is_digital: Whether the scanned text already makes the PDF digital.
+
+    Returns:
+        (lower, upper) bounds of the final score.
+    """
+    remaining = total_pages - stats.pages
+    if remaining <= 0:
+        exact = compute_quality_score(
+            is_digital=is_digital,
+            ocr_text_ratio=stats.ocr_text_ratio,
+            image_coverage_ratio=stats.image_coverage_ratio,
+            low_res_image_count=stats.low_res_image_count,
+            rotated_text_ratio=stats.rotated_text_ratio,
+        )
+        return exact, exact
+
+    upper = compute_quality_score(
+        is_digital=True,
+        ocr_text_ratio=0.0,
+        image_coverage_ratio=stats.image_coverage / total_pages,
+        low_res_image_count=stats.low_res_image_count,
+        rotated_text_ratio=0.0,
+    )
+    lower = compute_quality_score(
+        is_digital=is_digital,
+        ocr_text_ratio=1.0,
+        image_coverage_ratio=(stats.image_coverage + remaining) / total_pages,
+        low_res_image_count=stats.low_res_image_count + remaining,
+        rotated_text_ratio=1.0,
+    )
+    return lower, upper
+
+
+def split_page_range(num_pages: int, shards: int) -> list[tuple[int, int]]:
+    """Split pages [0, num_pages) into contiguous, balanced [start, stop) shards."""
+    shards = max(1, min(shards, num_pages))
+    size, extra = divmod(num_pages, shards)
+    ranges = []
+    start = 0
+    for i in range(shards):
+        stop = start + size + (1 if i < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def open_pdf(pdf: str | bytes) -> fitz.Document:
+    """Open a PDF from a path or from its bytes (e.g. PDFProcessor.extract_pages)."""
+    if isinstance(pdf, bytes):
+        return fitz.open(stream=pdf, filetype="pdf")
+    return fitz.open(pdf)
+
+
+def scan_page_range(
+    pdf: str | bytes,
+    start: int,
+    stop: int,
+    low_res_dpi_threshold: int,
+    triage: bool = False,
+) -> PageScanStats:
+    """Scan pages [start, stop) of a PDF. Runs inside worker processes.
+
+    Each worker opens the document itself, so only the path (or the bytes of
+    an in-memory PDF) and counters cross process boundaries.
+    """
+    stats = PageScanStats()
+    scanner = PageScanner(low_res_dpi_threshold, triage)
+    with open_pdf(pdf) as doc:
+        for page_number in range(start, stop):
+            scanner.scan(doc[page_number], stats)
+    return stats
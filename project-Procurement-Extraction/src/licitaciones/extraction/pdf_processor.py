@@ -1,9 +1,32 @@
-import tempfile
-from dataclasses import dataclass
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
 
 import fitz
 
 from licitaciones.config import get_settings
+from licitaciones.extraction.pdf_analysis import (
+    PageScanner,
+    PageScanStats,
+    compute_quality_score,
+    open_pdf,
+    quality_score_bounds,
+    scan_page_range,
+    split_page_range,
+)
+
+# Page subsets are written dropping unused objects and compressing streams.
+# Deduplication (garbage >= 3) costs more than it saves: insert_pdf already
+# shares the objects copied from the same source document.
+SUBSET_GARBAGE = 1
+SUBSET_DEFLATE = True
+
+
+def pdf_to_bytes(doc: fitz.Document) -> bytes:
+    """Serialize a PDF into memory with the page-subset options."""
+    return doc.tobytes(garbage=SUBSET_GARBAGE, deflate=SUBSET_DEFLATE)
 
 
 @dataclass
@@ -21,10 +44,18 @@ class PDFQualityReport:
     rotated_text_ratio: float
     pages_analyzed: int
 
+    # Scan diagnostics
+    early_exit: bool = False  # True if scanning stopped once the score was settled
+    # Technical-spec score per page (1-indexed), only with triage; None = no text
+    page_scores: dict[int, float | None] = field(default_factory=dict)
+    timings: dict[str, float] = field(default_factory=dict)  # Seconds spent per metric
+
 
 class PDFProcessor:
     def __init__(self, settings=None):
         self.settings = settings or get_settings()
+        self._executor: ProcessPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
 
     def _check_pages_quantity(self, doc: fitz.Document) -> int:
         """Check page count and return it if valid, raise if exceeds limit."""
@@ -35,9 +66,9 @@ class PDFProcessor:
             )
         return num_pages
 
-    def _check_file_size(self, doc: fitz.Document) -> int:
+    def _check_file_size(self, pdf: str | bytes) -> int:
         """Check file size and return bytes if valid, raise if exceeds limit."""
-        file_size = len(doc.tobytes())
+        file_size = len(pdf) if isinstance(pdf, bytes) else os.path.getsize(pdf)
         file_size_mb = file_size / (1024 * 1024)
         if file_size_mb > self.settings.pdf_max_size_mb:
             raise ValueError(
@@ -45,11 +76,19 @@ class PDFProcessor:
             )
         return file_size
 
-    def check_quality(self, pdf_path: str) -> PDFQualityReport:
+    def check_quality(
+        self, pdf: str | bytes, early_exit: bool | None = None, triage: bool = False
+    ) -> PDFQualityReport:
         """Analyze PDF quality and return metrics for pipeline decision-making.
 
         Args:
-            pdf_path: Path to the PDF file to analyze.
+            pdf: Path to the PDF file to analyze, or its bytes (see extract_pages).
+            early_exit: Stop scanning once the score is settled below or above
+                `pdf_min_acceptable_quality_score`. Defaults to `pdf_quality_early_exit`.
+                When it triggers, metrics cover only the `pages_analyzed` scanned pages.
+            triage: Also score every page for technical-spec density into
+                `page_scores` (see page_triage). Needs every page, so it
+                disables early exit.
 
         Quality checks performed:
         1. Digital vs Scanned: Compares extracted text size to file size.
@@ -63,6 +102,10 @@ class PDFProcessor:
         5. Rotated Text: Detects text with non-standard direction.
            Rotated text may cause extraction issues.
 
+        Every page is walked once (see PageScanner); image DPI is cached per xref.
+        With `pdf_quality_workers > 1` the page range is split into shards that are
+        scanned in a process pool and merged into the same report.
+
         Score calculation (0-100, higher = better quality):
         - Start at 100
         - -40 if not digital (scanned without extractable text)
@@ -71,101 +114,153 @@ class PDFProcessor:
         - -20 if any low resolution images found
         - -15 * rotated_text_ratio (proportional to rotated text)
         """
-        with fitz.open(pdf_path) as doc:
+        if early_exit is None:
+            early_exit = self.settings.pdf_quality_early_exit
+        early_exit = early_exit and not triage
+
+        stats = PageScanStats()
+        start = time.perf_counter()
+        file_size = self._check_file_size(pdf)
+        stats.add_timing("file_size", time.perf_counter() - start)
+
+        with open_pdf(pdf) as doc:
+            start = time.perf_counter()
             num_pages = self._check_pages_quantity(doc)
-            file_size = self._check_file_size(doc)
-
-            total_text = ""
-            total_chars = 0
-            ocr_chars = 0
-            rotated_lines = 0
-            total_lines = 0
-            total_image_coverage = 0.0
-            low_res_image_count = 0
-
-            for page in doc:
-                total_text += page.get_text()
-
-                text_dict = page.get_text("dict")
-                page_rect = page.rect
-                page_area = page_rect.width * page_rect.height
-
-                for block in text_dict.get("blocks", []):
-                    if "lines" not in block:
-                        continue
-
-                    for line in block.get("lines", []):
-                        total_lines += 1
-
-                        # Normal text direction is (1, 0). Any other value means rotated.
-                        direction = line.get("dir", (1, 0))
-                        if direction != (1, 0):
-                            rotated_lines += 1
-
-                        for span in line.get("spans", []):
-                            text = span.get("text", "")
-                            total_chars += len(text)
-
-                            # "GlyphlessFont" is used by fitz to mark OCR-generated text
-                            if span.get("font") == "GlyphlessFont":
-                                ocr_chars += len(text)
-
-                images = page.get_images()
-                page_image_area = 0.0
-
-                for img in images:
-                    xref = img[0]
-                    try:
-                        img_info = doc.extract_image(xref)
-                        xres = img_info.get("xres", 0)
-                        yres = img_info.get("yres", 0)
-                        avg_dpi = (xres + yres) / 2 if xres and yres else 0
-
-                        if 0 < avg_dpi < self.settings.pdf_low_res_dpi_threshold:
-                            low_res_image_count += 1
-
-                        # Calculate image area on page for coverage ratio
-                        img_rects = page.get_image_rects(xref)
-                        for rect in img_rects:
-                            page_image_area += rect.width * rect.height
-                    except Exception:
-                        pass
-
-                if page_area > 0:
-                    total_image_coverage += page_image_area / page_area
-
-            # Calculate quality metrics
-            text_size = len(total_text.encode("utf-8"))
-            text_to_size_ratio = text_size / file_size if file_size > 0 else 0
-            image_coverage_ratio = total_image_coverage / num_pages if num_pages > 0 else 0
-            ocr_text_ratio = ocr_chars / total_chars if total_chars > 0 else 0
-            rotated_text_ratio = rotated_lines / total_lines if total_lines > 0 else 0
-
-            # Digital = has enough extractable text relative to file size
-            is_digital = text_to_size_ratio > self.settings.pdf_text_to_size_ratio_threshold
-
-            # Calculate quality score with weighted penalties
-            score = 100.0
-            score -= 40 if not is_digital else 0  # Scanned PDF without text
-            score -= 30 * ocr_text_ratio  # OCR text has error risk
-            score -= 25 * image_coverage_ratio  # High image coverage = likely scanned
-            score -= 20 if low_res_image_count > 0 else 0  # Low quality images
-            score -= 15 * rotated_text_ratio  # Rotated text extraction issues
-            quality_score = max(0, int(score))
-
-            return PDFQualityReport(
-                is_digital=is_digital,
-                quality_score=quality_score,
-                text_to_size_ratio=text_to_size_ratio,
-                image_coverage_ratio=image_coverage_ratio,
-                ocr_text_ratio=ocr_text_ratio,
-                low_res_image_count=low_res_image_count,
-                rotated_text_ratio=rotated_text_ratio,
-                pages_analyzed=num_pages,
+            stats.add_timing("page_count", time.perf_counter() - start)
+
+            shards = self._plan_shards(num_pages)
+            if len(shards) <= 1:
+                stopped_early = self._scan_sequential(doc, stats, file_size, early_exit, triage)
+
+        if len(shards) > 1:
+            stopped_early = self._scan_parallel(pdf, shards, stats, file_size, early_exit, triage)
+
+        # Calculate quality metrics
+        start = time.perf_counter()
+        text_to_size_ratio = stats.text_bytes / file_size if file_size > 0 else 0
+        is_digital = self._is_digital(stats.text_bytes, file_size)
+        score = compute_quality_score(
+            is_digital=is_digital,
+            ocr_text_ratio=stats.ocr_text_ratio,
+            image_coverage_ratio=stats.image_coverage_ratio,
+            low_res_image_count=stats.low_res_image_count,
+            rotated_text_ratio=stats.rotated_text_ratio,
+        )
+        quality_score = max(0, int(score))
+        stats.add_timing("score", time.perf_counter() - start)
+
+        return PDFQualityReport(
+            is_digital=is_digital,
+            quality_score=quality_score,
+            text_to_size_ratio=text_to_size_ratio,
+            image_coverage_ratio=stats.image_coverage_ratio,
+            ocr_text_ratio=stats.ocr_text_ratio,
+            low_res_image_count=stats.low_res_image_count,
+            rotated_text_ratio=stats.rotated_text_ratio,
+            pages_analyzed=stats.pages,
+            early_exit=stopped_early,
+            page_scores=stats.page_scores,
+            timings=stats.timings,
+        )
+
+    def _plan_shards(self, num_pages: int) -> list[tuple[int, int]]:
+        """Split the page range into shards for the worker pool (one shard = sequential)."""
+        workers = self.settings.pdf_quality_workers
+        min_pages = max(1, self.settings.pdf_quality_min_pages_per_shard)
+        shards = min(workers, num_pages // min_pages)
+        return split_page_range(num_pages, shards)
+
+    def _scan_sequential(
+        self,
+        doc: fitz.Document,
+        stats: PageScanStats,
+        file_size: int,
+        early_exit: bool,
+        triage: bool = False,
+    ) -> bool:
+        """Scan pages in order in this process. Returns True if stopped early."""
+        scanner = PageScanner(self.settings.pdf_low_res_dpi_threshold, triage)
+        for page in doc:
+            scanner.scan(page, stats)
+            if early_exit and self._is_settled(stats, doc.page_count, file_size):
+                return True
+        return False
+
+    def _scan_parallel(
+        self,
+        pdf: str | bytes,
+        shards: list[tuple[int, int]],
+        stats: PageScanStats,
+        file_size: int,
+        early_exit: bool,
+        triage: bool = False,
+    ) -> bool:
+        """Scan page shards in the process pool and merge partial counters.
+
+        Shards are merged as they complete; since the counters are additive the
+        score bounds hold for any subset, so pending shards are cancelled as soon
+        as the decision is settled. Returns True if stopped early.
+        """
+        num_pages = shards[-1][1]
+        pool = self._get_executor()
+        start = time.perf_counter()
+        futures = [
+            pool.submit(
+                scan_page_range,
+                pdf if isinstance(pdf, bytes) else str(pdf),
+                shard_start,
+                shard_stop,
+                self.settings.pdf_low_res_dpi_threshold,
+                triage,
             )
-
-    def extract_pages(self, pdf_path: str, page_ranges: list[tuple[int, int]]) -> str:
-        """Extract multiple page ranges from PDF and save to temp file.
+            for shard_start, shard_stop in shards
+        ]
+        try:
+            for future in as_completed(futures):
+                stats.merge(future.result())
+                if early_exit and self._is_settled(stats, num_pages, file_size):
+                    return True
+            return False
+        finally:
+            for future in futures:
+                future.cancel()
+            stats.add_timing("parallel_scan", time.perf_counter() - start)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Get or create the worker pool used for parallel scans."""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.settings.pdf_quality_workers)
+            return self._executor
+
+    def close(self) -> None:
+        """Shut down the worker pool, if one was started."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _is_settled(self, stats: PageScanStats, num_pages: int, file_size: int) -> bool:
+        """Whether unscanned pages can no longer move the score across the threshold."""
+        if stats.pages >= num_pages:
+            return False
+        start = time.perf_counter()
+        lower, upper = quality_score_bounds(
+            stats, num_pages, self._is_digital(stats.text_bytes, file_size)
+        )
+        stats.add_timing("early_exit", time.perf_counter() - start)
+        threshold = self.settings.pdf_min_acceptable_quality_score
+        return upper < threshold or lower >= threshold
+
+    def _is_digital(self, text_bytes: int, file_size: int) -> bool:
+        """Digital = has enough extractable text relative to file size."""
+        text_to_size_ratio = text_bytes / file_size if file_size > 0 else 0
+        return text_to_size_ratio > self.settings.pdf_text_to_size_ratio_threshold
+
+    def extract_pages(self, pdf_path: str, page_ranges: list[tuple[int, int]]) -> bytes:
+        """Extract multiple page ranges from a PDF into an in-memory PDF.
+
+        The subset is serialized once; the same bytes go through check_quality
+        and the product extractor upload, without temp files.
 
         Args:
             pdf_path: Source PDF path.
@@ -173,11 +268,10 @@ class PDFProcessor:
                 If end exceeds document pages, it clips to the last page.
 
         Returns:
-            Path to temporary PDF with selected pages.
+            Bytes of a PDF with the selected pages.
         """
-        with fitz.open(pdf_path) as doc:
+        with fitz.open(pdf_path) as doc, fitz.open() as new_doc:
             total_pages = doc.page_count
-            new_doc = fitz.open()
 
             for start, end in page_ranges:
                 # Clip end to actual page count
@@ -191,13 +285,9 @@ class PDFProcessor:
                 new_doc.insert_pdf(doc, from_page=start - 1, to_page=clipped_end - 1)
 
             if new_doc.page_count == 0:
-                new_doc.close()
                 raise ValueError(
                     f"No valid pages to extract. PDF has {total_pages} pages, "
                     f"but requested ranges {page_ranges} are out of bounds."
                 )
 
-            temp_file = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False)
-            new_doc.save(temp_file.name)
-            new_doc.close()
-            return temp_file.name
+            return pdf_to_bytes(new_doc)
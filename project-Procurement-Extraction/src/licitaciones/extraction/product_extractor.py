@@ -1,22 +1,70 @@
 """Extractor de productos desde PDFs.
 
 Utiliza Gemini para hacer file upload y extraer información de productos.
+Hay una versión sincrónica y una asíncrona (todos los PDFs en vuelo sobre un
+mismo event loop); ambas producen la misma salida y comparten fingerprint.
 """
 
+import asyncio
+import io
+import threading
 import time
+from collections.abc import Iterator
+from concurrent.futures import Future, wait
 from pathlib import Path
 
 from google import genai
 
 from licitaciones.config import Settings, get_settings
+from licitaciones.extraction.cache import sha256_text
+from licitaciones.extraction.gemini_files import GeminiFileRegistry
 from licitaciones.extraction.prompts import PRODUCT_EXTRACTION_PROMPT
+from licitaciones.extraction.protocols import PDFSource
+from licitaciones.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Polling del estado del archivo subido: backoff exponencial acotado.
+# Los PDFs chicos suelen estar listos en pocos cientos de ms.
+POLL_INITIAL_DELAY = 0.1
+POLL_MAX_DELAY = 2.0
+POLL_BACKOFF_FACTOR = 1.5
+
+# Espera máxima, al cerrar el extractor async, por los borrados en segundo plano
+CLOSE_TIMEOUT_SECONDS = 10.0
+
+
+def poll_delays() -> Iterator[float]:
+    """Esperas sucesivas entre consultas de estado (0.1s, 0.15s, ... hasta 2s)."""
+    delay = POLL_INITIAL_DELAY
+    while True:
+        yield delay
+        delay = min(delay * POLL_BACKOFF_FACTOR, POLL_MAX_DELAY)
+
+
+def _upload_args(pdf: PDFSource) -> dict:
+    """Argumentos de `files.upload`: la ruta, o el contenido en memoria sin pasar por disco."""
+    if isinstance(pdf, bytes):
+        return {"file": io.BytesIO(pdf), "config": {"mime_type": "application/pdf"}}
+    return {"file": str(pdf)}
+
+
+def _check_exists(pdf: PDFSource) -> None:
+    if isinstance(pdf, Path) and not pdf.exists():
+        raise FileNotFoundError(f"Archivo no encontrado: {pdf}")
+
+
+def _fingerprint(model_name: str) -> str:
+    """Fingerprint común a las versiones sync y async del extractor."""
+    prompt_hash = sha256_text(PRODUCT_EXTRACTION_PROMPT)[:16]
+    return f"GeminiProductExtractor:{model_name}:{prompt_hash}"
 
 
 class GeminiProductExtractor:
     """Extrae información de productos desde PDFs usando Gemini.
 
     Responsabilidades:
-    - Subir el PDF a Gemini
+    - Subir el PDF a Gemini (reutilizando subidas previas del mismo contenido)
     - Usar file search para extraer productos
     - Retornar texto no estructurado con la información
     """
@@ -35,12 +83,22 @@ class GeminiProductExtractor:
         self._settings = settings or get_settings()
         self._model_name = model_name
         self._client = genai.Client(api_key=self._settings.google_api_key)
+        self._files = GeminiFileRegistry(
+            delete=lambda name: self._client.files.delete(name=name),
+            ttl_seconds=self._settings.gemini_file_ttl_seconds,
+            sweep_interval_seconds=self._settings.gemini_file_sweep_interval_seconds,
+        )
+
+    @property
+    def fingerprint(self) -> str:
+        """Identifica modelo y prompt; cambia cuando cambiaría la salida."""
+        return _fingerprint(self._model_name)
 
-    def extract_from_pdf(self, pdf_path: Path) -> str:
+    def extract_from_pdf(self, pdf: PDFSource) -> str:
         """Extrae información de productos desde un PDF.
 
         Args:
-            pdf_path: Ruta al archivo PDF.
+            pdf: Ruta al archivo PDF o su contenido en memoria.
 
         Returns:
             Texto con la información extraída.
@@ -49,31 +107,17 @@ class GeminiProductExtractor:
             FileNotFoundError: Si el archivo no existe.
             ValueError: Si hay un error al procesar el PDF.
         """
-        if not pdf_path.exists():
-            raise FileNotFoundError(f"Archivo no encontrado: {pdf_path}")
+        return self.extract_from_pdf_with_custom_prompt(pdf, PRODUCT_EXTRACTION_PROMPT)
 
-        # Subir archivo a Gemini
-        uploaded_file = self._upload_file(pdf_path)
+    def close(self) -> None:
+        """Borra los archivos subidos que siguen registrados."""
+        self._files.close()
 
-        try:
-            # Generar contenido
-            response = self._client.models.generate_content(
-                model=self._model_name,
-                contents=[PRODUCT_EXTRACTION_PROMPT, uploaded_file],
-            )
-            return response.text
-        finally:
-            # Limpiar archivo subido
-            try:
-                self._client.files.delete(name=uploaded_file.name)
-            except Exception:
-                pass  # Ignorar errores de limpieza
-
-    def _upload_file(self, pdf_path: Path):
+    def _upload_file(self, pdf: PDFSource):
         """Sube un archivo a Gemini y espera a que esté procesado.
 
         Args:
-            pdf_path: Ruta al archivo.
+            pdf: Ruta al archivo o su contenido en memoria.
 
         Returns:
             Archivo subido a Gemini.
@@ -81,11 +125,12 @@ class GeminiProductExtractor:
         Raises:
             ValueError: Si hay un error al procesar el archivo.
         """
-        uploaded_file = self._client.files.upload(file=str(pdf_path))
+        uploaded_file = self._client.files.upload(**_upload_args(pdf))
 
         # Esperar a que el archivo esté procesado
+        delays = poll_delays()
         while uploaded_file.state.name == "PROCESSING":
-            time.sleep(2)
+            time.sleep(next(delays))
             uploaded_file = self._client.files.get(name=uploaded_file.name)
 
         if uploaded_file.state.name == "FAILED":
@@ -95,31 +140,180 @@ class GeminiProductExtractor:
 
     def extract_from_pdf_with_custom_prompt(
         self,
-        pdf_path: Path,
+        pdf: PDFSource,
         prompt: str,
     ) -> str:
         """Extrae información usando un prompt personalizado.
 
+        El archivo subido se reutiliza entre prompts y corridas sobre el mismo
+        PDF mientras no venza su TTL (ver GeminiFileRegistry).
+
         Args:
-            pdf_path: Ruta al archivo PDF.
+            pdf: Ruta al archivo PDF o su contenido en memoria.
             prompt: Prompt personalizado para la extracción.
 
         Returns:
             Texto con la información extraída.
         """
-        if not pdf_path.exists():
-            raise FileNotFoundError(f"Archivo no encontrado: {pdf_path}")
+        _check_exists(pdf)
+
+        with self._files.lease(pdf, self._upload_file) as uploaded_file:
+            response = self._client.models.generate_content(
+                model=self._model_name,
+                contents=[prompt, uploaded_file],
+            )
+            return response.text
+
 
-        uploaded_file = self._upload_file(pdf_path)
+class AsyncGeminiProductExtractor:
+    """Versión asíncrona de GeminiProductExtractor.
+
+    Sube, consulta el estado y genera con el cliente async del SDK
+    (`client.aio`) en un único event loop propio, que corre en un thread en
+    segundo plano: muchas licitaciones pueden estar en vuelo sin ocupar un
+    thread cada una mientras Gemini procesa el archivo. Los archivos subidos
+    se reutilizan igual que en la versión sincrónica (GeminiFileRegistry) y
+    se borran en segundo plano, fuera del camino crítico.
+
+    Cumple ProductExtractorProtocol: `extract_from_pdf` bloquea al thread que
+    llama hasta que el loop termina la extracción. Desde código async usar
+    `submit` y esperar el Future con `asyncio.wrap_future`.
+    """
+
+    def __init__(
+        self,
+        settings: Settings | None = None,
+        model_name: str = "gemini-2.5-flash",
+    ) -> None:
+        """Inicializa el extractor (el event loop arranca en el primer uso).
 
+        Args:
+            settings: Configuración de la aplicación.
+            model_name: Nombre del modelo Gemini a usar.
+        """
+        self._settings = settings or get_settings()
+        self._model_name = model_name
+        # El cliente async queda atado al loop donde se usa: uno solo por extractor
+        self._aio = genai.Client(api_key=self._settings.google_api_key).aio
+        self._files = GeminiFileRegistry(
+            delete=self._delete_in_background,
+            ttl_seconds=self._settings.gemini_file_ttl_seconds,
+            sweep_interval_seconds=self._settings.gemini_file_sweep_interval_seconds,
+        )
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._pending_deletes: set[Future] = set()
+
+    @property
+    def fingerprint(self) -> str:
+        """Identifica modelo y prompt; igual al del extractor sincrónico."""
+        return _fingerprint(self._model_name)
+
+    def extract_from_pdf(self, pdf: PDFSource) -> str:
+        """Extrae información de productos desde un PDF.
+
+        Args:
+            pdf: Ruta al archivo PDF o su contenido en memoria.
+
+        Returns:
+            Texto con la información extraída.
+
+        Raises:
+            FileNotFoundError: Si el archivo no existe.
+            ValueError: Si hay un error al procesar el PDF.
+        """
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("extract_from_pdf bloquearía el event loop: usar submit")
+        return self.submit(pdf).result()
+
+    def submit(self, pdf: PDFSource, prompt: str = PRODUCT_EXTRACTION_PROMPT) -> Future:
+        """Programa una extracción en el event loop del extractor.
+
+        Args:
+            pdf: Ruta al archivo PDF o su contenido en memoria.
+            prompt: Prompt para la extracción.
+
+        Returns:
+            Future con el texto extraído.
+        """
+        _check_exists(pdf)
+        return asyncio.run_coroutine_threadsafe(self._extract(pdf, prompt), self._ensure_loop())
+
+    def close(self) -> None:
+        """Borra los archivos subidos que siguen registrados y detiene el loop."""
+        self._files.close()
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+            pending = list(self._pending_deletes)
+        if loop is None:
+            return
+        wait(pending, timeout=CLOSE_TIMEOUT_SECONDS)
         try:
-            response = self._client.models.generate_content(
+            # Las sesiones HTTP del cliente async se cierran en su propio loop
+            cerrar = asyncio.run_coroutine_threadsafe(self._aio.aclose(), loop)
+            cerrar.result(CLOSE_TIMEOUT_SECONDS)
+        except Exception as e:
+            logger.debug("No se pudo cerrar el cliente async de Gemini: %s", e)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    async def _extract(self, pdf: PDFSource, prompt: str) -> str:
+        async with self._files.alease(pdf, self._upload_file) as uploaded_file:
+            response = await self._aio.models.generate_content(
                 model=self._model_name,
                 contents=[prompt, uploaded_file],
             )
             return response.text
-        finally:
-            try:
-                self._client.files.delete(name=uploaded_file.name)
-            except Exception:
-                pass
+
+    async def _upload_file(self, pdf: PDFSource):
+        """Sube un archivo a Gemini y espera, con backoff, a que esté procesado.
+
+        Raises:
+            ValueError: Si hay un error al procesar el archivo.
+        """
+        uploaded_file = await self._aio.files.upload(**_upload_args(pdf))
+
+        delays = poll_delays()
+        while uploaded_file.state.name == "PROCESSING":
+            await asyncio.sleep(next(delays))
+            uploaded_file = await self._aio.files.get(name=uploaded_file.name)
+
+        if uploaded_file.state.name == "FAILED":
+            self._delete_in_background(uploaded_file.name)
+            raise ValueError(f"Error al procesar el archivo: {uploaded_file.state}")
+
+        return uploaded_file
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name="gemini-aio", daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    def _delete_in_background(self, name: str) -> None:
+        """Lanza el borrado de un archivo subido sin esperarlo (desde cualquier thread)."""
+        with self._lock:
+            loop = self._loop
+            if loop is None:
+                return
+            future = asyncio.run_coroutine_threadsafe(self._delete_file(name), loop)
+            self._pending_deletes.add(future)
+        future.add_done_callback(self._forget_delete)
+
+    def _forget_delete(self, future: Future) -> None:
+        with self._lock:
+            self._pending_deletes.discard(future)
+
+    async def _delete_file(self, name: str) -> None:
+        try:
+            await self._aio.files.delete(name=name)
+        except Exception as e:
+            # Ignorar errores de limpieza
+            logger.debug("No se pudo borrar el archivo %s: %s", name, e)
@@ -3,8 +3,6 @@
 Utiliza modelos LLM para convertir texto extraído en modelos Pydantic estructurados.
 """
 
-import json
-
 from google import genai
 from google.genai import types
 from langchain_core.prompts import ChatPromptTemplate
@@ -12,7 +10,9 @@ from langchain_openai import ChatOpenAI
 
 from licitaciones.config import Settings, get_settings
 from licitaciones.domain.extraction_models import LicitacionCompleta
+from licitaciones.extraction.cache import schema_version, sha256_text
 from licitaciones.extraction.prompts import MULTI_ITEM_EXTRACTION_PROMPT
+from licitaciones.extraction.schema_prompt import structuring_prompt_prefix
 
 
 class OpenAIPropertiesExtractor:
@@ -42,6 +42,15 @@ class OpenAIPropertiesExtractor:
         self._temperature = temperature
         self._configure_chain()
 
+    @property
+    def fingerprint(self) -> str:
+        """Identifica modelo, prompt y schema; cambia cuando cambiaría la salida."""
+        prompt_hash = sha256_text(MULTI_ITEM_EXTRACTION_PROMPT)[:16]
+        return (
+            f"{type(self).__name__}:{self._model_name}:{self._temperature}:"
+            f"{prompt_hash}:{schema_version(LicitacionCompleta)}"
+        )
+
     def _configure_chain(self) -> None:
         """Configura la cadena de LangChain."""
         self._llm = ChatOpenAI(
@@ -99,6 +108,15 @@ class GeminiPropertiesExtractor:
         self._temperature = temperature
         self._client = genai.Client(api_key=self._settings.google_api_key)
 
+    @property
+    def fingerprint(self) -> str:
+        """Identifica modelo, prompt y schema; cambia cuando cambiaría la salida."""
+        prompt_hash = sha256_text(structuring_prompt_prefix())[:16]
+        return (
+            f"{type(self).__name__}:{self._model_name}:{self._temperature}:"
+            f"{prompt_hash}:{schema_version(LicitacionCompleta)}"
+        )
+
     def structure_properties(self, raw_text: str) -> LicitacionCompleta:
         """Estructura el texto extraído en modelos Pydantic.
 
@@ -112,14 +130,11 @@ class GeminiPropertiesExtractor:
             No usamos response_json_schema porque el schema de LicitacionCompleta
             es demasiado complejo (muchos campos anidados) y Gemini rechaza schemas
             que generan demasiados "states". En su lugar, incluimos el schema en
-            el prompt y validamos con Pydantic después.
+            el prompt y validamos con Pydantic después. El schema va en forma
+            compacta y precalculada, como prefijo fijo del prompt para que el
+            caching de contexto de Gemini lo reutilice (ver schema_prompt).
         """
-        schema_json = json.dumps(LicitacionCompleta.model_json_schema(), indent=2)
-        full_prompt = (
-            f"{MULTI_ITEM_EXTRACTION_PROMPT}\n\n"
-            f"**JSON Schema to follow:**\n```json\n{schema_json}\n```\n\n"
-            f"**Text to process:**\n{raw_text}"
-        )
+        full_prompt = f"{structuring_prompt_prefix()}**Text to process:**\n{raw_text}"
 
         response = self._client.models.generate_content(
             model=self._model_name,
@@ -8,6 +8,9 @@ from typing import Protocol
 
 from licitaciones.domain.extraction_models import LicitacionCompleta
 
+# Un PDF en disco o en memoria (ver PDFProcessor.extract_pages)
+PDFSource = Path | bytes
+
 
 class ProductExtractorProtocol(Protocol):
     """Protocol para extractores de productos desde PDFs.
@@ -18,11 +21,16 @@ class ProductExtractorProtocol(Protocol):
     3. Retornar texto no estructurado con la información extraída
     """
 
-    def extract_from_pdf(self, pdf_path: Path) -> str:
+    @property
+    def fingerprint(self) -> str:
+        """Identifica modelo y prompt; cambia cuando cambiaría la salida (clave de caché)."""
+        ...
+
+    def extract_from_pdf(self, pdf: PDFSource) -> str:
         """Extrae información de productos desde un PDF.
 
         Args:
-            pdf_path: Ruta al archivo PDF.
+            pdf: Ruta al archivo PDF o su contenido en memoria.
 
         Returns:
             Texto con la información extraída del PDF.
@@ -39,6 +47,11 @@ class PropertiesExtractorProtocol(Protocol):
     3. Retornar LicitacionCompleta con todos los items
     """
 
+    @property
+    def fingerprint(self) -> str:
+        """Identifica modelo, prompt y schema; cambia cuando cambiaría la salida."""
+        ...
+
     def structure_properties(self, raw_text: str) -> LicitacionCompleta:
         """Estructura el texto extraído en modelos Pydantic.
 
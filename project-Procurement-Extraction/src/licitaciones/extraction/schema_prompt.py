@@ -0,0 +1,129 @@
+"""Prompt de estructuración con el JSON schema en forma compacta.
+
+GeminiPropertiesExtractor incluye el schema de LicitacionCompleta en el prompt
+(ver la nota en `structure_properties`). El schema de Pydantic con `indent=2`
+pesa ~57 KB; acá se renderiza una sola vez por proceso en una forma compacta
+que conserva lo que el modelo necesita para responder:
+
+- Sin indentación, sin `title` (repite el nombre del campo) y sin `default: null`.
+- `anyOf [X, null]` se reduce a X: todos los campos opcionales admiten null.
+- Decimal (`anyOf [number, string]`) se reduce a number.
+- `$defs` usados una sola vez se inlinean; solo quedan los compartidos.
+- La descripción de un modelo inlineado se omite si el campo ya tiene una.
+
+Las instrucciones y el schema forman un prefijo fijo al inicio del prompt, de
+modo que el caching de contexto del proveedor puede reutilizarlo entre llamadas.
+"""
+
+import json
+from collections import Counter
+from functools import lru_cache
+from typing import Any
+
+from pydantic import BaseModel
+
+from licitaciones.domain.extraction_models import LicitacionCompleta
+from licitaciones.extraction.prompts import MULTI_ITEM_EXTRACTION_PROMPT
+
+_REF_PREFIX = "#/$defs/"
+
+SCHEMA_CONVENTIONS = (
+    "Schema conventions: every field not listed in `required` is optional and may be null; "
+    "do not add properties that are not in the schema; numbers are plain JSON numbers."
+)
+
+
+def _count_refs(node: Any, counts: Counter) -> None:
+    if isinstance(node, dict):
+        ref = node.get("$ref")
+        if isinstance(ref, str) and ref.startswith(_REF_PREFIX):
+            counts[ref.removeprefix(_REF_PREFIX)] += 1
+        for value in node.values():
+            _count_refs(value, counts)
+    elif isinstance(node, list):
+        for value in node:
+            _count_refs(value, counts)
+
+
+def _compact(node: Any, defs: dict[str, Any], inline: set[str]) -> Any:
+    """Reescribe un nodo del schema en su forma compacta."""
+    if isinstance(node, list):
+        return [_compact(value, defs, inline) for value in node]
+    if not isinstance(node, dict):
+        return node
+
+    node = dict(node)
+    node.pop("title", None)
+    node.pop("additionalProperties", None)
+    if "default" in node and node["default"] is None:
+        del node["default"]
+
+    variants = node.get("anyOf")
+    if variants is not None:
+        variants = [v for v in variants if v != {"type": "null"}]
+        if variants == [{"type": "number"}, {"type": "string"}]:
+            variants = [{"type": "number"}]  # Decimal
+        del node["anyOf"]
+        if len(variants) == 1:
+            # El campo conserva su propia descripción por sobre la del tipo
+            node = {**variants[0], **node}
+        else:
+            node["anyOf"] = variants
+
+    ref = node.get("$ref", "")
+    name = ref.removeprefix(_REF_PREFIX)
+    if name in inline:
+        del node["$ref"]
+        target = dict(defs[name])
+        if "description" in node:
+            target.pop("description", None)
+        node = {**target, **node}
+        return _compact(node, defs, inline)
+
+    compact = {}
+    for key, value in node.items():
+        if key == "properties":
+            # Las claves de `properties` son nombres de campo, no keywords del schema
+            compact[key] = {field: _compact(sub, defs, inline) for field, sub in value.items()}
+        else:
+            compact[key] = _compact(value, defs, inline)
+    return compact
+
+
+def compact_json_schema(model: type[BaseModel] = LicitacionCompleta) -> dict[str, Any]:
+    """JSON schema de un modelo Pydantic en forma compacta (ver docstring del módulo)."""
+    schema = model.model_json_schema()
+    defs = schema.pop("$defs", {})
+
+    counts: Counter = Counter()
+    _count_refs(schema, counts)
+    _count_refs(defs, counts)
+    inline = {name for name in defs if counts[name] <= 1}
+
+    compact = _compact(schema, defs, inline)
+    shared = {
+        name: _compact(defs[name], defs, inline) for name in sorted(defs) if name not in inline
+    }
+    if shared:
+        compact["$defs"] = shared
+    return compact
+
+
+@lru_cache(maxsize=8)
+def render_schema(model: type[BaseModel] = LicitacionCompleta) -> str:
+    """Schema compacto serializado; se calcula una vez por proceso y modelo."""
+    return json.dumps(
+        compact_json_schema(model),
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+
+
+@lru_cache(maxsize=1)
+def structuring_prompt_prefix() -> str:
+    """Prefijo fijo del prompt de estructuración: instrucciones + schema."""
+    return (
+        f"{MULTI_ITEM_EXTRACTION_PROMPT}\n\n"
+        f"**JSON Schema to follow:**\n{SCHEMA_CONVENTIONS}\n"
+        f"```json\n{render_schema(LicitacionCompleta)}\n```\n\n"
+    )
@@ -0,0 +1,71 @@
+"""Límites de concurrencia por proveedor LLM.
+
+Envuelven a los extractores y cumplen los mismos Protocols, de modo que el
+pipeline no cambia: solo se acota cuántas llamadas simultáneas recibe cada
+proveedor cuando varios PDFs se procesan en paralelo.
+"""
+
+import threading
+
+from licitaciones.domain.extraction_models import LicitacionCompleta
+from licitaciones.extraction.protocols import (
+    PDFSource,
+    ProductExtractorProtocol,
+    PropertiesExtractorProtocol,
+)
+
+
+class ConcurrencyLimitedProductExtractor:
+    """ProductExtractor con un máximo de llamadas simultáneas."""
+
+    def __init__(
+        self,
+        extractor: ProductExtractorProtocol,
+        semaphore: threading.BoundedSemaphore,
+    ) -> None:
+        """Inicializa el wrapper.
+
+        Args:
+            extractor: Extractor a envolver.
+            semaphore: Semáforo compartido por todas las llamadas al proveedor.
+        """
+        self._extractor = extractor
+        self._semaphore = semaphore
+
+    @property
+    def fingerprint(self) -> str:
+        """Fingerprint del extractor envuelto."""
+        return self._extractor.fingerprint
+
+    def extract_from_pdf(self, pdf: PDFSource) -> str:
+        """Extrae información de productos respetando el límite del proveedor."""
+        with self._semaphore:
+            return self._extractor.extract_from_pdf(pdf)
+
+
+class ConcurrencyLimitedPropertiesExtractor:
+    """PropertiesExtractor con un máximo de llamadas simultáneas."""
+
+    def __init__(
+        self,
+        extractor: PropertiesExtractorProtocol,
+        semaphore: threading.BoundedSemaphore,
+    ) -> None:
+        """Inicializa el wrapper.
+
+        Args:
+            extractor: Estructurador a envolver.
+            semaphore: Semáforo compartido por todas las llamadas al proveedor.
+        """
+        self._extractor = extractor
+        self._semaphore = semaphore
+
+    @property
+    def fingerprint(self) -> str:
+        """Fingerprint del estructurador envuelto."""
+        return self._extractor.fingerprint
+
+    def structure_properties(self, raw_text: str) -> LicitacionCompleta:
+        """Estructura el texto respetando el límite del proveedor."""
+        with self._semaphore:
+            return self._extractor.structure_properties(raw_text)
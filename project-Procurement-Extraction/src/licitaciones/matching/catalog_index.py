@@ -0,0 +1,325 @@
+"""Índice en memoria del catálogo para matching determinístico.
+
+El catálogo se carga una sola vez (una consulta con JOIN) y se guarda en
+columnas NumPy armadas directamente de las tuplas de la consulta; el Producto
+de una fila solo se construye cuando el matcher lo devuelve. Los productos se
+indexan por (tension_nominal, regulador_diodos) con las filas ordenadas por
+corriente_nominal, de modo que "tensión exacta y corriente >= requerida" es un
+lookup en un dict más una búsqueda binaria. Los predicados de rango (flote, fondo, temperatura, IP,
+consumos, alimentación) se evalúan vectorizados sobre las columnas de los
+candidatos.
+
+CatalogSnapshot mantiene un CatalogIndex vigente y lo reconstruye cuando
+cambia la versión del catálogo (la misma señal que usa ProductoCache).
+"""
+
+import math
+import re
+import threading
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from licitaciones.db.connection import DatabaseConnection
+from licitaciones.domain.db_models import Producto
+from licitaciones.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Códigos numéricos de regulador_diodos (None = sin regulador por diodos)
+REGULADOR_CODES: dict[str | None, int] = {None: 0, "CS": 1, "CD": 2}
+
+# Cantidad de fases por prefijo del tipo de alimentación ("Trifásico", "trifásica", ...)
+FASES_POR_PREFIJO = {"mono": 1, "bi": 2, "tri": 3}
+
+CATALOG_QUERY = """
+    SELECT p.id, p.codigo, p.marca, p.modelo, p.tension_nominal, p.corriente_nominal,
+           p.regulador_diodos, p.origen, p.tipo,
+           e.tension_flote_min, e.tension_flote_max, e.tension_fondo_min, e.tension_fondo_max,
+           e.temperatura_maxima, e.temperatura_minima,
+           g.grado_proteccion,
+           s.maxima_corriente_consumos,
+           a.tipo, a.frecuencia
+    FROM productos p
+    LEFT JOIN especificaciones e ON e.producto_id = p.id
+    LEFT JOIN gabinete g ON g.producto_id = p.id
+    LEFT JOIN salida s ON s.producto_id = p.id
+    LEFT JOIN alimentacion a ON a.producto_id = p.id
+    WHERE p.eliminado_at IS NULL
+    ORDER BY p.id
+"""
+
+# Versión del catálogo: sync_catalog la incrementa en la misma sincronización
+# que escribe o elimina productos (ver db/catalog.py)
+CATALOG_VERSION_QUERY = "SELECT version FROM catalogo_version"
+
+# Columnas de CATALOG_QUERY: las del Producto y, después, las de matching
+_TENSION, _CORRIENTE, _REGULADOR = 4, 5, 6
+_FLOTE_MIN, _FLOTE_MAX, _FONDO_MIN, _FONDO_MAX = 9, 10, 11, 12
+_TEMP_MAX, _TEMP_MIN, _IP, _CONSUMOS, _ALIMENTACION, _FRECUENCIA = 13, 14, 15, 16, 17, 18
+
+_IP_PATTERN = re.compile(r"IP\s*([0-6X])\s*([0-9X])", re.IGNORECASE)
+
+
+def parse_ip_rating(value: str | None) -> tuple[float, float]:
+    """Parsea un grado de protección ("IP54", "IPX4") en (sólidos, líquidos).
+
+    Los dígitos ausentes o "X" se devuelven como NaN.
+    """
+    match = _IP_PATTERN.search(value or "")
+    if not match:
+        return math.nan, math.nan
+    return tuple(math.nan if d.upper() == "X" else float(d) for d in match.groups())
+
+
+def parse_fases(value: str | None) -> float:
+    """Cantidad de fases de un tipo de alimentación ("Trifásico" -> 3), o NaN."""
+    tipo = (value or "").strip().lower()
+    return next(
+        (float(fases) for prefijo, fases in FASES_POR_PREFIJO.items() if tipo.startswith(prefijo)),
+        math.nan,
+    )
+
+
+@dataclass
+class CatalogRecord:
+    """Producto del catálogo con los atributos usados para matching."""
+
+    producto: Producto
+    tension_flote_min: float | None = None
+    tension_flote_max: float | None = None
+    tension_fondo_min: float | None = None
+    tension_fondo_max: float | None = None
+    temperatura_maxima: float | None = None
+    temperatura_minima: float | None = None
+    grado_proteccion: str | None = None
+    maxima_corriente_consumos: float | None = None
+    alimentacion_tipo: str | None = None
+    frecuencia: float | None = None
+
+    def to_row(self) -> tuple:
+        """Fila con el formato de CATALOG_QUERY."""
+        p = self.producto
+        return (
+            p.id,
+            p.codigo,
+            p.marca,
+            p.modelo,
+            p.tension_nominal,
+            p.corriente_nominal,
+            p.regulador_diodos,
+            p.origen,
+            p.tipo,
+            self.tension_flote_min,
+            self.tension_flote_max,
+            self.tension_fondo_min,
+            self.tension_fondo_max,
+            self.temperatura_maxima,
+            self.temperatura_minima,
+            self.grado_proteccion,
+            self.maxima_corriente_consumos,
+            self.alimentacion_tipo,
+            self.frecuencia,
+        )
+
+
+def _producto(row: tuple) -> Producto:
+    return Producto(
+        id=row[0],
+        codigo=row[1],
+        marca=row[2],
+        modelo=row[3],
+        tension_nominal=row[4],
+        corriente_nominal=row[5],
+        regulador_diodos=row[6],
+        origen=row[7],
+        tipo=row[8],
+    )
+
+
+class _Productos(Sequence):
+    """Productos del índice, construidos a partir de su fila al primer acceso."""
+
+    def __init__(self, rows: Sequence[tuple], productos: list[Producto] | None = None) -> None:
+        self._rows = rows
+        self._productos: list[Producto | None] = productos or [None] * len(rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(len(self)))]
+        producto = self._productos[row]
+        if producto is None:
+            producto = self._productos[row] = _producto(self._rows[row])
+        return producto
+
+
+def _float_column(values: list) -> np.ndarray:
+    return np.array([math.nan if v is None else float(v) for v in values], dtype=np.float64)
+
+
+class CatalogIndex:
+    """Catálogo en columnas NumPy con un índice por tensión y regulador."""
+
+    def __init__(self, rows: Sequence[tuple], productos: list[Producto] | None = None) -> None:
+        """Construye el índice.
+
+        Args:
+            rows: Filas del catálogo con el formato de CATALOG_QUERY.
+            productos: Productos ya construidos de cada fila (default: se
+                construyen a partir de la fila cuando se piden).
+        """
+        self.productos = _Productos(rows, productos)
+        columns = list(zip(*rows, strict=True)) if rows else [()] * (_FRECUENCIA + 1)
+        self._row_by_id = {id_: row for row, id_ in enumerate(columns[0]) if id_ is not None}
+
+        self.tension = np.array(columns[_TENSION], dtype=np.int64)
+        self.corriente = _float_column(columns[_CORRIENTE])
+        self.regulador = np.array(
+            [REGULADOR_CODES.get(r, 0) for r in columns[_REGULADOR]], dtype=np.int8
+        )
+        self.flote_min = _float_column(columns[_FLOTE_MIN])
+        self.flote_max = _float_column(columns[_FLOTE_MAX])
+        self.fondo_min = _float_column(columns[_FONDO_MIN])
+        self.fondo_max = _float_column(columns[_FONDO_MAX])
+        self.temperatura_max = _float_column(columns[_TEMP_MAX])
+        self.temperatura_min = _float_column(columns[_TEMP_MIN])
+        ip = [parse_ip_rating(g) for g in columns[_IP]]
+        self.ip_solidos = _float_column([s for s, _ in ip])
+        self.ip_liquidos = _float_column([liq for _, liq in ip])
+        self.corriente_consumos = _float_column(columns[_CONSUMOS])
+        self.fases = _float_column([parse_fases(a) for a in columns[_ALIMENTACION]])
+        self.frecuencia = _float_column(columns[_FRECUENCIA])
+
+        # (tension, regulador) -> filas ordenadas por corriente, y sus corrientes
+        self._by_key: dict[tuple[int, int], tuple[np.ndarray, np.ndarray]] = {}
+        order = np.lexsort((self.corriente, self.regulador, self.tension))
+        keys = list(zip(self.tension[order].tolist(), self.regulador[order].tolist(), strict=True))
+        start = 0
+        for i in range(1, len(order) + 1):
+            if i == len(order) or keys[i] != keys[start]:
+                rows = order[start:i]
+                self._by_key[keys[start]] = (rows, self.corriente[rows])
+                start = i
+
+    @classmethod
+    def from_records(cls, records: list[CatalogRecord]) -> "CatalogIndex":
+        """Índice a partir de productos ya construidos con sus especificaciones."""
+        return cls([r.to_row() for r in records], [r.producto for r in records])
+
+    @classmethod
+    def from_productos(cls, productos: list[Producto]) -> "CatalogIndex":
+        """Índice a partir de productos sin especificaciones (solo tensión/corriente)."""
+        return cls.from_records([CatalogRecord(producto=p) for p in productos])
+
+    @classmethod
+    def load(cls, db: DatabaseConnection) -> "CatalogIndex":
+        """Carga el catálogo completo desde la base de datos en una sola consulta."""
+        with db.get_cursor() as cur:
+            cur.execute(CATALOG_QUERY)
+            rows = cur.fetchall()
+
+        logger.info("Catálogo indexado: %d productos", len(rows))
+        return cls(rows)
+
+    def __len__(self) -> int:
+        return len(self.productos)
+
+    def row_of(self, producto_id: int | None) -> int | None:
+        """Fila de un producto por id, o None si no está indexado."""
+        return self._row_by_id.get(producto_id)
+
+    def candidates(
+        self,
+        tension: int | None = None,
+        corriente_min: float | None = None,
+        reguladores: tuple[int, ...] | None = None,
+    ) -> np.ndarray:
+        """Filas que cumplen tensión exacta, corriente mínima y regulador.
+
+        Args:
+            tension: Tensión nominal requerida (None = cualquiera).
+            corriente_min: Corriente nominal mínima (None = cualquiera).
+            reguladores: Códigos de regulador aceptados (None = cualquiera).
+
+        Returns:
+            Índices de fila, ordenados por tensión, regulador y corriente.
+        """
+        allowed = reguladores if reguladores is not None else tuple(REGULADOR_CODES.values())
+        if tension is not None:
+            keys = [(tension, code) for code in allowed]
+        else:
+            keys = [key for key in self._by_key if key[1] in allowed]
+
+        parts = []
+        for key in keys:
+            entry = self._by_key.get(key)
+            if entry is None:
+                continue
+            rows, corrientes = entry
+            if corriente_min is not None:
+                rows = rows[np.searchsorted(corrientes, corriente_min, side="left") :]
+            parts.append(rows)
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+
+class CatalogSnapshot:
+    """CatalogIndex vigente, reconstruido cuando cambia la versión del catálogo.
+
+    La versión del catálogo se consulta como mucho una vez cada
+    `check_interval_seconds`; entre chequeos se reutiliza el índice en memoria.
+    Seguro para usar desde varios threads.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseConnection,
+        check_interval_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Inicializa el snapshot (el índice se carga en el primer uso).
+
+        Args:
+            db: Conexión a la base de datos.
+            check_interval_seconds: Segundos mínimos entre chequeos de versión.
+                0 chequea en cada uso.
+            clock: Reloj monotónico (inyectable para tests).
+        """
+        self._db = db
+        self._check_interval = check_interval_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._index: CatalogIndex | None = None
+        self._version: int | None = None
+        self._checked_at = -math.inf
+
+    def get(self) -> CatalogIndex:
+        """Devuelve el índice vigente, reconstruyéndolo si el catálogo cambió."""
+        with self._lock:
+            now = self._clock()
+            if self._index is not None and now - self._checked_at < self._check_interval:
+                return self._index
+
+            version = self._fetch_version()
+            self._checked_at = now
+            if self._index is None or version != self._version:
+                if self._index is not None:
+                    logger.info("Catálogo modificado, reconstruyendo índice")
+                self._index = CatalogIndex.load(self._db)
+                self._version = version
+            return self._index
+
+    def invalidate(self) -> None:
+        """Fuerza la reconstrucción del índice en el próximo uso."""
+        with self._lock:
+            self._index = None
+            self._version = None
+
+    def _fetch_version(self) -> int:
+        with self._db.get_cursor() as cur:
+            cur.execute(CATALOG_VERSION_QUERY)
+            return cur.fetchone()[0]
@@ -1,12 +1,45 @@
 """Matching de productos extraídos contra el catálogo.
 
-Este módulo es un placeholder para la lógica de matching futura.
+Matching determinístico basado en reglas, sin LLM: el catálogo se indexa una
+vez en memoria (ver CatalogIndex) y cada item se resuelve con un lookup por
+tensión/regulador, una búsqueda binaria por corriente y un score vectorizado
+sobre los candidatos. Los items con requisitos idénticos se resuelven una sola
+vez, así que una licitación de muchos items escala con los items distintos.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+import numpy as np
 
 from licitaciones.domain.db_models import Producto
-from licitaciones.domain.extraction_models import ItemLicitado
+from licitaciones.domain.extraction_models import (
+    ItemLicitado,
+    NumericRange,
+    SistemaCargadorRectificador,
+)
+from licitaciones.matching.catalog_index import (
+    REGULADOR_CODES,
+    CatalogIndex,
+    CatalogSnapshot,
+    parse_fases,
+    parse_ip_rating,
+)
+
+# Peso de cada criterio en el score. Solo cuentan los criterios que el item especifica.
+SCORE_WEIGHTS = {
+    "tension": 0.25,
+    "corriente": 0.20,
+    "regulador": 0.10,
+    "flote": 0.10,
+    "fondo": 0.10,
+    "consumos": 0.05,
+    "alimentacion": 0.05,
+    "temperatura": 0.10,
+    "ip": 0.05,
+}
+
+_CON_REGULADOR = (REGULADOR_CODES["CS"], REGULADOR_CODES["CD"])
+_SIN_REGULADOR = (REGULADOR_CODES[None],)
 
 
 @dataclass
@@ -17,79 +50,349 @@ class MatchResult:
     productos_coincidentes: list[Producto]
     score: float  # 0.0 - 1.0
     notas: str | None = None
+    scores: list[float] = field(default_factory=list)  # Uno por producto coincidente
 
 
-class ProductMatcher:
-    """Placeholder para lógica de matching de productos.
+def _range(value: NumericRange | None) -> tuple[float, float] | None:
+    return (float(value.min), float(value.max)) if value is not None else None
 
-    Esta clase será implementada en una futura iteración.
 
-    La lógica de matching deberá considerar:
-    - Tensión nominal (exacta o dentro de rango)
-    - Corriente nominal (igual o mayor a la requerida)
-    - Características técnicas compatibles
-    - Certificaciones y normas requeridas
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Posiciones de los k mayores scores, ordenadas por score descendente.
+
+    Usa argpartition para no ordenar todos los candidatos. Los empates se
+    resuelven por posición, igual que un argsort estable.
     """
+    if len(scores) <= k:
+        return np.argsort(-scores, kind="stable")
+    kth = scores[np.argpartition(-scores, k - 1)[k - 1]]
+    selected = np.flatnonzero(scores >= kth)
+    return selected[np.argsort(-scores[selected], kind="stable")][:k]
+
+
+@dataclass(frozen=True)
+class MatchRequirements:
+    """Requisitos de un item, combinando sus datos con las especificaciones comunes."""
+
+    tension: int | None = None
+    corriente: float | None = None
+    regulador_diodos: bool | None = None
+    flote: tuple[float, float] | None = None
+    fondo: tuple[float, float] | None = None
+    temperatura_max: float | None = None
+    temperatura_min: float | None = None
+    ip: tuple[float, float] | None = None
+    corriente_consumos: float | None = None
+    fases: float | None = None
+    frecuencia: float | None = None
+
+    @classmethod
+    def from_item(
+        cls,
+        item: ItemLicitado,
+        especificaciones_comunes: SistemaCargadorRectificador | None = None,
+    ) -> "MatchRequirements":
+        """Arma los requisitos; lo específico del item prevalece sobre lo común."""
+        comunes = especificaciones_comunes or SistemaCargadorRectificador()
+        salidas = [s for s in (item.salida, comunes.salida) if s is not None]
+
+        tension = next(
+            (s.tension_nominal_v for s in salidas if s.tension_nominal_v is not None), None
+        )
+        corriente = next(
+            (s.corriente_nominal_a for s in salidas if s.corriente_nominal_a is not None), None
+        )
+        if corriente is None:
+            # Salida ajustable: el producto debe poder entregar el máximo del rango
+            corriente = next(
+                (s.corriente_ajustable.max for s in salidas if s.corriente_ajustable), None
+            )
+        corriente_consumos = next(
+            (
+                s.maxima_corriente_consumos_a
+                for s in salidas
+                if s.maxima_corriente_consumos_a is not None
+            ),
+            None,
+        )
+
+        alimentaciones = [a for a in (item.alimentacion, comunes.alimentacion) if a is not None]
+        fases = next(
+            (parse_fases(a.tipo.value) for a in alimentaciones if a.tipo is not None), None
+        )
+        frecuencia = next(
+            (a.frecuencia_hz for a in alimentaciones if a.frecuencia_hz is not None), None
+        )
+
+        carga = comunes.carga_baterias
+        ambiente = comunes.condiciones_ambientales
+        grado_proteccion = comunes.gabinete.grado_proteccion if comunes.gabinete else None
+        ip = parse_ip_rating(grado_proteccion) if grado_proteccion else None
+
+        return cls(
+            tension=int(tension) if tension is not None else None,
+            corriente=float(corriente) if corriente is not None else None,
+            regulador_diodos=carga.regulador_diodos if carga else None,
+            flote=_range(carga.tension_flote) if carga else None,
+            fondo=_range(carga.tension_fondo) if carga else None,
+            temperatura_max=(
+                float(ambiente.temperatura_max_c)
+                if ambiente and ambiente.temperatura_max_c is not None
+                else None
+            ),
+            temperatura_min=(
+                float(ambiente.temperatura_min_c)
+                if ambiente and ambiente.temperatura_min_c is not None
+                else None
+            ),
+            ip=ip if ip and not all(np.isnan(ip)) else None,
+            corriente_consumos=(
+                float(corriente_consumos) if corriente_consumos is not None else None
+            ),
+            fases=fases if fases is not None and not np.isnan(fases) else None,
+            frecuencia=float(frecuencia) if frecuencia is not None else None,
+        )
+
+
+class ProductMatcher:
+    """Matching determinístico de items licitados contra un catálogo indexado.
+
+    Criterios:
+    - Tensión nominal exacta y regulador por diodos (filtros, vía índice).
+    - Corriente nominal igual o mayor a la requerida (filtro por búsqueda
+      binaria; el score prefiere la corriente más ajustada).
+    - Rangos de flote/fondo que contengan los requeridos, máxima corriente a
+      consumos, fases y frecuencia de alimentación, temperatura de operación
+      y grado IP (score).
+    """
+
+    def __init__(
+        self,
+        index: CatalogIndex | CatalogSnapshot | None = None,
+        top_k: int = 5,
+        min_score: float = 0.5,
+    ) -> None:
+        """Inicializa el matcher.
+
+        Args:
+            index: Catálogo indexado (ver CatalogIndex.load), o un CatalogSnapshot
+                para usar siempre la versión vigente del catálogo.
+            top_k: Máximo de productos coincidentes por item.
+            min_score: Score mínimo para considerar un producto coincidente.
+        """
+        self._index = index
+        self._top_k = top_k
+        self._min_score = min_score
 
     def match(
         self,
         extracted_items: list[ItemLicitado],
-        catalog: list[Producto],
+        catalog: list[Producto] | None = None,
+        especificaciones_comunes: SistemaCargadorRectificador | None = None,
     ) -> list[MatchResult]:
         """Encuentra productos del catálogo que coinciden con items licitados.
 
         Args:
             extracted_items: Lista de items extraídos de la licitación.
-            catalog: Lista de productos del catálogo.
+            catalog: Productos del catálogo. Si se omite, usa el índice del matcher.
+            especificaciones_comunes: Especificaciones comunes de la licitación.
 
         Returns:
-            Lista de resultados de matching.
-
-        Raises:
-            NotImplementedError: Esta funcionalidad aún no está implementada.
+            Lista de resultados de matching, uno por item y en el mismo orden.
         """
-        raise NotImplementedError(
-            "Matching logic pending implementation. This will be developed in a future iteration."
-        )
+        index = self._resolve_index(catalog)
+        # Items con los mismos requisitos comparten resultado (se resuelven una vez)
+        resolved: dict[MatchRequirements, MatchResult] = {}
+        results = []
+        for item in extracted_items:
+            requirements = MatchRequirements.from_item(item, especificaciones_comunes)
+            if requirements not in resolved:
+                resolved[requirements] = self._match_with_index(item, index, requirements)
+            shared = resolved[requirements]
+            results.append(
+                MatchResult(
+                    item_licitado=item,
+                    productos_coincidentes=list(shared.productos_coincidentes),
+                    score=shared.score,
+                    notas=shared.notas,
+                    scores=list(shared.scores),
+                )
+            )
+        return results
 
     def match_single(
         self,
         item: ItemLicitado,
-        catalog: list[Producto],
+        catalog: list[Producto] | None = None,
+        especificaciones_comunes: SistemaCargadorRectificador | None = None,
     ) -> MatchResult:
         """Encuentra productos que coinciden con un solo item.
 
         Args:
             item: Item a matchear.
-            catalog: Lista de productos del catálogo.
+            catalog: Productos del catálogo. Si se omite, usa el índice del matcher.
+            especificaciones_comunes: Especificaciones comunes de la licitación.
 
         Returns:
             Resultado de matching para el item.
-
-        Raises:
-            NotImplementedError: Esta funcionalidad aún no está implementada.
         """
-        raise NotImplementedError(
-            "Matching logic pending implementation. This will be developed in a future iteration."
-        )
+        requirements = MatchRequirements.from_item(item, especificaciones_comunes)
+        return self._match_with_index(item, self._resolve_index(catalog), requirements)
 
     def calculate_compatibility_score(
         self,
         item: ItemLicitado,
         producto: Producto,
+        especificaciones_comunes: SistemaCargadorRectificador | None = None,
     ) -> float:
         """Calcula un score de compatibilidad entre item y producto.
 
         Args:
             item: Item de la licitación.
             producto: Producto del catálogo.
+            especificaciones_comunes: Especificaciones comunes de la licitación.
 
         Returns:
             Score de 0.0 a 1.0 indicando compatibilidad.
+        """
+        requirements = MatchRequirements.from_item(item, especificaciones_comunes)
+        # Si el producto está en el índice se usan también sus especificaciones
+        index = self._current_index()
+        row = index.row_of(producto.id) if index is not None else None
+        if row is not None:
+            return float(self.score_rows(index, requirements, np.array([row]))[0])
+        index = CatalogIndex.from_productos([producto])
+        return float(self.score_rows(index, requirements, np.arange(1))[0])
 
-        Raises:
-            NotImplementedError: Esta funcionalidad aún no está implementada.
+    def score_rows(
+        self,
+        index: CatalogIndex,
+        requirements: MatchRequirements,
+        rows: np.ndarray,
+    ) -> np.ndarray:
+        """Score vectorizado de compatibilidad para varias filas del índice.
+
+        Un dato faltante en el catálogo cuenta como criterio no cumplido.
+
+        Args:
+            index: Catálogo indexado.
+            requirements: Requisitos del item.
+            rows: Filas del índice a evaluar.
+
+        Returns:
+            Array de scores entre 0.0 y 1.0, alineado con `rows`.
         """
-        raise NotImplementedError(
-            "Matching logic pending implementation. This will be developed in a future iteration."
+        total = np.zeros(len(rows), dtype=np.float64)
+        weight = 0.0
+
+        def add(criterion: str, satisfied: np.ndarray) -> None:
+            nonlocal total, weight
+            total += SCORE_WEIGHTS[criterion] * satisfied
+            weight += SCORE_WEIGHTS[criterion]
+
+        if requirements.tension is not None:
+            add("tension", index.tension[rows] == requirements.tension)
+
+        if requirements.corriente is not None:
+            corriente = index.corriente[rows]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ajuste = np.where(
+                    corriente >= requirements.corriente, requirements.corriente / corriente, 0.0
+                )
+            add("corriente", np.nan_to_num(ajuste))
+
+        if requirements.regulador_diodos is not None:
+            allowed = _CON_REGULADOR if requirements.regulador_diodos else _SIN_REGULADOR
+            add("regulador", np.isin(index.regulador[rows], allowed))
+
+        if requirements.flote is not None:
+            low, high = requirements.flote
+            add("flote", (index.flote_min[rows] <= low) & (index.flote_max[rows] >= high))
+
+        if requirements.fondo is not None:
+            low, high = requirements.fondo
+            add("fondo", (index.fondo_min[rows] <= low) & (index.fondo_max[rows] >= high))
+
+        if requirements.corriente_consumos is not None:
+            add("consumos", index.corriente_consumos[rows] >= requirements.corriente_consumos)
+
+        alimentacion = []
+        if requirements.fases is not None:
+            alimentacion.append(index.fases[rows] == requirements.fases)
+        if requirements.frecuencia is not None:
+            alimentacion.append(index.frecuencia[rows] == requirements.frecuencia)
+        if alimentacion:
+            add("alimentacion", np.mean(alimentacion, axis=0))
+
+        temperatura = []
+        if requirements.temperatura_max is not None:
+            temperatura.append(index.temperatura_max[rows] >= requirements.temperatura_max)
+        if requirements.temperatura_min is not None:
+            temperatura.append(index.temperatura_min[rows] <= requirements.temperatura_min)
+        if temperatura:
+            add("temperatura", np.mean(temperatura, axis=0))
+
+        if requirements.ip is not None:
+            solidos, liquidos = requirements.ip
+            ok = np.ones(len(rows), dtype=bool)
+            if not np.isnan(solidos):
+                ok &= index.ip_solidos[rows] >= solidos
+            if not np.isnan(liquidos):
+                ok &= index.ip_liquidos[rows] >= liquidos
+            add("ip", ok)
+
+        return total / weight if weight else total
+
+    def _current_index(self) -> CatalogIndex | None:
+        if isinstance(self._index, CatalogSnapshot):
+            return self._index.get()
+        return self._index
+
+    def _resolve_index(self, catalog: list[Producto] | None) -> CatalogIndex:
+        if catalog is not None:
+            return CatalogIndex.from_productos(catalog)
+        index = self._current_index()
+        if index is None:
+            raise ValueError("ProductMatcher sin catálogo: pasar `catalog` o un CatalogIndex")
+        return index
+
+    def _match_with_index(
+        self,
+        item: ItemLicitado,
+        index: CatalogIndex,
+        requirements: MatchRequirements,
+    ) -> MatchResult:
+        if requirements.tension is None and requirements.corriente is None:
+            return MatchResult(
+                item_licitado=item,
+                productos_coincidentes=[],
+                score=0.0,
+                notas="El item no especifica tensión ni corriente nominal",
+            )
+
+        reguladores = None
+        if requirements.regulador_diodos is not None:
+            reguladores = _CON_REGULADOR if requirements.regulador_diodos else _SIN_REGULADOR
+        rows = index.candidates(requirements.tension, requirements.corriente, reguladores)
+        if len(rows) == 0:
+            return MatchResult(
+                item_licitado=item,
+                productos_coincidentes=[],
+                score=0.0,
+                notas="Ningún producto cumple tensión, corriente y regulador requeridos",
+            )
+
+        scores = self.score_rows(index, requirements, rows)
+        keep = scores >= self._min_score
+        rows, scores = rows[keep], scores[keep]
+        # Score descendente; a igual score, el orden del índice (menor corriente)
+        order = _top_k(scores, self._top_k)
+
+        productos = [index.productos[i] for i in rows[order]]
+        return MatchResult(
+            item_licitado=item,
+            productos_coincidentes=productos,
+            score=float(scores[order[0]]) if len(order) else 0.0,
+            notas=None if productos else "Ningún candidato supera el score mínimo",
+            scores=[float(s) for s in scores[order]],
         )
@@ -1,34 +1,185 @@
+"""Generación de SQL de búsqueda con LLMs (generar, sanear y agregar scores).
+
+Cada documento JSON pasa por tres prompts en secuencia. Para no repetir
+llamadas, los resultados se memorizan por hash del JSON canonicalizado más el
+fingerprint de prompts y modelos, y los documentos no cacheados se procesan
+juntos con Runnable.batch/abatch (con tope de concurrencia): una licitación de
+N items tarda aproximadamente lo que un item, no N veces más.
+"""
+
+import json
+import re
+import threading
+from collections import OrderedDict
+
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import PromptTemplate
 from langchain_core.runnables import RunnableLambda
 from langchain_openai import ChatOpenAI
 
+from licitaciones.domain.services.sql_validator_service import SQLValidatorService
+from licitaciones.extraction.cache import sha256_text, stage_key
+from licitaciones.logger import get_logger
 from licitaciones.matching.prompts import (
     QUERY_GENERATOR_PROMPT,
     QUERY_SANITIZER_PROMPT,
     QUERY_SCORE_CALCULATOR_PROMPT,
 )
 
+logger = get_logger(__name__)
+
+# Lo que reescribe el sanitizer: comparaciones de texto (-> similarity) y
+# comparaciones exactas de temperatura/humedad (-> rangos)
+_SANITIZABLE = re.compile(
+    r"\bILIKE\b|=\s*'|\b(?:temperatura_maxima|temperatura_minima|humedad_relativa_max)\s*=",
+    re.IGNORECASE,
+)
+
+
+def canonical_json(document: dict | list) -> str:
+    """JSON con claves ordenadas y sin espacios: mismo contenido, mismo texto."""
+    return json.dumps(
+        document, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+    )
+
+
+def _model_name(llm) -> str:
+    return getattr(llm, "model_name", None) or type(llm).__name__
+
 
 class QueryGenerator:
-    def __init__(self, query_llm: ChatOpenAI, fast_llm: ChatOpenAI):
+    """Genera SQL de búsqueda con LLMs (generar, sanear y agregar scores)."""
+
+    def __init__(
+        self,
+        query_llm: ChatOpenAI,
+        fast_llm: ChatOpenAI,
+        max_concurrency: int = 8,
+        cache_size: int = 1024,
+    ) -> None:
+        """Inicializa el generador.
+
+        Args:
+            query_llm: Modelo para generar la query y agregar los scores.
+            fast_llm: Modelo para sanear la query.
+            max_concurrency: Documentos procesados en paralelo en un batch.
+            cache_size: Máximo de queries memorizadas.
+        """
         self.query_llm = query_llm
         self.fast_llm = fast_llm
+        self.validator = SQLValidatorService()
+        self._max_concurrency = max(1, max_concurrency)
+        self._cache_size = cache_size
+        self._cache: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
 
-        self.query_chain = (
+        self.generate_chain = (
             PromptTemplate.from_template(QUERY_GENERATOR_PROMPT)
             | self.query_llm
             | StrOutputParser()
-            | RunnableLambda(lambda x: {"query": x})
-            | PromptTemplate.from_template(QUERY_SANITIZER_PROMPT)
-            | self.fast_llm
-            | StrOutputParser()
-            | RunnableLambda(lambda x: {"query": x})
-            | PromptTemplate.from_template(QUERY_SCORE_CALCULATOR_PROMPT)
+        )
+        self.sanitize_chain = (
+            PromptTemplate.from_template(QUERY_SANITIZER_PROMPT) | self.fast_llm | StrOutputParser()
+        )
+        self.score_chain = (
+            PromptTemplate.from_template(QUERY_SCORE_CALCULATOR_PROMPT)
             | self.query_llm
             | StrOutputParser()
         )
+        # Un documento de punta a punta; el sanitizer solo corre si hace falta
+        self.query_chain = RunnableLambda(self._run_one, afunc=self._arun_one)
+
+    @property
+    def fingerprint(self) -> str:
+        """Identifica prompts y modelos; cambia cuando cambiaría la salida."""
+        prompts = sha256_text(
+            QUERY_GENERATOR_PROMPT + QUERY_SANITIZER_PROMPT + QUERY_SCORE_CALCULATOR_PROMPT
+        )[:16]
+        return f"{_model_name(self.query_llm)}:{_model_name(self.fast_llm)}:{prompts}"
 
     def generate_query(self, json_response: dict) -> str:
-        result = self.query_chain.invoke({"document_json": json_response})
-        return result.content
+        """Genera la query con scores para un documento JSON."""
+        return self.generate_queries([json_response])[0]
+
+    def generate_queries(self, documents: list[dict]) -> list[str]:
+        """Genera las queries de varios documentos, en el mismo orden.
+
+        Los documentos repetidos o ya memorizados no llaman al LLM; el resto se
+        procesa en un solo batch.
+        """
+        keys, queries, pending = self._split(documents)
+        if pending:
+            outputs = self.query_chain.batch(
+                list(pending.values()), config={"max_concurrency": self._max_concurrency}
+            )
+            queries.update(self._store(pending, outputs))
+        return [queries[key] for key in keys]
+
+    async def agenerate_queries(self, documents: list[dict]) -> list[str]:
+        """Versión async de generate_queries."""
+        keys, queries, pending = self._split(documents)
+        if pending:
+            outputs = await self.query_chain.abatch(
+                list(pending.values()), config={"max_concurrency": self._max_concurrency}
+            )
+            queries.update(self._store(pending, outputs))
+        return [queries[key] for key in keys]
+
+    def generate_item_queries(self, licitacion: dict) -> list[str]:
+        """Genera una query por item de una licitación (LicitacionCompleta como dict).
+
+        Cada item se envía junto con las especificaciones comunes, así que un
+        item ya visto (en esta u otra licitación con las mismas comunes) sale
+        de la caché.
+        """
+        comunes = licitacion.get("especificaciones_comunes")
+        documents = [
+            {"especificaciones_comunes": comunes, "item": item}
+            for item in licitacion.get("items", [])
+        ]
+        return self.generate_queries(documents)
+
+    def _key(self, document: dict) -> str:
+        return stage_key(sha256_text(canonical_json(document)), self.fingerprint)
+
+    def _split(self, documents: list[dict]) -> tuple[list[str], dict[str, str], dict[str, dict]]:
+        """Clave de cada documento, queries ya en caché y documentos únicos a generar."""
+        keys = [self._key(d) for d in documents]
+        cached: dict[str, str] = {}
+        pending: dict[str, dict] = {}
+        with self._lock:
+            for key, document in zip(keys, documents, strict=True):
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    cached[key] = self._cache[key]
+                elif key not in pending:
+                    pending[key] = document
+        if pending:
+            logger.info(
+                "Generando %d queries con LLM (%d en caché)", len(pending), len(keys) - len(pending)
+            )
+        return keys, cached, pending
+
+    def _store(self, pending: dict[str, dict], outputs: list[str]) -> dict[str, str]:
+        """Memoriza las queries generadas."""
+        fresh = dict(zip(pending, outputs, strict=True))
+        with self._lock:
+            self._cache.update(fresh)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return fresh
+
+    def _needs_sanitizing(self, query: str) -> bool:
+        return not self.validator.validar(query).es_valido or bool(_SANITIZABLE.search(query))
+
+    def _run_one(self, document: dict) -> str:
+        query = self.generate_chain.invoke({"json_input": canonical_json(document)})
+        if self._needs_sanitizing(query):
+            query = self.sanitize_chain.invoke({"query": query})
+        return self.score_chain.invoke({"query": query})
+
+    async def _arun_one(self, document: dict) -> str:
+        query = await self.generate_chain.ainvoke({"json_input": canonical_json(document)})
+        if self._needs_sanitizing(query):
+            query = await self.sanitize_chain.ainvoke({"query": query})
+        return await self.score_chain.ainvoke({"query": query})
@@ -0,0 +1,395 @@
+"""Pipeline de streaming: extracción → estructuración → matching → persistencia.
+
+Cada etapa corre en su propio thread y pasa resultados a la siguiente apenas
+los tiene, por colas acotadas:
+
+1. Extracción: calidad del PDF y texto raw (ExtractionPipeline.extract_raw_text).
+2. Estructuración: los chunks se estructuran en paralelo y sus items se
+   entregan en orden de documento (ExtractionPipeline.iter_structured).
+3. Matching: cada item contra el catálogo indexado (ProductMatcher).
+4. Persistencia: extracciones, items y matches se escriben en lotes, una
+   transacción por lote (ver db/extracciones.py).
+
+Así el matching del item 1 se solapa con la estructuración del item 2, el
+primer match llega sin esperar a la licitación completa, y con varios PDFs el
+throughput queda acotado por la etapa más lenta. Las colas acotadas frenan a
+las etapas rápidas en lugar de acumular resultados en memoria.
+
+Un item que aparece en más de un chunk se combina y se vuelve a emitir con el
+mismo `orden`; su match y su fila persistida se reemplazan. Cada extracción
+guarda además los segundos de cada etapa y hasta el primer match.
+"""
+
+import queue
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from licitaciones.db.connection import DatabaseConnection
+from licitaciones.db.extracciones import LoteResultados, guardar_lote
+from licitaciones.domain.extraction_models import (
+    ItemLicitado,
+    LicitacionCompleta,
+    SistemaCargadorRectificador,
+)
+from licitaciones.extraction.cache import sha256_file
+from licitaciones.extraction.chunked_structuring import (
+    item_key,
+    merge_licitaciones,
+    merge_models,
+)
+from licitaciones.extraction.extraction_pipeline import ExtractionPipeline
+from licitaciones.logger import get_logger
+from licitaciones.matching.matcher import MatchResult, ProductMatcher
+
+logger = get_logger(__name__)
+
+# Segundos entre chequeos de cancelación mientras una etapa espera una cola
+_POLL_SECONDS = 0.1
+
+# Fin del stream (lo emite la etapa de extracción y lo reenvía cada etapa)
+_FIN = object()
+
+
+@dataclass
+class StreamJob:
+    """Un PDF a procesar por el pipeline de streaming."""
+
+    pdf_path: Path
+    page_ranges: list[tuple[int, int]] | None = None
+    extraccion_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    licitacion_id: str | None = None  # Default: SHA-256 del PDF
+
+
+@dataclass
+class StreamResult:
+    """Resultado de un PDF procesado por el pipeline de streaming."""
+
+    extraccion_id: str
+    pdf_path: str
+    status: str = "running"  # "ok" o "error" al terminar
+    items: int = 0
+    matched_items: int = 0  # Items con al menos un producto coincidente
+    licitacion: LicitacionCompleta | None = None
+    error: str | None = None
+    seconds: float = 0.0
+    first_match_seconds: float | None = None  # Desde el inicio hasta el primer item matcheado
+    licitacion_id: str | None = None
+    etapas: dict[str, float] = field(default_factory=dict)  # Segundos por etapa
+
+
+@dataclass
+class _Inicio:
+    job: StreamJob
+    started: float
+    licitacion_id: str | None
+
+
+@dataclass
+class _TextoRaw:
+    job: StreamJob
+    raw_text: str
+    segundos: float
+
+
+@dataclass
+class _ItemExtraido:
+    job: StreamJob
+    orden: int
+    item: ItemLicitado
+    comunes: SistemaCargadorRectificador | None
+
+
+@dataclass
+class _ItemMatcheado:
+    job: StreamJob
+    orden: int
+    item: ItemLicitado
+    resultado: MatchResult
+
+
+@dataclass
+class _Fin:
+    job: StreamJob
+    licitacion: LicitacionCompleta | None = None
+    error: str | None = None
+    etapas: dict[str, float] = field(default_factory=dict)
+
+
+class _CanceladoError(Exception):
+    """Otra etapa falló: la etapa actual debe terminar."""
+
+
+class StreamingPipeline:
+    """Procesa PDFs de punta a punta con etapas concurrentes y colas acotadas."""
+
+    def __init__(
+        self,
+        extraction_pipeline: ExtractionPipeline,
+        matcher: ProductMatcher,
+        db: DatabaseConnection | None = None,
+        queue_size: int = 16,
+        persist_batch_size: int = 50,
+        persist_flush_seconds: float = 0.5,
+        on_progress: Callable[[StreamResult], None] | None = None,
+    ) -> None:
+        """Inicializa el pipeline.
+
+        Args:
+            extraction_pipeline: Pipeline de extracción (calidad, texto raw y estructuración).
+            matcher: Matcher de items contra el catálogo.
+            db: Conexión para persistir resultados. Si es None, no se persiste.
+            queue_size: Capacidad de cada cola entre etapas.
+            persist_batch_size: Filas pendientes que fuerzan escribir un lote.
+            persist_flush_seconds: Espera máxima de una fila pendiente antes de escribirla.
+            on_progress: Se llama desde la etapa de persistencia con el resultado
+                parcial del PDF cada vez que se matchea un item (puede no estar
+                escrito todavía).
+        """
+        self._extraction_pipeline = extraction_pipeline
+        self._matcher = matcher
+        self._db = db
+        self._queue_size = max(1, queue_size)
+        self._persist_batch_size = max(1, persist_batch_size)
+        self._persist_flush_seconds = persist_flush_seconds
+        self._on_progress = on_progress
+        self._cancelado = threading.Event()
+        self._error: BaseException | None = None
+
+    def run(self, jobs: Iterable[StreamJob]) -> list[StreamResult]:
+        """Procesa los PDFs y devuelve un resultado por PDF, en el orden de `jobs`.
+
+        Los errores de un PDF (calidad, LLM, matching) quedan en su resultado y
+        no detienen a los demás; un error de persistencia detiene el pipeline.
+
+        Raises:
+            Exception: El error que detuvo el pipeline, si lo hubo.
+        """
+        self._cancelado.clear()
+        self._error = None
+        textos: queue.Queue = queue.Queue(self._queue_size)
+        items: queue.Queue = queue.Queue(self._queue_size)
+        matcheados: queue.Queue = queue.Queue(self._queue_size)
+        resultados: dict[str, StreamResult] = {}
+
+        etapas = [
+            threading.Thread(target=self._etapa, args=(self._extraer, list(jobs), textos)),
+            threading.Thread(target=self._etapa, args=(self._estructurar, textos, items)),
+            threading.Thread(target=self._etapa, args=(self._matchear, items, matcheados)),
+            threading.Thread(target=self._etapa, args=(self._persistir, matcheados, resultados)),
+        ]
+        for etapa in etapas:
+            etapa.start()
+        for etapa in etapas:
+            etapa.join()
+
+        if self._error is not None:
+            raise self._error
+        return list(resultados.values())
+
+    def _etapa(self, funcion, entrada, salida) -> None:
+        """Corre una etapa; si falla, cancela a las demás."""
+        try:
+            funcion(entrada, salida)
+        except _CanceladoError:
+            pass
+        except BaseException as e:
+            logger.exception("Pipeline de streaming detenido")
+            self._error = e
+            self._cancelado.set()
+
+    def _put(self, cola: queue.Queue, mensaje) -> None:
+        while True:
+            if self._cancelado.is_set():
+                raise _CanceladoError
+            try:
+                cola.put(mensaje, timeout=_POLL_SECONDS)
+                return
+            except queue.Full:
+                continue
+
+    def _get(self, cola: queue.Queue, timeout: float | None = None):
+        """Siguiente mensaje de la cola, o None si pasa `timeout` sin mensajes."""
+        limite = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self._cancelado.is_set():
+                raise _CanceladoError
+            espera = _POLL_SECONDS
+            if limite is not None:
+                espera = min(espera, limite - time.monotonic())
+                if espera <= 0:
+                    return None
+            try:
+                return cola.get(timeout=espera)
+            except queue.Empty:
+                continue
+
+    def _mensajes(self, cola: queue.Queue):
+        """Mensajes de la cola hasta el fin del stream."""
+        while (mensaje := self._get(cola)) is not _FIN:
+            yield mensaje
+
+    # Etapa 1
+    def _extraer(self, jobs: list[StreamJob], salida: queue.Queue) -> None:
+        for job in jobs:
+            inicio = time.monotonic()
+            try:
+                licitacion_id = job.licitacion_id or sha256_file(job.pdf_path)
+            except OSError:
+                licitacion_id = None  # El error se reporta al extraer
+            self._put(salida, _Inicio(job, inicio, licitacion_id))
+            try:
+                raw_text = self._extraction_pipeline.extract_raw_text(job.pdf_path, job.page_ranges)
+            except Exception as e:
+                logger.error("Error extrayendo %s: %s", job.pdf_path, e)
+                etapas = {"extraccion": time.monotonic() - inicio}
+                self._put(salida, _Fin(job, error=str(e), etapas=etapas))
+                continue
+            self._put(salida, _TextoRaw(job, raw_text, time.monotonic() - inicio))
+        self._put(salida, _FIN)
+
+    # Etapa 2
+    def _estructurar(self, entrada: queue.Queue, salida: queue.Queue) -> None:
+        for mensaje in self._mensajes(entrada):
+            if not isinstance(mensaje, _TextoRaw):
+                self._put(salida, mensaje)
+                continue
+            inicio = time.monotonic()
+            licitacion, error = None, None
+            try:
+                licitacion = self._emitir_items(mensaje, salida)
+            except _CanceladoError:
+                raise
+            except Exception as e:
+                logger.error("Error estructurando %s: %s", mensaje.job.pdf_path, e)
+                error = str(e)
+            # Incluye la espera cuando el matching no da abasto (cola llena)
+            etapas = {"extraccion": mensaje.segundos, "estructuracion": time.monotonic() - inicio}
+            self._put(salida, _Fin(mensaje.job, licitacion, error, etapas))
+        self._put(salida, _FIN)
+
+    def _emitir_items(self, mensaje: _TextoRaw, salida: queue.Queue) -> LicitacionCompleta:
+        """Emite los items de cada parte estructurada y devuelve la licitación combinada."""
+        partes: list[LicitacionCompleta] = []
+        comunes: SistemaCargadorRectificador | None = None
+        vistos: dict[tuple, tuple[int, ItemLicitado]] = {}
+        for parte in self._extraction_pipeline.iter_structured(mensaje.raw_text):
+            partes.append(parte)
+            comunes = merge_models(comunes, parte.especificaciones_comunes)
+            for item in parte.items:
+                clave = item_key(item)
+                orden, anterior = vistos.get(clave, (len(vistos), None))
+                item = merge_models(anterior, item)
+                vistos[clave] = (orden, item)
+                self._put(salida, _ItemExtraido(mensaje.job, orden, item, comunes))
+        return partes[0] if len(partes) == 1 else merge_licitaciones(partes)
+
+    # Etapa 3
+    def _matchear(self, entrada: queue.Queue, salida: queue.Queue) -> None:
+        fallidos: set[str] = set()  # Extracciones con un error de matching
+        segundos: dict[str, float] = {}  # Tiempo de matching acumulado por extracción
+        for mensaje in self._mensajes(entrada):
+            extraccion_id = mensaje.job.extraccion_id
+            if extraccion_id in fallidos:
+                continue
+            if isinstance(mensaje, _Fin):
+                mensaje.etapas["matching"] = segundos.pop(extraccion_id, 0.0)
+            if not isinstance(mensaje, _ItemExtraido):
+                self._put(salida, mensaje)
+                continue
+            inicio = time.monotonic()
+            try:
+                resultado = self._matcher.match_single(
+                    mensaje.item, especificaciones_comunes=mensaje.comunes
+                )
+            except Exception as e:
+                logger.error("Error en matching de %s: %s", mensaje.job.pdf_path, e)
+                fallidos.add(extraccion_id)
+                self._put(salida, _Fin(mensaje.job, error=f"Matching: {e}"))
+                continue
+            segundos[extraccion_id] = segundos.get(extraccion_id, 0.0) + time.monotonic() - inicio
+            self._put(salida, _ItemMatcheado(mensaje.job, mensaje.orden, mensaje.item, resultado))
+        self._put(salida, _FIN)
+
+    # Etapa 4
+    def _persistir(self, entrada: queue.Queue, resultados: dict[str, StreamResult]) -> None:
+        lote = LoteResultados()
+        pendiente_desde: float | None = None
+        inicios: dict[str, float] = {}
+        matcheados: dict[str, set[int]] = {}
+
+        while True:
+            timeout = None
+            if pendiente_desde is not None:
+                timeout = pendiente_desde + self._persist_flush_seconds - time.monotonic()
+            mensaje = self._get(entrada, timeout=max(0.0, timeout) if timeout is not None else None)
+
+            if mensaje is None or mensaje is _FIN:
+                self._escribir(lote)
+                lote, pendiente_desde = LoteResultados(), None
+                if mensaje is _FIN:
+                    return
+                continue
+
+            job = mensaje.job
+            resultado = resultados.get(job.extraccion_id)
+            if isinstance(mensaje, _Inicio):
+                inicios[job.extraccion_id] = mensaje.started
+                resultados[job.extraccion_id] = StreamResult(
+                    job.extraccion_id, str(job.pdf_path), licitacion_id=mensaje.licitacion_id
+                )
+                lote.agregar_extraccion(
+                    job.extraccion_id, str(job.pdf_path), job.page_ranges, mensaje.licitacion_id
+                )
+            elif isinstance(mensaje, _ItemMatcheado):
+                lote.agregar_item(job.extraccion_id, mensaje.orden, mensaje.item, mensaje.resultado)
+                con_match = matcheados.setdefault(job.extraccion_id, set())
+                if mensaje.resultado.productos_coincidentes:
+                    con_match.add(mensaje.orden)
+                else:
+                    con_match.discard(mensaje.orden)
+                resultado.items = max(resultado.items, mensaje.orden + 1)
+                resultado.matched_items = len(con_match)
+                if resultado.first_match_seconds is None:
+                    resultado.first_match_seconds = time.monotonic() - inicios[job.extraccion_id]
+                    logger.info(
+                        "Primer item matcheado de %s a los %.1fs",
+                        job.pdf_path,
+                        resultado.first_match_seconds,
+                    )
+                if self._on_progress is not None:
+                    self._on_progress(resultado)
+            elif isinstance(mensaje, _Fin):
+                resultado.status = "error" if mensaje.error else "ok"
+                resultado.error = mensaje.error
+                resultado.licitacion = mensaje.licitacion
+                if mensaje.licitacion is not None:
+                    resultado.items = len(mensaje.licitacion.items)
+                resultado.seconds = time.monotonic() - inicios[job.extraccion_id]
+                resultado.etapas = dict(mensaje.etapas, total=resultado.seconds)
+                if resultado.first_match_seconds is not None:
+                    resultado.etapas["primer_match"] = resultado.first_match_seconds
+                lote.finalizar_extraccion(
+                    job.extraccion_id, mensaje.licitacion, mensaje.error, resultado.etapas
+                )
+                logger.info(
+                    "%s: %s, %d items (%d con match) en %.1fs",
+                    job.pdf_path,
+                    resultado.status,
+                    resultado.items,
+                    resultado.matched_items,
+                    resultado.seconds,
+                )
+
+            if pendiente_desde is None:
+                pendiente_desde = time.monotonic()
+            if len(lote) >= self._persist_batch_size:
+                self._escribir(lote)
+                lote, pendiente_desde = LoteResultados(), None
+
+    def _escribir(self, lote: LoteResultados) -> None:
+        if self._db is not None and len(lote):
+            guardar_lote(self._db, lote)
@@ -0,0 +1,161 @@
+"""Tests para la cola de jobs de la API y sus respuestas."""
+
+import asyncio
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from licitaciones.api.jobs import ColaLlenaError, JobQueue
+from licitaciones.api.schemas import evento_sse, registro_extraccion, resultados_matching
+from licitaciones.db.extracciones import (
+    ExtraccionDetalle,
+    ExtraccionResumen,
+    ItemConMatches,
+    ProductoCoincidente,
+)
+from licitaciones.streaming import StreamResult
+
+
+class FakePipeline:
+    """Reporta un item de progreso y termina (o falla si el PDF se llama error.pdf)."""
+
+    def __init__(self, on_progress, liberar: threading.Event | None = None) -> None:
+        self.on_progress = on_progress
+        self.liberar = liberar
+
+    def run(self, jobs):
+        (job,) = jobs
+        if self.liberar is not None:
+            self.liberar.wait(timeout=5)
+        resultado = StreamResult(job.extraccion_id, str(job.pdf_path), items=1, matched_items=1)
+        self.on_progress(resultado)
+        if job.pdf_path.name == "error.pdf":
+            resultado.status, resultado.error = "error", "PDF ilegible"
+        else:
+            resultado.status = "ok"
+        return [resultado]
+
+
+def _esperar_fin(cola: JobQueue, job_id: str) -> list[dict]:
+    eventos: list[dict] = []
+    while not eventos or eventos[-1]["tipo"] not in ("completado", "error"):
+        eventos += cola.eventos(job_id, len(eventos), timeout=5)
+    return eventos
+
+
+class TestJobQueue:
+    """Tests para JobQueue."""
+
+    def test_submit_returns_immediately_and_streams_progress(self, tmp_path: Path) -> None:
+        liberar = threading.Event()
+        cola = JobQueue(lambda on_progress: FakePipeline(on_progress, liberar))
+        (tmp_path / "subida").mkdir()
+        pdf = tmp_path / "subida" / "a.pdf"
+        pdf.write_bytes(b"%PDF")
+
+        job = cola.enviar(pdf, borrar=pdf.parent)
+        assert job.estado in ("en_cola", "en_curso")
+        liberar.set()
+        eventos = _esperar_fin(cola, job.id)
+        cola.close()
+
+        assert [e["tipo"] for e in eventos] == ["en_cola", "procesando", "progreso", "completado"]
+        assert eventos[-1]["matched_items"] == 1
+        assert cola.obtener(job.id).estado == "ok"
+        assert not pdf.parent.exists()
+
+    def test_async_wait_is_woken_by_new_events(self, tmp_path: Path) -> None:
+        liberar = threading.Event()
+        cola = JobQueue(lambda on_progress: FakePipeline(on_progress, liberar))
+        job = cola.enviar(tmp_path / "a.pdf")
+        assert cola.eventos(job.id, 1, timeout=5)  # "procesando"
+
+        async def esperar() -> list[dict]:
+            threading.Timer(0.05, liberar.set).start()
+            return await cola.eventos_async(job.id, 2, timeout=5)
+
+        eventos = asyncio.run(esperar())
+        cola.close()
+
+        assert eventos[0]["tipo"] == "progreso"
+        assert asyncio.run(cola.eventos_async("no-existe")) is None
+
+    def test_close_cancels_queued_jobs_and_removes_their_files(self, tmp_path: Path) -> None:
+        liberar = threading.Event()
+        cola = JobQueue(lambda on_progress: FakePipeline(on_progress, liberar), max_workers=1)
+        primero = cola.enviar(tmp_path / "a.pdf")
+        assert cola.eventos(primero.id, 1, timeout=5)  # Ocupa el único worker
+        pdf = tmp_path / "b.pdf"
+        pdf.write_bytes(b"%PDF")
+        en_cola = cola.enviar(pdf, borrar=pdf)
+
+        threading.Timer(0.2, liberar.set).start()
+        cola.close()
+
+        assert cola.obtener(primero.id).estado == "ok"
+        assert cola.obtener(en_cola.id).estado == "error"
+        assert cola.obtener(en_cola.id).eventos[-1]["tipo"] == "error"
+        assert not pdf.exists()
+
+    def test_failed_job_reports_error(self, tmp_path: Path) -> None:
+        cola = JobQueue(FakePipeline)
+
+        job = cola.enviar(tmp_path / "error.pdf")
+        eventos = _esperar_fin(cola, job.id)
+        cola.close()
+
+        assert eventos[-1] == {
+            "tipo": "error",
+            "items": 1,
+            "matched_items": 1,
+            "error": "PDF ilegible",
+        }
+
+    def test_rejects_when_too_many_pending(self, tmp_path: Path) -> None:
+        liberar = threading.Event()
+        cola = JobQueue(
+            lambda on_progress: FakePipeline(on_progress, liberar), max_workers=1, max_pending=1
+        )
+        primero = cola.enviar(tmp_path / "a.pdf")
+        # Espera a que ocupe el único worker ("procesando")
+        assert cola.eventos(primero.id, 1, timeout=5)
+        cola.enviar(tmp_path / "b.pdf")
+
+        with pytest.raises(ColaLlenaError):
+            cola.enviar(tmp_path / "c.pdf")
+        liberar.set()
+        cola.close()
+
+    def test_unknown_job(self) -> None:
+        cola = JobQueue(FakePipeline)
+        assert cola.eventos("no-existe", timeout=0) is None
+        cola.close()
+
+
+class TestSchemas:
+    """Tests para las respuestas con las formas del frontend."""
+
+    def test_match_results_use_percent_scores(self) -> None:
+        resumen = ExtraccionResumen(
+            "x", "abc", "/uploads/x/licitacion.pdf", None, "ok", None, 1, datetime(2026, 1, 1), None
+        )
+        producto = ProductoCoincidente(30, "110-30-CS", "SERVELEC", "RDT", 110, 30, "CS", 0.875)
+        detalle = ExtraccionDetalle(
+            resumen, None, [ItemConMatches(0, {"numero_item": 1}, 0.875, None, [producto])], {}
+        )
+
+        registro = registro_extraccion(resumen, detalle)
+        (resultado,) = resultados_matching(detalle)
+
+        assert registro["filename"] == "licitacion.pdf"
+        assert registro["status"] == "completed"
+        assert registro["result"]["items"] == [{"numero_item": 1}]
+        assert resultado["bestScore"] == 87.5
+        assert resultado["productos"][0]["score"] == 87.5
+
+    def test_sse_event(self) -> None:
+        assert evento_sse({"tipo": "progreso", "items": 2}) == (
+            'event: progreso\ndata: {"tipo": "progreso", "items": 2}\n\n'
+        )
@@ -0,0 +1,86 @@
+"""Tests para el procesamiento batch de PDFs."""
+
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from licitaciones.batch import BatchRunner, build_jobs
+from licitaciones.domain.extraction_models import ItemLicitado, LicitacionCompleta
+from licitaciones.streaming import StreamResult
+
+
+class FakePipeline:
+    """StreamingPipeline falso; el nombre del PDF define su comportamiento.
+
+    'bad*' termina con error, 'slow*' tarda y 'interrupt*' interrumpe el batch.
+    """
+
+    def __init__(self) -> None:
+        self.processed: list[Path] = []
+
+    def run(self, jobs) -> list[StreamResult]:
+        (job,) = jobs
+        if job.pdf_path.name.startswith("interrupt"):
+            raise KeyboardInterrupt
+        if job.pdf_path.name.startswith("slow"):
+            time.sleep(0.2)
+        self.processed.append(job.pdf_path)
+        result = StreamResult(job.extraccion_id, str(job.pdf_path))
+        if job.pdf_path.name.startswith("bad"):
+            result.status, result.error = "error", "PDF corrupto"
+        else:
+            result.status, result.items, result.matched_items = "ok", 1, 1
+            result.licitacion = LicitacionCompleta(
+                items=[ItemLicitado(numero_item=1, descripcion="rectificador")]
+            )
+        return [result]
+
+
+class TestBatchRunner:
+    """Tests para BatchRunner."""
+
+    def test_build_jobs_disambiguates_names(self, tmp_path) -> None:
+        """PDFs con el mismo nombre en distintos directorios no se pisan."""
+        jobs = build_jobs(
+            [(Path("a/doc.pdf"), None), (Path("b/doc.pdf"), [(1, 3)])],
+            tmp_path,
+        )
+
+        assert [job.output_path.name for job in jobs] == ["doc.json", "doc_2.json"]
+        assert jobs[1].page_ranges == [(1, 3)]
+
+    def test_errors_are_isolated_and_resume_skips_done(self, tmp_path) -> None:
+        """Un PDF con error no frena el batch y se reintenta al retomar."""
+        pdfs = [(tmp_path / name, None) for name in ("ok.pdf", "bad.pdf")]
+        jobs = build_jobs(pdfs, tmp_path / "out")
+        summary_path = tmp_path / "out" / "summary.json"
+
+        pipeline = FakePipeline()
+        results = BatchRunner(lambda: pipeline, max_workers=2).run(jobs, summary_path)
+
+        assert [r.status for r in results] == ["ok", "error"]
+        assert results[0].matched_items == 1
+        assert results[1].error == "PDF corrupto"
+        assert json.loads(summary_path.read_text())["error"] == 1
+
+        rerun = FakePipeline()
+        results = BatchRunner(lambda: rerun, max_workers=2).run(jobs, summary_path)
+
+        assert [r.status for r in results] == ["skipped", "error"]
+        assert rerun.processed == [tmp_path / "bad.pdf"]
+
+    def test_interrupt_waits_for_running_pdfs(self, tmp_path) -> None:
+        """Una interrupción espera los PDFs en curso antes de volver."""
+        pdfs = [(tmp_path / name, None) for name in ("slow.pdf", "interrupt.pdf", "next.pdf")]
+        jobs = build_jobs(pdfs, tmp_path / "out")
+        summary_path = tmp_path / "out" / "summary.json"
+
+        pipeline = FakePipeline()
+        with pytest.raises(KeyboardInterrupt):
+            BatchRunner(lambda: pipeline, max_workers=2).run(jobs, summary_path)
+
+        assert tmp_path / "slow.pdf" in pipeline.processed
+        summary = json.loads(summary_path.read_text())
+        assert summary["ok"] == len(pipeline.processed)
@@ -0,0 +1,231 @@
+"""Tests para la carga y sincronización del catálogo desde CSV."""
+
+import json
+import shutil
+from contextlib import contextmanager
+
+import pytest
+
+from licitaciones.db import catalog
+from licitaciones.db.catalog import (
+    CATALOG_GLOB,
+    DEFAULT_CATALOG_DIR,
+    marcar_eliminados,
+    procesar_csv,
+    sync_catalog,
+    transformar_csv,
+    transponer_csv,
+    upsert_tablas,
+)
+
+
+@pytest.fixture(scope="module")
+def tablas() -> dict:
+    return transformar_csv(transponer_csv(DEFAULT_CATALOG_DIR / "RDT_productos.csv"))
+
+
+class TestTransformarCsv:
+    """Tests para transponer_csv y transformar_csv."""
+
+    def test_one_row_per_product_in_every_table(self, tablas) -> None:
+        assert list(tablas) == [
+            "productos",
+            "especificaciones",
+            "alimentacion",
+            "salida",
+            "gabinete",
+            "aparatos_medida",
+            "accesorios",
+            "garantia",
+        ]
+        codigos = tablas["productos"]["codigo"].tolist()
+        assert len(codigos) == len(set(codigos)) > 0
+        for df in tablas.values():
+            assert df["codigo"].tolist() == codigos
+
+    def test_product_columns_are_parsed(self, tablas) -> None:
+        productos = tablas["productos"].set_index("codigo")
+
+        assert productos.loc["RDT-110-15", "tension_nominal"] == 110
+        assert productos.loc["RDT-110-15", "corriente_nominal"] == 15
+        assert productos.loc["RDT-110-15", "regulador_diodos"] is None
+        assert productos.loc["RDT-110-15-CS", "regulador_diodos"] == "CS"
+        assert productos.loc["RDT-110-15-CD", "regulador_diodos"] == "CD"
+
+    def test_numbers_ranges_and_dimensions_are_extracted(self, tablas) -> None:
+        especificaciones = tablas["especificaciones"].set_index("codigo").loc["RDT-110-15"]
+        gabinete = tablas["gabinete"].set_index("codigo").loc["RDT-110-15"]
+
+        assert (especificaciones["tension_flote_min"], especificaciones["tension_flote_max"]) == (
+            55.0,
+            143.0,
+        )
+        assert (gabinete["ancho"], gabinete["alto"], gabinete["profundidad"]) == (640, 1000, 640)
+        assert tablas["alimentacion"]["frecuencia"].iloc[0] == 50.0
+        assert tablas["garantia"]["meses"].iloc[0] == 24
+
+    def test_measurements_are_serialized_as_json(self, tablas) -> None:
+        medicion = tablas["aparatos_medida"]["medicion"].iloc[0]
+
+        assert medicion is None or isinstance(json.loads(medicion), dict)
+
+
+class FakeExecuteValues:
+    """Registra los INSERT y devuelve ids para los productos nuevos."""
+
+    def __init__(self, existentes: set[str]) -> None:
+        self.existentes = existentes
+        self.sentencias: list[tuple[str, list[tuple]]] = []
+
+    def __call__(self, cur, sql, filas, page_size=100, fetch=False):
+        self.sentencias.append((sql, filas))
+        if fetch:
+            return [
+                (1000 + i, fila[0])
+                for i, fila in enumerate(filas)
+                if fila[0] not in self.existentes
+            ]
+        return None
+
+
+class TestUpsertTablas:
+    """Tests para upsert_tablas."""
+
+    def test_one_upsert_per_table_linked_by_returned_ids(self, tablas, monkeypatch) -> None:
+        fake = FakeExecuteValues(set())
+        monkeypatch.setattr(catalog, "execute_values", fake)
+
+        escritos = upsert_tablas(object(), tablas)
+
+        assert escritos == len(tablas["productos"])
+        assert len(fake.sentencias) == len(tablas)
+        assert "ON CONFLICT (codigo) DO UPDATE" in fake.sentencias[0][0]
+        assert "eliminado_at = NULL" in fake.sentencias[0][0]
+        for sql, filas in fake.sentencias[1:]:
+            assert "ON CONFLICT (producto_id) DO UPDATE" in sql
+            assert sql.split("(")[1].startswith("producto_id")
+            assert len(filas) == escritos
+            assert all(isinstance(fila[0], int) for fila in filas)
+
+
+class FakeCatalogDB:
+    """Simula la BD: hashes vigentes por código y registro de sentencias."""
+
+    def __init__(self, hashes: dict[str, str]) -> None:
+        self.hashes = hashes
+        self.sentencias: list[tuple[str, tuple]] = []
+        self.version = 0
+
+    @contextmanager
+    def get_cursor(self):
+        db = self
+
+        class Cursor:
+            def execute(self, sql: str, params: tuple = ()) -> None:
+                db.sentencias.append((sql, params))
+                self.sql, self.params = sql, params
+
+            def fetchall(self) -> list[tuple]:
+                if self.sql.startswith("SELECT"):
+                    return [(c, h) for c, h in db.hashes.items() if c in self.params[0]]
+                vigentes = set(self.params[0])
+                return [(c,) for c in db.hashes if c not in vigentes]
+
+            def fetchone(self) -> tuple:
+                if self.sql.startswith("SELECT count"):
+                    vigentes = set(self.params[0])
+                    return (len(db.hashes), sum(c not in vigentes for c in db.hashes))
+                db.version += 1
+                return (db.version,)
+
+        yield Cursor()
+
+
+def _hashes(archivo) -> dict[str, str]:
+    productos = transformar_csv(transponer_csv(archivo))["productos"]
+    return dict(zip(productos["codigo"], productos["hash_origen"], strict=True))
+
+
+class TestSincronizacion:
+    """Tests para la sincronización incremental."""
+
+    def test_hash_changes_only_for_the_edited_product(self, tmp_path) -> None:
+        archivo = tmp_path / "RDT_productos.csv"
+        shutil.copy(DEFAULT_CATALOG_DIR / "RDT_productos.csv", archivo)
+        antes = _hashes(archivo)
+
+        contenido = archivo.read_text(encoding="utf-8")
+        archivo.write_text(contenido.replace(",24,", ",36,", 1), encoding="utf-8")
+        despues = _hashes(archivo)
+
+        assert antes.keys() == despues.keys()
+        assert sum(antes[c] != despues[c] for c in antes) == 1
+
+    def test_unchanged_products_are_not_written(self, monkeypatch) -> None:
+        archivo = DEFAULT_CATALOG_DIR / "RCMI_productos.csv"
+        fake = FakeExecuteValues(set())
+        monkeypatch.setattr(catalog, "execute_values", fake)
+        hashes = _hashes(archivo)
+        cambiado = next(iter(hashes))
+        hashes[cambiado] = "0" * 64
+
+        resultado = procesar_csv(archivo, FakeCatalogDB(hashes))
+
+        assert (resultado.nuevos, resultado.actualizados) == (0, 1)
+        assert resultado.sin_cambios == len(hashes) - 1
+        assert [len(filas) for _, filas in fake.sentencias] == [1] * 8
+        assert fake.sentencias[0][1][0][0] == cambiado
+
+    def test_missing_products_are_tombstoned(self, monkeypatch) -> None:
+        monkeypatch.setattr(catalog, "execute_values", FakeExecuteValues(set()))
+        hashes = {}
+        for archivo in DEFAULT_CATALOG_DIR.glob(CATALOG_GLOB):
+            hashes.update(_hashes(archivo))
+        hashes["RDT-999-1"] = "f" * 64
+        db = FakeCatalogDB(hashes)
+
+        resultado = sync_catalog(db)
+
+        assert resultado.escritos == 0
+        assert resultado.eliminados == 1
+        assert db.sentencias[-2][0].startswith("UPDATE productos SET eliminado_at")
+        assert db.version == 1
+
+    def test_parallel_sync_matches_sequential(self, monkeypatch) -> None:
+        """Los archivos se transforman en procesos y se escriben por separado."""
+        monkeypatch.setattr(catalog, "execute_values", FakeExecuteValues(set()))
+
+        secuencial = sync_catalog(FakeCatalogDB({}), max_workers=1)
+        paralelo = sync_catalog(FakeCatalogDB({}), max_workers=3)
+
+        assert paralelo.nuevos == secuencial.nuevos == len(secuencial.codigos) > 0
+        assert paralelo.codigos == secuencial.codigos
+        assert paralelo.segundos_transformacion > 0
+
+    def test_shrunken_catalog_skips_tombstones(self, tmp_path, monkeypatch) -> None:
+        """Un CSV vacío o con pocos productos no vacía el catálogo."""
+        monkeypatch.setattr(catalog, "execute_values", FakeExecuteValues(set()))
+        hashes = {}
+        for archivo in DEFAULT_CATALOG_DIR.glob(CATALOG_GLOB):
+            hashes.update(_hashes(archivo))
+        shutil.copy(DEFAULT_CATALOG_DIR / "RCMI_productos.csv", tmp_path)
+        db = FakeCatalogDB(hashes)
+
+        assert len(_hashes(tmp_path / "RCMI_productos.csv")) < len(hashes) / 2
+        resultado = sync_catalog(db, csv_dir=tmp_path)
+
+        assert resultado.eliminados == 0
+        assert marcar_eliminados(db, set()) == 0
+        assert not any(sql.startswith("UPDATE productos") for sql, _ in db.sentencias)
+
+    def test_failed_file_skips_tombstones(self, tmp_path, monkeypatch) -> None:
+        monkeypatch.setattr(catalog, "execute_values", FakeExecuteValues(set()))
+        shutil.copy(DEFAULT_CATALOG_DIR / "RCMI_productos.csv", tmp_path)
+        (tmp_path / "ROTO_productos.csv").write_bytes(b"\xff\xfe\x00")
+        db = FakeCatalogDB({"RDT-999-1": "f" * 64})
+
+        resultado = sync_catalog(db, csv_dir=tmp_path, max_workers=2)
+
+        assert resultado.nuevos > 0
+        assert resultado.eliminados == 0
+        assert not any(sql.startswith("UPDATE productos") for sql, _ in db.sentencias)
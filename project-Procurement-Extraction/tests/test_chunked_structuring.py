@@ -0,0 +1,105 @@
+"""Tests para la estructuración por chunks."""
+
+import threading
+from decimal import Decimal
+
+from licitaciones.domain.extraction_models import (
+    CondicionesAmbientales,
+    Generales,
+    ItemLicitado,
+    LicitacionCompleta,
+    SistemaCargadorRectificador,
+)
+from licitaciones.extraction.chunked_structuring import (
+    ChunkedPropertiesExtractor,
+    merge_licitaciones,
+    split_at_item_boundaries,
+)
+
+RAW_TEXT = "Especificaciones comunes: 48 V\n\n" + "".join(
+    f"**Item {n}:** rectificador {n}\n" + "detalle técnico\n" * 20 for n in range(1, 5)
+)
+
+
+class FakePropertiesExtractor:
+    """Devuelve un ítem por encabezado encontrado en el chunk."""
+
+    fingerprint = "fake"
+
+    def __init__(self) -> None:
+        self.chunks: list[str] = []
+        self._lock = threading.Lock()
+
+    def structure_properties(self, raw_text: str) -> LicitacionCompleta:
+        with self._lock:
+            self.chunks.append(raw_text)
+        numbers = [n for n in range(1, 5) if f"Item {n}:" in raw_text]
+        return LicitacionCompleta(
+            items=[ItemLicitado(numero_item=n, descripcion=f"rectificador {n}") for n in numbers]
+        )
+
+
+class TestChunkedStructuring:
+    """Tests para split_at_item_boundaries, merge_licitaciones y el extractor."""
+
+    def test_split_never_cuts_an_item(self) -> None:
+        """Cada encabezado de ítem queda al inicio de un chunk o dentro de uno entero."""
+        chunks = split_at_item_boundaries(RAW_TEXT, max_chars=400)
+
+        assert len(chunks) > 1
+        assert "".join(chunks) == RAW_TEXT
+        assert all(len(chunk) <= 400 for chunk in chunks)
+        for n in range(1, 5):
+            assert sum(f"**Item {n}:**" in chunk for chunk in chunks) == 1
+
+    def test_short_text_is_a_single_chunk(self) -> None:
+        assert split_at_item_boundaries("Item 1: algo", max_chars=400) == ["Item 1: algo"]
+
+    def test_merge_dedups_items_and_reconciles_common_specs(self) -> None:
+        """Gana el primer valor no nulo en orden de documento."""
+        first = LicitacionCompleta(
+            especificaciones_comunes=SistemaCargadorRectificador(
+                generales=Generales(marca="ACME"),
+            ),
+            items=[ItemLicitado(numero_item=1, cantidad=2), ItemLicitado(numero_item=2)],
+        )
+        second = LicitacionCompleta(
+            especificaciones_comunes=SistemaCargadorRectificador(
+                generales=Generales(marca="OTRA", modelo="X1"),
+                condiciones_ambientales=CondicionesAmbientales(temperatura_max_c=Decimal("45")),
+            ),
+            items=[
+                ItemLicitado(numero_item=1, cantidad=5, descripcion="rectificador"),
+                ItemLicitado(numero_item=3),
+            ],
+        )
+
+        merged = merge_licitaciones([first, second])
+
+        assert [item.numero_item for item in merged.items] == [1, 2, 3]
+        assert merged.items[0].cantidad == 2
+        assert merged.items[0].descripcion == "rectificador"
+        generales = merged.especificaciones_comunes.generales
+        assert (generales.marca, generales.modelo) == ("ACME", "X1")
+        assert merged.especificaciones_comunes.condiciones_ambientales.temperatura_max_c == 45
+        assert merge_licitaciones([first, second]) == merged
+
+    def test_extractor_maps_chunks_and_merges(self) -> None:
+        inner = FakePropertiesExtractor()
+        extractor = ChunkedPropertiesExtractor(inner, max_chunk_chars=400, max_workers=3)
+
+        result = extractor.structure_properties(RAW_TEXT)
+
+        assert len(inner.chunks) > 1
+        assert [item.numero_item for item in result.items] == [1, 2, 3, 4]
+        assert extractor.fingerprint != inner.fingerprint
+
+    def test_iter_parts_yields_chunks_in_document_order(self) -> None:
+        inner = FakePropertiesExtractor()
+        extractor = ChunkedPropertiesExtractor(inner, max_chunk_chars=400, max_workers=3)
+
+        parts = list(extractor.iter_parts(RAW_TEXT))
+
+        assert len(parts) == len(inner.chunks) > 1
+        assert [i.numero_item for p in parts for i in p.items] == [1, 2, 3, 4]
+        assert merge_licitaciones(parts) == extractor.structure_properties(RAW_TEXT)
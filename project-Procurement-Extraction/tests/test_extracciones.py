@@ -0,0 +1,142 @@
+"""Tests para la escritura en lote y el historial de extracciones."""
+
+from contextlib import contextmanager
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+from licitaciones.db.extracciones import ExtraccionRepository, LoteResultados, escribir_lote
+from licitaciones.domain.db_models import Producto
+from licitaciones.domain.extraction_models import ItemLicitado, LicitacionCompleta
+from licitaciones.matching.matcher import MatchResult
+
+EXTRACCION_ID = "6f1c7a4e-0000-4000-8000-000000000001"
+
+
+class FakeCursor:
+    """Registra las sentencias; fetchall devuelve las filas preparadas, en orden."""
+
+    connection = SimpleNamespace(encoding="UTF8")
+
+    def __init__(self, resultados: list[list[tuple]] | None = None) -> None:
+        self.sentencias: list[tuple[str, tuple | None]] = []
+        self.resultados = list(resultados or [])
+
+    def mogrify(self, template, args) -> bytes:
+        return repr(tuple(args)).encode()
+
+    def execute(self, sql, params=None) -> None:
+        self.sentencias.append((sql.decode() if isinstance(sql, bytes) else sql, params))
+
+    def fetchall(self) -> list[tuple]:
+        return self.resultados.pop(0)
+
+    def fetchone(self) -> tuple | None:
+        filas = self.resultados.pop(0)
+        return filas[0] if filas else None
+
+
+class FakeDB:
+    def __init__(self, cursor: FakeCursor) -> None:
+        self.cursor = cursor
+
+    @contextmanager
+    def get_cursor(self):
+        yield self.cursor
+
+
+def _producto(producto_id: int) -> Producto:
+    return Producto(
+        id=producto_id,
+        codigo=f"110-{producto_id}-CS",
+        marca="SERVELEC",
+        modelo="RDT",
+        tension_nominal=110,
+        corriente_nominal=producto_id,
+    )
+
+
+class TestLoteResultados:
+    """Tests para LoteResultados y escribir_lote."""
+
+    def test_repeated_item_keeps_last_version(self) -> None:
+        lote = LoteResultados()
+        item = ItemLicitado(numero_item=1, descripcion="rectificador")
+        lote.agregar_item(EXTRACCION_ID, 0, item)
+        resultado = MatchResult(item, [_producto(30), _producto(40)], 0.9, scores=[0.9, 0.8])
+        lote.agregar_item(EXTRACCION_ID, 0, item, resultado)
+
+        assert len(lote.items) == 1
+        assert lote.items[(EXTRACCION_ID, 0)][6] == 0.9
+        assert lote.matches[(EXTRACCION_ID, 0)] == [
+            (EXTRACCION_ID, 0, 0, 30, 0.9),
+            (EXTRACCION_ID, 0, 1, 40, 0.8),
+        ]
+
+    def test_writes_one_statement_per_table_in_foreign_key_order(self) -> None:
+        lote = LoteResultados()
+        lote.agregar_extraccion(EXTRACCION_ID, "a.pdf", [(1, 10)], licitacion_id="abc")
+        for orden in range(3):
+            item = ItemLicitado(numero_item=orden + 1)
+            lote.agregar_item(
+                EXTRACCION_ID, orden, item, MatchResult(item, [_producto(30)], 0.9, scores=[0.9])
+            )
+        lote.finalizar_extraccion(
+            EXTRACCION_ID, LicitacionCompleta(), etapas={"extraccion": 1.23456}
+        )
+        cur = FakeCursor()
+
+        escribir_lote(cur, lote)
+
+        prefijos = [" ".join(sql.split()[:3]) for sql, _ in cur.sentencias]
+        assert prefijos == [
+            "INSERT INTO extracciones",
+            "INSERT INTO extraccion_items",
+            "DELETE FROM extraccion_matches",
+            "INSERT INTO extraccion_matches",
+            "UPDATE extracciones e",
+            "INSERT INTO extraccion_etapas",
+        ]
+        assert "'abc', 'a.pdf', '1-10'" in cur.sentencias[0][0]
+        assert lote.etapas == [(EXTRACCION_ID, "extraccion", 1.235)]
+
+
+class TestExtraccionRepository:
+    """Tests para las consultas de historial."""
+
+    def test_list_uses_keyset_pagination(self) -> None:
+        cur = FakeCursor([[]])
+        antes_de = (datetime(2026, 1, 1), EXTRACCION_ID)
+
+        ExtraccionRepository(FakeDB(cur)).listar(licitacion_id="abc", antes_de=antes_de, limite=20)
+
+        sql, params = cur.sentencias[0]
+        assert "WHERE licitacion_id = %s AND (created_at, id) < (%s, %s::uuid)" in sql
+        assert sql.endswith("ORDER BY created_at DESC, id DESC LIMIT %s")
+        assert params == ("abc", *antes_de, 20)
+
+    def test_get_groups_matches_by_item(self) -> None:
+        creada = datetime(2026, 1, 1)
+        extraccion = (EXTRACCION_ID, "abc", "a.pdf", None, "ok", None, 2, creada, creada, None)
+        cur = FakeCursor(
+            [
+                [extraccion],
+                [(0, {"numero_item": 1}, Decimal("0.9"), None), (1, {"numero_item": 2}, 0, "x")],
+                [
+                    (0, 30, "110-30-CS", "SERVELEC", "RDT", 110, 30, "CS", Decimal("0.9")),
+                    (0, 40, "110-40-CS", "SERVELEC", "RDT", 110, 40, "CS", Decimal("0.8")),
+                ],
+                [("extraccion", Decimal("1.5"))],
+            ]
+        )
+
+        detalle = ExtraccionRepository(FakeDB(cur)).obtener(EXTRACCION_ID)
+
+        assert detalle.resumen.estado == "ok"
+        assert [p.id for p in detalle.items[0].productos] == [30, 40]
+        assert detalle.items[0].match_score == 0.9
+        assert detalle.items[1].productos == []
+        assert detalle.etapas == {"extraccion": 1.5}
+
+    def test_get_unknown_extraction(self) -> None:
+        assert ExtraccionRepository(FakeDB(FakeCursor([[]]))).obtener(EXTRACCION_ID) is None
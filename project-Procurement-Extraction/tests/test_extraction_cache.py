@@ -0,0 +1,112 @@
+"""Tests para la caché de extracción del pipeline."""
+
+from pathlib import Path
+
+import fitz
+
+from licitaciones.config import Settings
+from licitaciones.domain.extraction_models import ItemLicitado, LicitacionCompleta
+from licitaciones.extraction.cache import ExtractionCache
+from licitaciones.extraction.extraction_pipeline import ExtractionPipeline
+from licitaciones.extraction.pdf_processor import PDFProcessor
+
+
+class FakeProductExtractor:
+    """Extractor de productos que cuenta las llamadas."""
+
+    def __init__(self, prompt_version: str = "v1") -> None:
+        self.calls = 0
+        self.fingerprint = f"fake-product:{prompt_version}"
+        self.pdfs: list[Path | bytes] = []
+
+    def extract_from_pdf(self, pdf: Path | bytes) -> str:
+        self.calls += 1
+        self.pdfs.append(pdf)
+        return "Item 1: rectificador 110 V 30 A"
+
+
+class FakePropertiesExtractor:
+    """Estructurador que cuenta las llamadas."""
+
+    def __init__(self, prompt_version: str = "v1") -> None:
+        self.calls = 0
+        self.fingerprint = f"fake-properties:{prompt_version}"
+
+    def structure_properties(self, raw_text: str) -> LicitacionCompleta:
+        self.calls += 1
+        return LicitacionCompleta(items=[ItemLicitado(numero_item=1, descripcion=raw_text)])
+
+
+def _write_pdf(path: Path) -> Path:
+    doc = fitz.open()
+    for _ in range(2):
+        doc.new_page().insert_text((72, 72), "Rectificador tensión nominal 110 V")
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+def _pipeline(cache_dir: Path, product, properties) -> ExtractionPipeline:
+    return ExtractionPipeline(
+        pdf_preprocessor=PDFProcessor(settings=Settings(_env_file=None)),
+        product_extractor=product,
+        properties_extractor=properties,
+        cache=ExtractionCache(cache_dir),
+    )
+
+
+class TestExtractionCache:
+    """Tests para ExtractionPipeline con caché."""
+
+    def test_repeat_run_hits_cache(self, tmp_path) -> None:
+        """Una segunda ejecución no vuelve a llamar a los extractores."""
+        pdf_path = _write_pdf(tmp_path / "doc.pdf")
+        product, properties = FakeProductExtractor(), FakePropertiesExtractor()
+        pipeline = _pipeline(tmp_path / "cache", product, properties)
+
+        first = pipeline.process_pdf(pdf_path)
+        second = pipeline.process_pdf(pdf_path)
+
+        assert first == second
+        assert product.calls == 1
+        assert properties.calls == 1
+
+    def test_page_ranges_are_part_of_the_key(self, tmp_path) -> None:
+        """Un rango de páginas distinto es una entrada distinta."""
+        pdf_path = _write_pdf(tmp_path / "doc.pdf")
+        product, properties = FakeProductExtractor(), FakePropertiesExtractor()
+        pipeline = _pipeline(tmp_path / "cache", product, properties)
+
+        pipeline.process_pdf(pdf_path)
+        pipeline.process_pdf(pdf_path, page_ranges=[(1, 1)])
+
+        assert product.calls == 2
+        # El rango se sube desde memoria, sin archivo temporal
+        assert product.pdfs[0] == pdf_path
+        assert isinstance(product.pdfs[1], bytes)
+
+    def test_prompt_change_invalidates_only_its_stage(self, tmp_path) -> None:
+        """Cambiar el prompt de estructuración reutiliza el texto raw."""
+        pdf_path = _write_pdf(tmp_path / "doc.pdf")
+        product = FakeProductExtractor()
+        _pipeline(tmp_path / "cache", product, FakePropertiesExtractor()).process_pdf(pdf_path)
+
+        properties_v2 = FakePropertiesExtractor(prompt_version="v2")
+        _pipeline(tmp_path / "cache", product, properties_v2).process_pdf(pdf_path)
+
+        assert product.calls == 1
+        assert properties_v2.calls == 1
+
+    def test_streamed_structuring_shares_the_cache(self, tmp_path) -> None:
+        """iter_structured cachea lo mismo que process_pdf y lo reutiliza."""
+        pdf_path = _write_pdf(tmp_path / "doc.pdf")
+        product, properties = FakeProductExtractor(), FakePropertiesExtractor()
+        pipeline = _pipeline(tmp_path / "cache", product, properties)
+
+        raw_text = pipeline.extract_raw_text(pdf_path)
+        parts = list(pipeline.iter_structured(raw_text))
+
+        assert parts == [pipeline.process_pdf(pdf_path)]
+        assert list(pipeline.iter_structured(raw_text)) == parts
+        assert product.calls == 1
+        assert properties.calls == 1
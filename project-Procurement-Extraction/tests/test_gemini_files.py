@@ -0,0 +1,112 @@
+"""Tests para el registro de archivos subidos a Gemini."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+
+from licitaciones.extraction.gemini_files import GeminiFileRegistry
+
+
+class FakeUploads:
+    """Cuenta subidas y borrados de archivos."""
+
+    def __init__(self, upload_seconds: float = 0.0) -> None:
+        self.upload_seconds = upload_seconds
+        self.uploads = 0
+        self.deleted: list[str] = []
+        self._lock = threading.Lock()
+
+    def upload(self, pdf_path: Path) -> SimpleNamespace:
+        time.sleep(self.upload_seconds)
+        with self._lock:
+            self.uploads += 1
+            return SimpleNamespace(name=f"files/{self.uploads}")
+
+    def delete(self, name: str) -> None:
+        self.deleted.append(name)
+
+
+def _pdf(tmp_path: Path, content: bytes = b"%PDF-1.4 a") -> Path:
+    path = tmp_path / f"doc_{len(content)}.pdf"
+    path.write_bytes(content)
+    return path
+
+
+class TestGeminiFileRegistry:
+    """Tests para GeminiFileRegistry."""
+
+    def test_same_content_is_uploaded_once(self, tmp_path) -> None:
+        """Varios prompts sobre el mismo PDF reutilizan la subida."""
+        fake = FakeUploads()
+        registry = GeminiFileRegistry(delete=fake.delete, ttl_seconds=60)
+        pdf_path = _pdf(tmp_path)
+
+        for _ in range(3):
+            with registry.lease(pdf_path, fake.upload) as uploaded:
+                assert uploaded.name == "files/1"
+
+        assert fake.uploads == 1
+        assert fake.deleted == []
+        registry.close()
+        assert fake.deleted == ["files/1"]
+
+    def test_concurrent_leases_share_one_upload(self, tmp_path) -> None:
+        """Dos threads con el mismo PDF no suben dos veces."""
+        fake = FakeUploads(upload_seconds=0.1)
+        registry = GeminiFileRegistry(delete=fake.delete, ttl_seconds=60)
+        pdf_path = _pdf(tmp_path)
+
+        def use() -> str:
+            with registry.lease(pdf_path, fake.upload) as uploaded:
+                return uploaded.name
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            names = list(pool.map(lambda _: use(), range(4)))
+
+        assert names == ["files/1"] * 4
+        assert fake.uploads == 1
+        registry.close()
+
+    def test_in_memory_pdf_shares_upload_with_same_content(self, tmp_path) -> None:
+        """Un PDF en memoria se indexa por su contenido, igual que en disco."""
+        fake = FakeUploads()
+        registry = GeminiFileRegistry(delete=fake.delete, ttl_seconds=60)
+        pdf_path = _pdf(tmp_path)
+
+        with registry.lease(pdf_path, fake.upload):
+            pass
+        with registry.lease(pdf_path.read_bytes(), fake.upload) as uploaded:
+            assert uploaded.name == "files/1"
+
+        assert fake.uploads == 1
+        registry.close()
+
+    def test_sweep_deletes_only_expired_unused_files(self, tmp_path) -> None:
+        """El barrido respeta los archivos en uso."""
+        fake = FakeUploads()
+        registry = GeminiFileRegistry(delete=fake.delete, ttl_seconds=0.01)
+        idle, busy = _pdf(tmp_path, b"a"), _pdf(tmp_path, b"bb")
+
+        with registry.lease(idle, fake.upload):
+            pass
+        with registry.lease(busy, fake.upload):
+            time.sleep(0.02)
+            assert registry.sweep() == 1
+            assert fake.deleted == ["files/1"]
+
+        registry.close()
+
+    def test_zero_ttl_deletes_after_each_call(self, tmp_path) -> None:
+        """Con TTL 0 se conserva el comportamiento de borrar tras cada llamada."""
+        fake = FakeUploads()
+        registry = GeminiFileRegistry(delete=fake.delete, ttl_seconds=0)
+        pdf_path = _pdf(tmp_path)
+
+        for _ in range(2):
+            with registry.lease(pdf_path, fake.upload):
+                pass
+
+        assert fake.uploads == 2
+        assert fake.deleted == ["files/1", "files/2"]
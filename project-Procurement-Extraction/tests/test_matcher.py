@@ -0,0 +1,215 @@
+"""Tests para el matching determinístico contra el catálogo."""
+
+from contextlib import contextmanager
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from licitaciones.domain.db_models import Producto
+from licitaciones.domain.enums import FaseTipo
+from licitaciones.domain.extraction_models import (
+    AlimentacionExtraccion,
+    CargaBaterias,
+    ItemLicitado,
+    NumericRange,
+    SalidaExtraccion,
+    SistemaCargadorRectificador,
+)
+from licitaciones.matching.catalog_index import (
+    CATALOG_VERSION_QUERY,
+    CatalogIndex,
+    CatalogRecord,
+    CatalogSnapshot,
+)
+from licitaciones.matching.matcher import ProductMatcher, _top_k
+
+
+def _record(id_: int, tension: int, corriente: int, regulador: str | None = None, flote=(55, 143)):
+    codigo = f"RDT-{tension}-{corriente}" + (f"-{regulador}" if regulador else "")
+    producto = Producto(
+        id=id_,
+        codigo=codigo,
+        marca="SERVELEC",
+        modelo=codigo,
+        tension_nominal=tension,
+        corriente_nominal=corriente,
+        regulador_diodos=regulador,
+    )
+    return CatalogRecord(producto=producto, tension_flote_min=flote[0], tension_flote_max=flote[1])
+
+
+@pytest.fixture
+def index() -> CatalogIndex:
+    return CatalogIndex.from_records(
+        [
+            _record(1, 110, 15),
+            _record(2, 110, 30),
+            _record(3, 110, 30, "CS"),
+            _record(4, 110, 60),
+            _record(5, 48, 30),
+            _record(6, 110, 45, flote=(100, 120)),
+        ]
+    )
+
+
+def _item(tension: int, corriente: int) -> ItemLicitado:
+    return ItemLicitado(
+        numero_item=1,
+        salida=SalidaExtraccion(
+            tension_nominal_v=Decimal(tension), corriente_nominal_a=Decimal(corriente)
+        ),
+    )
+
+
+class TestProductMatcher:
+    """Tests para ProductMatcher."""
+
+    def test_candidates_use_exact_tension_and_minimum_current(self, index) -> None:
+        rows = index.candidates(tension=110, corriente_min=25, reguladores=(0,))
+
+        assert [index.productos[r].id for r in rows] == [2, 6, 4]
+
+    def test_match_prefers_the_tightest_current(self, index) -> None:
+        """Ante igual tensión, gana la corriente más cercana a la requerida."""
+        result = ProductMatcher(index).match_single(_item(110, 25))
+
+        assert [p.id for p in result.productos_coincidentes][:2] == [2, 3]
+        assert result.scores == sorted(result.scores, reverse=True)
+        assert result.score == result.scores[0]
+
+    def test_common_specs_filter_and_score(self, index) -> None:
+        """Regulador y rango de flote vienen de las especificaciones comunes."""
+        comunes = SistemaCargadorRectificador(
+            carga_baterias=CargaBaterias(
+                regulador_diodos=False,
+                tension_flote=NumericRange(min=Decimal(60), max=Decimal(130)),
+            )
+        )
+
+        result = ProductMatcher(index, min_score=0.0).match(
+            [_item(110, 40)], especificaciones_comunes=comunes
+        )[0]
+
+        assert [p.id for p in result.productos_coincidentes] == [4, 6]
+
+    def test_no_candidates_is_reported(self, index) -> None:
+        result = ProductMatcher(index).match_single(_item(220, 10))
+
+        assert result.productos_coincidentes == []
+        assert result.notas
+
+    def test_compatibility_score_for_a_single_product(self, index) -> None:
+        matcher = ProductMatcher(index)
+        item = _item(110, 30)
+
+        assert matcher.calculate_compatibility_score(item, index.productos[1]) == 1.0
+        assert matcher.calculate_compatibility_score(item, index.productos[4]) < 0.5
+
+    def test_top_k_breaks_ties_by_index_order(self) -> None:
+        scores = np.array([0.5, 0.9, 0.5, 0.9, 0.1, 0.5])
+
+        assert _top_k(scores, 3).tolist() == [1, 3, 0]
+        assert _top_k(scores, 10).tolist() == [1, 3, 0, 2, 5, 4]
+
+    def test_consumption_current_and_power_supply_are_scored(self) -> None:
+        records = [_record(1, 110, 30), _record(2, 110, 30, "CS")]
+        records[0].maxima_corriente_consumos = 20
+        records[0].alimentacion_tipo = "Monofásico"
+        records[1].maxima_corriente_consumos = 40
+        records[1].alimentacion_tipo = "Trifásico"
+        records[1].frecuencia = 50
+        item = _item(110, 30)
+        item.salida.maxima_corriente_consumos_a = Decimal(30)
+        item.alimentacion = AlimentacionExtraccion(
+            tipo=FaseTipo.TRIFASICA, frecuencia_hz=Decimal(50)
+        )
+
+        result = ProductMatcher(CatalogIndex.from_records(records), min_score=0.0).match_single(
+            item
+        )
+
+        assert [p.id for p in result.productos_coincidentes] == [2, 1]
+        assert result.scores[0] == 1.0
+
+    def test_repeated_items_are_resolved_once(self, index, monkeypatch) -> None:
+        matcher = ProductMatcher(index)
+        calls = []
+        original = matcher._match_with_index
+        monkeypatch.setattr(
+            matcher,
+            "_match_with_index",
+            lambda *args: calls.append(args) or original(*args),
+        )
+        items = [_item(110, 25), _item(110, 25), _item(48, 30)]
+        items[1].numero_item = 2
+
+        results = matcher.match(items)
+
+        assert len(calls) == 2
+        assert [r.item_licitado.numero_item for r in results] == [1, 2, 1]
+        assert results[0].productos_coincidentes == results[1].productos_coincidentes
+
+
+class FakeCatalogDB:
+    """Simula la BD: devuelve la versión y las filas del catálogo actuales."""
+
+    def __init__(self, rows: list[tuple]) -> None:
+        self.rows = rows
+        self.version = 1
+        self.loads = 0
+
+    @contextmanager
+    def get_cursor(self):
+        db = self
+
+        class Cursor:
+            def execute(self, query: str) -> None:
+                self.query = query
+
+            def fetchone(self) -> tuple:
+                assert self.query == CATALOG_VERSION_QUERY
+                return (db.version,)
+
+            def fetchall(self) -> list[tuple]:
+                db.loads += 1
+                return db.rows
+
+        yield Cursor()
+
+
+def _row(id_: int, tension: int, corriente: int) -> tuple:
+    codigo = f"RDT-{tension}-{corriente}"
+    return (id_, codigo, "SERVELEC", codigo, tension, corriente, None, None, None) + (None,) * 10
+
+
+class TestCatalogSnapshot:
+    """Tests para CatalogSnapshot."""
+
+    def test_rebuilds_only_when_catalog_changes(self) -> None:
+        db = FakeCatalogDB([_row(1, 110, 30)])
+        snapshot = CatalogSnapshot(db, check_interval_seconds=0)
+        matcher = ProductMatcher(snapshot)
+
+        assert len(matcher.match_single(_item(110, 30)).productos_coincidentes) == 1
+        matcher.match_single(_item(110, 30))
+        assert db.loads == 1
+
+        db.rows = [_row(1, 110, 30), _row(2, 110, 50)]
+        db.version = 2
+
+        assert len(matcher.match_single(_item(110, 30)).productos_coincidentes) == 2
+        assert db.loads == 2
+
+    def test_version_is_checked_at_most_once_per_interval(self) -> None:
+        now = [0.0]
+        db = FakeCatalogDB([_row(1, 110, 30)])
+        snapshot = CatalogSnapshot(db, check_interval_seconds=30, clock=lambda: now[0])
+        first = snapshot.get()
+
+        db.version = 2
+        assert snapshot.get() is first
+
+        now[0] = 31.0
+        assert snapshot.get() is not first
+        assert db.loads == 2
@@ -0,0 +1,163 @@
+"""Tests para el triage de páginas."""
+
+from pathlib import Path
+
+import fitz
+
+from licitaciones.config import Settings
+from licitaciones.extraction.extraction_pipeline import ExtractionPipeline
+from licitaciones.extraction.page_triage import (
+    count_table_rows,
+    score_page,
+    select_page_ranges,
+)
+from licitaciones.extraction.pdf_processor import PDFProcessor
+
+LEGAL = [
+    "Artículo 5: El oferente deberá constituir domicilio legal.",
+    "La adjudicación se notificará a cada licitante conforme al pliego.",
+    "Las penalidades y multas se rigen por la cláusula 12 del contrato.",
+]
+SPECS = [
+    "ESPECIFICACIONES TÉCNICAS - Rectificador cargador de baterías",
+    "Tensión nominal de salida: 110 Vcc",
+    "Corriente nominal: 30 A",
+    "Alimentación: 380 Vca trifásica, 50 Hz",
+    "Temperatura de operación: 40 °C, altura 2500 msnm",
+]
+
+
+def _write_tender_pdf(path: Path, pages: int, spec_pages: set[int]) -> Path:
+    """PDF de `pages` páginas, con especificaciones en `spec_pages` (1-indexed)."""
+    doc = fitz.open()
+    for number in range(1, pages + 1):
+        page = doc.new_page()
+        for i, line in enumerate(SPECS if number in spec_pages else LEGAL):
+            page.insert_text((72, 72 + 20 * i), line)
+        if number in spec_pages:
+            # Tabla de tres columnas
+            for row in range(4):
+                for col, cell in enumerate(("Item", f"{row + 1}", "Rectificador")):
+                    page.insert_text((72 + 150 * col, 250 + 20 * row), cell)
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+class FakeProductExtractor:
+    """Guarda los PDFs recibidos."""
+
+    fingerprint = "fake-product:v1"
+
+    def __init__(self) -> None:
+        self.pdfs: list[Path | bytes] = []
+
+    def extract_from_pdf(self, pdf: Path | bytes) -> str:
+        self.pdfs.append(pdf)
+        return "Item 1: rectificador 110 V 30 A"
+
+
+class TestScorePage:
+    """Tests para score_page y count_table_rows."""
+
+    def test_specs_score_above_legal_text(self) -> None:
+        specs = score_page("\n".join(SPECS))
+        assert specs >= 6.0
+        assert score_page("\n".join(LEGAL)) == 0.0
+        # Sin tildes ni mayúsculas puntúa igual
+        assert score_page("TENSION NOMINAL 110 VCC") == score_page("tensión nominal 110 Vcc")
+
+    def test_units_need_a_number(self) -> None:
+        assert score_page("110 V") == 1.0
+        assert score_page("3 años y 2 anexos") == 0.0
+
+    def test_table_rows(self) -> None:
+        # Tres líneas en la misma base son una fila; dos no alcanzan
+        assert count_table_rows([100.0, 100.4, 100.2, 120.0, 120.0, 140.0]) == 1
+
+
+class TestSelectPageRanges:
+    """Tests para select_page_ranges."""
+
+    def test_keeps_pages_with_context(self) -> None:
+        scores = {page: 0.0 for page in range(1, 21)} | {5: 9.0, 6: 7.0, 15: 12.0}
+        assert select_page_ranges(scores, min_score=6.0) == [(4, 7), (14, 16)]
+        assert select_page_ranges(scores, min_score=6.0, context_pages=0) == [(5, 6), (15, 15)]
+
+    def test_whole_document_when_nothing_or_almost_everything_is_relevant(self) -> None:
+        assert select_page_ranges({1: 0.0, 2: 1.0}, min_score=6.0) is None
+        scores = {page: 8.0 for page in range(1, 11)} | {1: 0.0}
+        assert select_page_ranges(scores, min_score=6.0) is None
+
+    def test_pages_without_text_are_kept(self) -> None:
+        scores = {page: 0.0 for page in range(1, 11)} | {2: 10.0, 9: None}
+        assert select_page_ranges(scores, min_score=6.0, context_pages=0) == [(2, 2), (9, 9)]
+
+
+class TestTriageScan:
+    """Tests para el puntaje por página en PDFProcessor.check_quality."""
+
+    def test_scores_every_page(self, tmp_path) -> None:
+        pdf_path = _write_tender_pdf(tmp_path / "doc.pdf", pages=10, spec_pages={9})
+        processor = PDFProcessor(settings=Settings(_env_file=None))
+
+        report = processor.check_quality(str(pdf_path), early_exit=True, triage=True)
+
+        assert not report.early_exit
+        assert sorted(report.page_scores) == list(range(1, 11))
+        assert max(report.page_scores, key=report.page_scores.get) == 9
+        assert processor.check_quality(str(pdf_path)).page_scores == {}
+
+    def test_parallel_scan_matches_sequential(self, tmp_path) -> None:
+        pdf_path = _write_tender_pdf(tmp_path / "doc.pdf", pages=12, spec_pages={3, 10})
+        sequential = PDFProcessor(settings=Settings(_env_file=None))
+        parallel = PDFProcessor(
+            settings=Settings(
+                _env_file=None, pdf_quality_workers=3, pdf_quality_min_pages_per_shard=2
+            )
+        )
+
+        try:
+            expected = sequential.check_quality(str(pdf_path), triage=True)
+            report = parallel.check_quality(str(pdf_path), triage=True)
+        finally:
+            parallel.close()
+
+        assert report.page_scores == expected.page_scores
+
+
+class TestPipelineTriage:
+    """Tests para el triage dentro de ExtractionPipeline."""
+
+    def _pipeline(self, product: FakeProductExtractor, **settings) -> ExtractionPipeline:
+        pipeline = ExtractionPipeline(
+            pdf_preprocessor=PDFProcessor(settings=Settings(_env_file=None)),
+            product_extractor=product,
+            properties_extractor=None,
+        )
+        pipeline.settings = Settings(_env_file=None, **settings)
+        return pipeline
+
+    def test_sends_only_spec_pages(self, tmp_path) -> None:
+        pdf_path = _write_tender_pdf(tmp_path / "doc.pdf", pages=20, spec_pages={12, 13})
+        product = FakeProductExtractor()
+
+        self._pipeline(product).extract_raw_text(pdf_path)
+
+        (sent,) = product.pdfs
+        with fitz.open(stream=sent, filetype="pdf") as doc:
+            # Páginas 11-14: las de especificaciones y una vecina de cada lado
+            assert doc.page_count == 4
+            assert doc[1].get_text().startswith("ESPECIFICACIONES")
+
+    def test_explicit_ranges_or_disabled_skip_triage(self, tmp_path) -> None:
+        pdf_path = _write_tender_pdf(tmp_path / "doc.pdf", pages=20, spec_pages={12})
+        product = FakeProductExtractor()
+
+        self._pipeline(product, page_triage_enabled=False).extract_raw_text(pdf_path)
+        self._pipeline(product).extract_raw_text(pdf_path, [(1, 2)])
+
+        whole, subset = product.pdfs
+        assert whole == pdf_path
+        with fitz.open(stream=subset, filetype="pdf") as doc:
+            assert doc.page_count == 2
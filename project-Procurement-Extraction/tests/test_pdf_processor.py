@@ -0,0 +1,137 @@
+"""Tests para el análisis de calidad de PDFs."""
+
+import fitz
+import pytest
+
+from licitaciones.config import Settings
+from licitaciones.extraction.pdf_analysis import (
+    PageScanStats,
+    quality_score_bounds,
+    split_page_range,
+)
+from licitaciones.extraction.pdf_processor import PDFProcessor
+
+
+def _write_text_pdf(path, pages: int) -> str:
+    """Crea un PDF digital con texto en cada página."""
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Página {i + 1}: tensión nominal 110 V, corriente 30 A")
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+class TestCheckQuality:
+    """Tests para PDFProcessor.check_quality."""
+
+    def test_full_scan(self, tmp_path) -> None:
+        """Verifica las métricas de un PDF digital sin imágenes."""
+        pdf_path = _write_text_pdf(tmp_path / "doc.pdf", pages=5)
+        processor = PDFProcessor(settings=Settings(_env_file=None))
+
+        report = processor.check_quality(pdf_path, early_exit=False)
+
+        assert report.is_digital
+        assert report.pages_analyzed == 5
+        assert report.quality_score == 100
+        assert report.image_coverage_ratio == 0
+        assert not report.early_exit
+        assert {"file_size", "page_count", "text", "images", "score"} <= report.timings.keys()
+
+    def test_early_exit_keeps_decision(self, tmp_path) -> None:
+        """Verifica que la salida temprana no cambie la decisión del umbral."""
+        pdf_path = _write_text_pdf(tmp_path / "doc.pdf", pages=20)
+        settings = Settings(_env_file=None)
+        processor = PDFProcessor(settings=settings)
+
+        full = processor.check_quality(pdf_path, early_exit=False)
+        early = processor.check_quality(pdf_path, early_exit=True)
+
+        assert early.early_exit
+        assert early.pages_analyzed < full.pages_analyzed
+        threshold = settings.pdf_min_acceptable_quality_score
+        assert (early.quality_score >= threshold) == (full.quality_score >= threshold)
+
+    def test_parallel_scan_matches_sequential(self, tmp_path) -> None:
+        """Verifica que el escaneo por shards produzca el mismo reporte."""
+        pdf_path = _write_text_pdf(tmp_path / "doc.pdf", pages=12)
+        sequential = PDFProcessor(settings=Settings(_env_file=None))
+        parallel = PDFProcessor(
+            settings=Settings(
+                _env_file=None, pdf_quality_workers=3, pdf_quality_min_pages_per_shard=2
+            )
+        )
+
+        try:
+            expected = sequential.check_quality(pdf_path, early_exit=False)
+            report = parallel.check_quality(pdf_path, early_exit=False)
+        finally:
+            parallel.close()
+
+        assert report.pages_analyzed == expected.pages_analyzed == 12
+        assert report.quality_score == expected.quality_score
+        assert report.text_to_size_ratio == expected.text_to_size_ratio
+        assert "parallel_scan" in report.timings
+
+
+class TestExtractPages:
+    """Tests para PDFProcessor.extract_pages."""
+
+    def test_ranges_are_extracted_in_memory(self, tmp_path) -> None:
+        """El subconjunto se devuelve como bytes y se analiza sin pasar por disco."""
+        pdf_path = _write_text_pdf(tmp_path / "doc.pdf", pages=10)
+        processor = PDFProcessor(settings=Settings(_env_file=None))
+
+        data = processor.extract_pages(pdf_path, [(1, 2), (9, 20)])
+
+        assert isinstance(data, bytes)
+        with fitz.open(stream=data, filetype="pdf") as subset:
+            assert subset.page_count == 4
+            assert "Página 9" in subset[2].get_text()
+        report = processor.check_quality(data, early_exit=False)
+        assert report.pages_analyzed == 4
+        assert report.is_digital
+        assert list(tmp_path.iterdir()) == [tmp_path / "doc.pdf"]
+
+    def test_out_of_bounds_ranges(self, tmp_path) -> None:
+        """Sin páginas válidas se informa el error."""
+        pdf_path = _write_text_pdf(tmp_path / "doc.pdf", pages=2)
+        processor = PDFProcessor(settings=Settings(_env_file=None))
+
+        with pytest.raises(ValueError, match="No valid pages"):
+            processor.extract_pages(pdf_path, [(5, 8)])
+
+
+class TestQualityScoreBounds:
+    """Tests para quality_score_bounds."""
+
+    def test_bounds_are_exact_when_all_pages_scanned(self) -> None:
+        """Sin páginas pendientes, ambas cotas coinciden con el score."""
+        stats = PageScanStats(pages=3, total_chars=10, ocr_chars=5, image_coverage=1.5)
+
+        lower, upper = quality_score_bounds(stats, total_pages=3, is_digital=True)
+
+        assert lower == upper == 100 - 30 * 0.5 - 25 * 0.5
+
+    def test_bounds_widen_with_remaining_pages(self) -> None:
+        """Con páginas pendientes, el score final queda entre ambas cotas."""
+        stats = PageScanStats(pages=1, total_chars=10, total_lines=1)
+
+        lower, upper = quality_score_bounds(stats, total_pages=4, is_digital=False)
+
+        assert upper == 100
+        assert lower < 10
+
+
+class TestSplitPageRange:
+    """Tests para split_page_range."""
+
+    def test_balanced_contiguous_shards(self) -> None:
+        """Los shards cubren todas las páginas sin solaparse."""
+        assert split_page_range(10, 3) == [(0, 4), (4, 7), (7, 10)]
+
+    def test_never_more_shards_than_pages(self) -> None:
+        """No se crean shards vacíos."""
+        assert split_page_range(2, 8) == [(0, 1), (1, 2)]
@@ -0,0 +1,82 @@
+"""Tests para el control de costo de planes de consultas del LLM."""
+
+import pytest
+from sqlalchemy import text
+
+from licitaciones.Infrastructure.persistence.repositories.plan_guard import (
+    PlanCostGuard,
+    PlanDemasiadoCostosoError,
+    agregar_operador_trigrama,
+)
+
+
+class FakeResult:
+    def __init__(self, value) -> None:
+        self.value = value
+
+    def scalar_one(self):
+        return self.value
+
+
+class FakeSession:
+    """Devuelve un plan con el costo asignado a la primera subcadena que aparezca en el SQL."""
+
+    def __init__(self, costos: dict[str, float]) -> None:
+        self.costos = costos
+        self.sentencias: list[str] = []
+
+    def execute(self, clause, params=None) -> FakeResult:
+        sql = clause.text
+        self.sentencias.append(sql)
+        costo = next(c for fragmento, c in self.costos.items() if fragmento in sql)
+        return FakeResult([{"Plan": {"Node Type": "Seq Scan", "Total Cost": costo}}])
+
+
+def construir(sql: str):
+    return text(f"SELECT q.id FROM ({sql}) AS q"), {}
+
+
+class TestAgregarOperadorTrigrama:
+    """Tests para agregar_operador_trigrama."""
+
+    def test_adds_operator_next_to_similarity(self) -> None:
+        sql = "SELECT p.id FROM productos p WHERE similarity(p.marca, 'SERVELEC') > 0.5"
+
+        assert agregar_operador_trigrama(sql) == (
+            "SELECT p.id FROM productos p WHERE "
+            "(p.marca % 'SERVELEC' AND similarity(p.marca, 'SERVELEC') > 0.5)"
+        )
+
+    def test_keeps_thresholds_below_operator_default(self) -> None:
+        sql = "SELECT p.id FROM productos p WHERE similarity(p.marca, 'x') >= 0.2"
+
+        assert agregar_operador_trigrama(sql) == sql
+
+
+class TestPlanCostGuard:
+    """Tests para PlanCostGuard."""
+
+    def test_accepts_cheap_plan_without_rewriting(self) -> None:
+        session = FakeSession({"similarity": 100.0})
+        sql = "SELECT p.id FROM productos p WHERE similarity(p.tipo, 'x') > 0.5"
+
+        consulta, _ = PlanCostGuard(max_cost=1000).acotar(session, sql, construir)
+
+        assert consulta.text == f"SELECT q.id FROM ({sql}) AS q"
+        assert session.sentencias[0].startswith("EXPLAIN (FORMAT JSON) SELECT q.id")
+
+    def test_rewrites_expensive_plan_when_rewrite_is_cheap(self) -> None:
+        session = FakeSession({" % ": 50.0, "similarity": 90000.0})
+        sql = "SELECT p.id FROM productos p WHERE similarity(p.tipo, 'x') > 0.5"
+
+        consulta, _ = PlanCostGuard(max_cost=1000).acotar(session, sql, construir)
+
+        assert "p.tipo % 'x'" in consulta.text
+        assert len(session.sentencias) == 2
+
+    def test_rejects_expensive_plan(self) -> None:
+        session = FakeSession({"productos": 90000.0})
+        sql = "SELECT p.id FROM productos p WHERE p.tension_nominal > 0"
+
+        with pytest.raises(PlanDemasiadoCostosoError, match="90000"):
+            PlanCostGuard(max_cost=1000).acotar(session, sql, construir)
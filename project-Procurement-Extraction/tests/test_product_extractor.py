@@ -0,0 +1,147 @@
+"""Tests para el extractor de productos."""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from licitaciones.config import Settings
+from licitaciones.extraction.product_extractor import (
+    AsyncGeminiProductExtractor,
+    GeminiProductExtractor,
+    poll_delays,
+)
+
+
+def _file(state: str) -> SimpleNamespace:
+    return SimpleNamespace(name="files/abc", state=SimpleNamespace(name=state))
+
+
+class FakeFiles:
+    """Simula `client.files`: el archivo queda listo tras N consultas."""
+
+    def __init__(self, processing_polls: int) -> None:
+        self.processing_polls = processing_polls
+        self.uploads = 0
+
+    def upload(self, file: str) -> SimpleNamespace:
+        self.uploads += 1
+        return _file("PROCESSING")
+
+    def get(self, name: str) -> SimpleNamespace:
+        self.processing_polls -= 1
+        return _file("PROCESSING" if self.processing_polls > 0 else "ACTIVE")
+
+    def delete(self, name: str) -> None:
+        pass
+
+
+class FakeModels:
+    def generate_content(self, model: str, contents: list) -> SimpleNamespace:
+        return SimpleNamespace(text="Item 1: rectificador")
+
+
+class FakeAio:
+    """Simula `client.aio` y registra en qué threads se lo usa."""
+
+    def __init__(self, processing_polls: int) -> None:
+        self._files = FakeFiles(processing_polls)
+        self.files = SimpleNamespace(upload=self._upload, get=self._get, delete=self._delete)
+        self.models = SimpleNamespace(generate_content=self._generate_content)
+        self.deleted: list[str] = []
+        self.threads: set[str] = set()
+        self.closed = False
+
+    @property
+    def uploads(self) -> int:
+        return self._files.uploads
+
+    async def _upload(self, file, config=None) -> SimpleNamespace:
+        self.threads.add(threading.current_thread().name)
+        await asyncio.sleep(0.05)
+        return self._files.upload(file)
+
+    async def _get(self, name: str) -> SimpleNamespace:
+        return self._files.get(name)
+
+    async def _delete(self, name: str) -> None:
+        self.deleted.append(name)
+
+    async def _generate_content(self, model: str, contents: list) -> SimpleNamespace:
+        self.threads.add(threading.current_thread().name)
+        return FakeModels().generate_content(model, contents)
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+class TestGeminiProductExtractor:
+    """Tests para GeminiProductExtractor."""
+
+    def test_poll_delays_back_off_to_cap(self) -> None:
+        """El backoff arranca en 100 ms y no supera el máximo."""
+        delays = poll_delays()
+        values = [next(delays) for _ in range(20)]
+
+        assert values[0] == 0.1
+        assert values == sorted(values)
+        assert max(values) == 2.0
+
+    def test_waits_for_processing_and_reuses_upload(self, tmp_path) -> None:
+        pdf_path = tmp_path / "doc.pdf"
+        pdf_path.write_bytes(b"%PDF-1.4")
+        files = FakeFiles(processing_polls=2)
+        extractor = GeminiProductExtractor(settings=Settings(_env_file=None, google_api_key="x"))
+        extractor._client = SimpleNamespace(files=files, models=FakeModels())
+
+        assert extractor.extract_from_pdf(pdf_path) == "Item 1: rectificador"
+        assert extractor.extract_from_pdf(pdf_path) == "Item 1: rectificador"
+        extractor.close()
+
+        assert files.uploads == 1
+
+
+class TestAsyncGeminiProductExtractor:
+    """Tests para AsyncGeminiProductExtractor."""
+
+    def _extractor(self, aio: FakeAio, ttl: int = 60) -> AsyncGeminiProductExtractor:
+        extractor = AsyncGeminiProductExtractor(
+            settings=Settings(_env_file=None, google_api_key="x", gemini_file_ttl_seconds=ttl)
+        )
+        extractor._aio = aio
+        return extractor
+
+    def test_concurrent_pdfs_share_one_loop_and_one_upload(self, tmp_path) -> None:
+        """Varios threads extraen sobre el mismo loop y reutilizan la subida."""
+        pdf_path = tmp_path / "doc.pdf"
+        pdf_path.write_bytes(b"%PDF-1.4")
+        aio = FakeAio(processing_polls=2)
+        extractor = self._extractor(aio)
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            texts = list(pool.map(lambda _: extractor.extract_from_pdf(pdf_path), range(4)))
+        extractor.close()
+
+        assert texts == ["Item 1: rectificador"] * 4
+        assert aio.uploads == 1
+        assert aio.threads == {"gemini-aio"}
+        assert aio.deleted == ["files/abc"]
+        assert aio.closed
+        assert (
+            extractor.fingerprint
+            == GeminiProductExtractor(
+                settings=Settings(_env_file=None, google_api_key="x")
+            ).fingerprint
+        )
+
+    def test_submit_from_another_event_loop(self) -> None:
+        """Código async espera el Future sin correr el cliente en su propio loop."""
+        aio = FakeAio(processing_polls=1)
+        extractor = self._extractor(aio, ttl=0)
+
+        async def main() -> str:
+            return await asyncio.wrap_future(extractor.submit(b"%PDF-1.4"))
+
+        assert asyncio.run(main()) == "Item 1: rectificador"
+        extractor.close()
+        assert aio.deleted == ["files/abc"]
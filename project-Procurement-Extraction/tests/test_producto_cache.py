@@ -0,0 +1,68 @@
+"""Tests para la caché de productos del repositorio."""
+
+from licitaciones.domain.entities.producto import Producto
+from licitaciones.Infrastructure.persistence.repositories.producto_cache import ProductoCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _productos(*ids: int) -> dict[int, Producto]:
+    return {i: Producto(id=i, codigo=f"RDT-24-{i}") for i in ids}
+
+
+class TestProductoCache:
+    """Tests para ProductoCache."""
+
+    def test_hits_and_misses(self) -> None:
+        cache = ProductoCache()
+        cache.put_many(_productos(1, 2))
+
+        found = cache.get_many([1, 2, 3])
+
+        assert set(found) == {1, 2}
+        assert (cache.hits, cache.misses) == (2, 1)
+
+    def test_evicts_least_recently_used(self) -> None:
+        cache = ProductoCache(max_entries=2)
+        cache.put_many(_productos(1, 2))
+        cache.get_many([1])
+        cache.put_many(_productos(3))
+
+        assert set(cache.get_many([1, 2, 3])) == {1, 3}
+
+    def test_entries_expire(self) -> None:
+        clock = FakeClock()
+        cache = ProductoCache(ttl_seconds=10, clock=clock)
+        cache.put_many(_productos(1))
+
+        clock.now = 10
+        assert cache.get_many([1]) == {}
+        assert len(cache) == 0
+
+    def test_version_change_clears_cache(self) -> None:
+        clock = FakeClock()
+        cache = ProductoCache(version_check_seconds=5, clock=clock)
+        versiones = iter([1, 2])
+        llamadas = []
+
+        def fetch_version() -> int:
+            llamadas.append(clock.now)
+            return next(versiones)
+
+        cache.ensure_version(fetch_version)
+        cache.put_many(_productos(1))
+
+        clock.now = 1
+        cache.ensure_version(fetch_version)  # dentro del intervalo: no consulta
+        assert set(cache.get_many([1])) == {1}
+
+        clock.now = 5
+        cache.ensure_version(fetch_version)
+        assert cache.get_many([1]) == {}
+        assert llamadas == [0, 5]
@@ -0,0 +1,83 @@
+"""Tests para el mapeo de filas SQL a entidades Producto."""
+
+from datetime import datetime
+from decimal import Decimal
+
+from licitaciones.domain.entities.producto import Producto
+from licitaciones.domain.valueObjects.value_objects import Codigo, Dimensiones
+from licitaciones.Infrastructure.persistence.mappers.producto_row_mapper import (
+    PRODUCTO_COLUMNS,
+    PRODUCTOS_SQL,
+    RELACIONES_UNO_A_UNO,
+    ProductoRowMapper,
+)
+
+NUMERICOS = {"espesor_chapa", "espesor_pintura", "temperatura_maxima", "tension_flote_min"}
+
+
+def _producto_row(id_: int, con_relaciones: bool = True) -> tuple:
+    fila = [id_, f"RDT-24-{id_}", "SERVELEC", "RDT", 24, 10, None, "Argentina", "Autorregulado"]
+    fila += [datetime(2026, 1, 1), datetime(2026, 1, 2)]
+    for relacion in RELACIONES_UNO_A_UNO:
+        for i, columna in enumerate(relacion.columnas):
+            if not con_relaciones:
+                valor = None
+            elif i == 0:
+                valor = id_ * 10
+            elif columna == "producto_id":
+                valor = id_
+            elif columna in NUMERICOS:
+                valor = Decimal("1.50")
+            elif columna in ("ancho", "alto", "profundidad"):
+                valor = 600
+            elif columna == "rango_tension":
+                valor = "198-242V"
+            else:
+                valor = None
+            fila.append(valor)
+    return tuple(fila)
+
+
+class TestProductoRowMapper:
+    """Tests para ProductoRowMapper."""
+
+    def test_sql_selects_one_column_per_mapped_value(self) -> None:
+        select = PRODUCTOS_SQL.split(" FROM ")[0].removeprefix("SELECT ")
+        columnas = len(PRODUCTO_COLUMNS) + sum(len(r.columnas) for r in RELACIONES_UNO_A_UNO)
+
+        assert len(select.split(", ")) == columnas == len(_producto_row(1))
+
+    def test_maps_producto_and_one_to_one_relations(self) -> None:
+        productos = ProductoRowMapper().to_entities([_producto_row(1)])
+
+        producto = productos[1]
+        assert producto.codigo == Codigo("RDT-24-1")
+        assert producto.updated_at == datetime(2026, 1, 2)
+        assert producto.gabinete.dimensiones == Dimensiones(600, 600, 600)
+        assert producto.gabinete.espesor_chapa == 1.5
+        assert producto.especificaciones.temperatura_maxima == 1.5
+        assert producto.especificaciones.apto_pb_ac is None
+        assert producto.alimentacion.rango_tension.maximo == 242
+        assert producto.salida.producto_id == 1
+
+    def test_missing_relations_stay_empty(self) -> None:
+        producto = ProductoRowMapper().to_entities([_producto_row(2, con_relaciones=False)])[2]
+
+        assert producto.gabinete is None
+        assert producto.especificaciones is None
+        assert producto.alarmas == []
+
+    def test_groups_one_to_many_rows_by_producto(self) -> None:
+        productos = ProductoRowMapper().to_entities(
+            [_producto_row(1), _producto_row(2)],
+            alarma_rows=[(1, 1, 3, "NA", True, 3, "FALLA_RED", "Falla de red")],
+            ensayo_rows=[(1, 2, None, True, None, None, None, None, None)],
+            senalizacion_rows=[(1, 2, "LED", "Carga", None), (2, 9, "LED", "Otro", None)],
+        )
+
+        assert productos[1].alarmas[0].tipo_alarma.codigo == "FALLA_RED"
+        assert productos[2].ensayos[0].tipo_ensayo is None
+        assert [s.descripcion for s in productos[2].senalizaciones] == ["Carga"]
+
+    def test_entities_are_slotted(self) -> None:
+        assert not hasattr(Producto(), "__dict__")
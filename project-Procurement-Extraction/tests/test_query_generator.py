@@ -0,0 +1,98 @@
+"""Tests para la generación de SQL con LLMs (caché y batch)."""
+
+import asyncio
+import threading
+import time
+
+from langchain_core.runnables import RunnableLambda
+
+from licitaciones.matching.query_generator import QueryGenerator
+
+SQL_VALIDO = (
+    "SELECT DISTINCT p.*, 1 AS origen_consulta FROM productos p WHERE p.tension_nominal = 110"
+)
+SQL_CON_TEXTO = SQL_VALIDO + " AND p.tipo ILIKE '%Autorregulado%'"
+
+
+class FakeLLM:
+    """LLM falso: responde según el prompt, cuenta llamadas y simula latencia."""
+
+    def __init__(self, respuesta_generador: str = SQL_VALIDO, latencia: float = 0.0) -> None:
+        self.llamadas: list[str] = []
+        self._respuesta_generador = respuesta_generador
+        self._latencia = latencia
+        self._lock = threading.Lock()
+        self.runnable = RunnableLambda(self._responder, afunc=self._aresponder)
+
+    def _responder(self, prompt) -> str:
+        texto = prompt.to_string()
+        time.sleep(self._latencia)
+        if "generating PostgreSQL SQL queries" in texto:
+            etapa, respuesta = "generar", self._respuesta_generador
+        elif "SQL query optimizer" in texto:
+            etapa, respuesta = "sanear", SQL_VALIDO
+        else:
+            etapa, respuesta = "score", f"{SQL_VALIDO} LIMIT 50"
+        with self._lock:
+            self.llamadas.append(etapa)
+        return respuesta
+
+    async def _aresponder(self, prompt) -> str:
+        return self._responder(prompt)
+
+
+def _generator(llm: FakeLLM, **kwargs) -> QueryGenerator:
+    return QueryGenerator(llm.runnable, llm.runnable, **kwargs)
+
+
+class TestQueryGenerator:
+    """Tests para QueryGenerator."""
+
+    def test_valid_first_output_skips_sanitizer(self) -> None:
+        llm = FakeLLM()
+
+        query = _generator(llm).generate_query({"tension_nominal": 110})
+
+        assert query.endswith("LIMIT 50")
+        assert llm.llamadas == ["generar", "score"]
+
+    def test_text_comparisons_are_sanitized(self) -> None:
+        llm = FakeLLM(respuesta_generador=SQL_CON_TEXTO)
+
+        _generator(llm).generate_query({"tipo": "Autorregulado"})
+
+        assert llm.llamadas == ["generar", "sanear", "score"]
+
+    def test_equivalent_documents_hit_the_cache(self) -> None:
+        llm = FakeLLM()
+        generator = _generator(llm)
+
+        generator.generate_query({"a": 1, "b": {"c": 2}})
+        generator.generate_queries([{"b": {"c": 2}, "a": 1}, {"a": 1, "b": {"c": 2}}])
+
+        assert llm.llamadas.count("generar") == 1
+
+    def test_items_are_batched_and_deduplicated(self) -> None:
+        llm = FakeLLM(latencia=0.1)
+        generator = _generator(llm, max_concurrency=4)
+        licitacion = {
+            "especificaciones_comunes": {"tension_nominal": 110},
+            "items": [{"corriente": c} for c in (10, 20, 30, 40, 10)],
+        }
+
+        inicio = time.perf_counter()
+        queries = generator.generate_item_queries(licitacion)
+        segundos = time.perf_counter() - inicio
+
+        assert len(queries) == 5
+        assert llm.llamadas.count("generar") == 4
+        assert segundos < 0.1 * 2 * 3  # 4 items en paralelo: ~2 latencias, no 8
+
+    def test_async_batch(self) -> None:
+        llm = FakeLLM()
+        generator = _generator(llm)
+
+        queries = asyncio.run(generator.agenerate_queries([{"a": 1}, {"a": 2}, {"a": 1}]))
+
+        assert queries[0] == queries[2]
+        assert llm.llamadas.count("generar") == 2
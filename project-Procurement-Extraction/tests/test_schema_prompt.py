@@ -0,0 +1,45 @@
+"""Tests para el schema compacto del prompt de estructuración."""
+
+import json
+
+from licitaciones.domain.extraction_models import LicitacionCompleta
+from licitaciones.extraction.schema_prompt import (
+    compact_json_schema,
+    render_schema,
+    structuring_prompt_prefix,
+)
+
+
+def _property_names(node, names: set[str]) -> set[str]:
+    if isinstance(node, dict):
+        names.update(node.get("properties", {}))
+        for value in node.values():
+            _property_names(value, names)
+    elif isinstance(node, list):
+        for value in node:
+            _property_names(value, names)
+    return names
+
+
+class TestSchemaPrompt:
+    """Tests para compact_json_schema y el prefijo del prompt."""
+
+    def test_compact_schema_keeps_every_field(self) -> None:
+        """La forma compacta no pierde campos y es mucho más chica."""
+        full = LicitacionCompleta.model_json_schema()
+        compact = compact_json_schema(LicitacionCompleta)
+
+        assert _property_names(compact, set()) == _property_names(full, set())
+        assert len(render_schema(LicitacionCompleta)) < len(json.dumps(full, indent=2)) / 3
+
+    def test_compact_schema_drops_noise(self) -> None:
+        rendered = render_schema(LicitacionCompleta)
+
+        assert '"title"' not in rendered
+        assert '{"type":"null"}' not in rendered
+        assert set(compact_json_schema(LicitacionCompleta)["$defs"]) >= {"NumericRange"}
+
+    def test_prefix_is_rendered_once(self) -> None:
+        """El prefijo es el mismo objeto en cada llamada (estable para caching)."""
+        assert structuring_prompt_prefix() is structuring_prompt_prefix()
+        assert render_schema(LicitacionCompleta) in structuring_prompt_prefix()
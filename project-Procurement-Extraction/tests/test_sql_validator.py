@@ -0,0 +1,101 @@
+"""Tests para el validador de SQL generado por LLM."""
+
+import pytest
+
+from licitaciones.domain.services.sql_validator_service import SQLValidatorService
+
+SQL_SCORE = """
+SELECT * FROM (
+    SELECT DISTINCT p.*, 1 AS origen_consulta,
+        CASE WHEN similarity(a.tipo, 'trifásica') > 0.5 THEN 1.0 ELSE 0.0 END AS score_tipo,
+        substring(g.grado_proteccion FROM 'IP([0-6])') AS ip,
+        EXTRACT(YEAR FROM p.created_at) AS anio,
+        0.2 AS match_score_total
+    FROM productos p
+    LEFT JOIN alimentacion a ON p.id = a.producto_id
+    LEFT JOIN gabinete g ON p.id = g.producto_id
+) q
+WHERE q.match_score_total > 0.5
+ORDER BY q.match_score_total DESC
+LIMIT 50;
+"""
+
+
+@pytest.fixture
+def validator() -> SQLValidatorService:
+    return SQLValidatorService()
+
+
+class TestSQLValidatorService:
+    """Tests para SQLValidatorService."""
+
+    def test_scored_query_is_valid_and_reports_tables(self, validator) -> None:
+        resultado = validator.validar(SQL_SCORE)
+
+        assert resultado.es_valido, resultado.errores
+        assert resultado.advertencias == []
+        assert resultado.tablas == {"productos", "alimentacion", "gabinete"}
+        assert "match_score_total" in resultado.identificadores
+
+    def test_union_all_of_many_items(self, validator) -> None:
+        sql = " UNION ALL ".join(
+            f"SELECT p.id, {i} AS origen_consulta FROM productos p "
+            f"LEFT JOIN salida s ON p.id = s.producto_id WHERE s.tension_nominal = 110"
+            for i in range(200)
+        )
+
+        resultado = validator.validar(sql)
+
+        assert resultado.es_valido
+        assert resultado.tablas == {"productos", "salida"}
+
+    @pytest.mark.parametrize(
+        ("sql", "error"),
+        [
+            ("SELECT * FROM productos; DROP TABLE productos;", "Comando prohibido detectado: DROP"),
+            ("SELECT * FROM productos; SELECT 1", "No se permiten múltiples statements SQL"),
+            ("DELETE FROM productos WHERE id = 1", "Solo se permiten queries SELECT"),
+            ("SELECT * FROM usuarios WHERE id = 1", "Tablas no permitidas: usuarios"),
+            ("SELECT * FROM productos p, usuarios u", "Tablas no permitidas: usuarios"),
+            ('SELECT * FROM "Productos"', "Tablas no permitidas: Productos"),
+            ("SELECT * FROM public.usuarios", "Tablas no permitidas: public.usuarios"),
+            ("SELECT ARRAY(SELECT clave FROM usuarios)", "Tablas no permitidas: usuarios"),
+            ("SELECT * FROM pg_read_file('/etc/passwd')", "Tablas no permitidas: pg_read_file"),
+            ("SELECT * FROM productos WHERE tipo = 'abc", "Literal o comentario sin cerrar"),
+            (
+                "SELECT E'\\'' ; DROP TABLE productos; -- ' FROM productos LIMIT 1",
+                "Comando prohibido detectado: DROP",
+            ),
+            (
+                "SELECT $$'$$; DROP TABLE productos; SELECT $$'$$ FROM productos LIMIT 1",
+                "No se permiten múltiples statements SQL",
+            ),
+            ("SELECT $x$ abc FROM productos", "Literal o comentario sin cerrar"),
+        ],
+    )
+    def test_rejects_unsafe_queries(self, validator, sql: str, error: str) -> None:
+        resultado = validator.validar(sql)
+
+        assert not resultado.es_valido
+        assert error in resultado.errores
+
+    def test_keywords_inside_literals_and_comments_are_ignored(self, validator) -> None:
+        sql = "SELECT * FROM productos p WHERE p.tipo = 'DROP; DELETE' -- UPDATE\nLIMIT 5"
+
+        resultado = validator.validar(sql)
+
+        assert resultado.es_valido
+        assert resultado.advertencias == [
+            "Se detectaron comentarios SQL, verificar que no sean maliciosos"
+        ]
+
+    def test_escape_and_dollar_quoted_literals(self, validator) -> None:
+        sql = (
+            "SELECT * FROM productos p WHERE p.tipo = E'it\\'s; DROP' "
+            "OR p.marca = $tag$ '; DELETE $tag$ LIMIT 5"
+        )
+
+        resultado = validator.validar(sql)
+
+        assert resultado.es_valido, resultado.errores
+        assert resultado.tablas == {"productos"}
@@ -0,0 +1,151 @@
+"""Tests para el pipeline de streaming extracción → matching → persistencia."""
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from licitaciones import streaming
+from licitaciones.domain.extraction_models import ItemLicitado, LicitacionCompleta
+from licitaciones.matching.matcher import MatchResult
+from licitaciones.streaming import StreamingPipeline, StreamJob
+
+
+class FakeExtractionPipeline:
+    """Devuelve una parte estructurada por cada línea del texto raw."""
+
+    def __init__(self, textos: dict[str, str], esperar_match: threading.Event | None = None):
+        self.textos = textos
+        self.esperar_match = esperar_match
+        self.solapado = False
+
+    def extract_raw_text(self, pdf_path: Path, page_ranges=None) -> str:
+        if pdf_path.name not in self.textos:
+            raise ValueError(f"PDF ilegible: {pdf_path.name}")
+        return self.textos[pdf_path.name]
+
+    def iter_structured(self, raw_text: str):
+        for i, linea in enumerate(raw_text.splitlines()):
+            if i == 1 and self.esperar_match is not None:
+                # La segunda parte espera a que el matching haya tomado la primera
+                self.solapado = self.esperar_match.wait(timeout=5)
+            numero, descripcion = linea.split(":")
+            yield LicitacionCompleta(
+                items=[ItemLicitado(numero_item=int(numero), descripcion=descripcion)]
+            )
+
+
+class FakeMatcher:
+    """Matchea sin productos y registra los items recibidos."""
+
+    def __init__(self, matcheado: threading.Event | None = None) -> None:
+        self.items: list[ItemLicitado] = []
+        self.matcheado = matcheado
+
+    def match_single(self, item, catalog=None, especificaciones_comunes=None) -> MatchResult:
+        self.items.append(item)
+        if self.matcheado is not None:
+            self.matcheado.set()
+        return MatchResult(item_licitado=item, productos_coincidentes=[], score=0.0)
+
+
+@pytest.fixture
+def lotes(monkeypatch) -> list:
+    """Lotes que el pipeline manda a escribir."""
+    escritos = []
+    monkeypatch.setattr(streaming, "guardar_lote", lambda db, lote: escritos.append(lote))
+    return escritos
+
+
+class TestStreamingPipeline:
+    """Tests para StreamingPipeline."""
+
+    def test_items_are_matched_and_persisted_in_batches(self, lotes) -> None:
+        pipeline = StreamingPipeline(
+            FakeExtractionPipeline({"a.pdf": "1:uno\n2:dos\n3:tres"}),
+            FakeMatcher(),
+            db=object(),
+            persist_batch_size=1000,
+            persist_flush_seconds=60,
+        )
+        job = StreamJob(Path("a.pdf"), licitacion_id="abc")
+
+        (result,) = pipeline.run([job])
+
+        assert result.status == "ok"
+        assert result.items == 3
+        assert [i.numero_item for i in result.licitacion.items] == [1, 2, 3]
+        assert result.first_match_seconds is not None
+        # Todo en un único lote (una transacción)
+        assert len(lotes) == 1
+        assert lotes[0].extracciones[0][0] == job.extraccion_id
+        assert sorted(orden for _, orden in lotes[0].items) == [0, 1, 2]
+        assert lotes[0].finalizadas[0][1] == "ok"
+        assert lotes[0].extracciones[0][1] == "abc"
+        etapas = {etapa for _, etapa, _ in lotes[0].etapas}
+        assert etapas == {"extraccion", "estructuracion", "matching", "primer_match", "total"}
+
+    def test_progress_is_reported_per_matched_item(self, lotes) -> None:
+        progreso = []
+        pipeline = StreamingPipeline(
+            FakeExtractionPipeline({"a.pdf": "1:uno\n2:dos"}),
+            FakeMatcher(),
+            on_progress=lambda resultado: progreso.append(resultado.items),
+        )
+
+        pipeline.run([StreamJob(Path("a.pdf"))])
+
+        assert progreso == [1, 2]
+
+    def test_matching_overlaps_structuring(self, lotes) -> None:
+        matcheado = threading.Event()
+        extraction = FakeExtractionPipeline({"a.pdf": "1:uno\n2:dos"}, esperar_match=matcheado)
+        pipeline = StreamingPipeline(extraction, FakeMatcher(matcheado), db=None)
+
+        (result,) = pipeline.run([StreamJob(Path("a.pdf"))])
+
+        assert extraction.solapado
+        assert result.items == 2
+
+    def test_repeated_item_is_merged_and_rematched(self, lotes) -> None:
+        matcher = FakeMatcher()
+        pipeline = StreamingPipeline(
+            FakeExtractionPipeline({"a.pdf": "1:uno\n1:otra parte"}),
+            matcher,
+            db=object(),
+            persist_batch_size=1000,
+            persist_flush_seconds=60,
+        )
+
+        (result,) = pipeline.run([StreamJob(Path("a.pdf"))])
+
+        assert result.items == 1
+        assert len(matcher.items) == 2
+        # Gana el primer valor no nulo (como merge_licitaciones) y queda una fila
+        assert matcher.items[-1].descripcion == "uno"
+        assert list(lotes[0].items) == [(result.extraccion_id, 0)]
+
+    def test_failed_pdf_does_not_stop_the_others(self, lotes) -> None:
+        pipeline = StreamingPipeline(
+            FakeExtractionPipeline({"b.pdf": "1:uno"}), FakeMatcher(), db=None
+        )
+
+        results = pipeline.run([StreamJob(Path("a.pdf")), StreamJob(Path("b.pdf"))])
+
+        assert [r.status for r in results] == ["error", "ok"]
+        assert "PDF ilegible" in results[0].error
+
+    def test_persistence_error_stops_the_pipeline(self, monkeypatch) -> None:
+        def falla(db, lote):
+            raise RuntimeError("BD caída")
+
+        monkeypatch.setattr(streaming, "guardar_lote", falla)
+        pipeline = StreamingPipeline(
+            FakeExtractionPipeline({"a.pdf": "1:uno\n2:dos"}),
+            FakeMatcher(),
+            db=object(),
+            persist_batch_size=1,
+        )
+
+        with pytest.raises(RuntimeError, match="BD caída"):
+            pipeline.run([StreamJob(Path("a.pdf"))])